@@ -1,14 +1,64 @@
 # Proposed content for: /Users/kaiqiangzhang/3_game/Group_AIGame/main.py
 # Instruction: Update main.py to simply instantiate and run the Game class.
 
+import time
+STARTUP_TIME = time.perf_counter() # Taken before the other imports so --profile-startup covers them
+import argparse
+import importlib
 import pygame
-from src.core.game import Game # Correct import assuming game.py is in src
+from src.settings import VIDEO_CAPTURE_FORMAT, TIME_SCALE
 import sys # Import sys for clean exit
 
+# Imported one at a time by --profile-startup, in dependency order, so each gets its own line
+STARTUP_MODULES = (
+    'src.levels.level_data',
+    'src.levels.level_manager',
+    'src.ui.menu',
+    'src.core.game',
+)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the game.")
+    parser.add_argument('--record', nargs='?', const='', default=None, metavar='PATH',
+                        help="Record gameplay to PATH (default: a timestamped file in recordings/)")
+    parser.add_argument('--record-format', choices=('ffmpeg', 'png'), default=VIDEO_CAPTURE_FORMAT,
+                        help="ffmpeg video (needs ffmpeg on PATH) or a PNG sequence")
+    parser.add_argument('--time-scale', type=float, default=TIME_SCALE, metavar='SCALE',
+                        help="Start at this game speed (e.g. 4 to fast-forward, 0.25 for slow motion; F3/F4 change it)")
+    parser.add_argument('--profile-startup', action='store_true',
+                        help="Print import and initialization time per subsystem up to the first menu frame, then exit")
+    return parser.parse_args(argv)
+
+def profile_startup(args):
+    """Starts the game up to its first menu frame, reports where the time went and exits."""
+    from src.core.startup_profile import StartupProfiler
+    profiler = StartupProfiler(start=STARTUP_TIME)
+    profiler.mark("import pygame + settings")
+    for module_name in STARTUP_MODULES:
+        importlib.import_module(module_name)
+        profiler.mark(f"import {module_name}")
+    from src.core.game import Game
+    from src.core.util import draw_frame
+    game = Game(record=args.record is not None, record_path=args.record or None, record_format=args.record_format,
+                profiler=profiler)
+    pygame.event.pump()
+    draw_frame(game)
+    pygame.display.flip()
+    profiler.mark("first menu frame")
+    game.shutdown()
+    profiler.report()
+    pygame.quit()
+
 def main():
     """Initialize and run the game."""
+    args = parse_args()
+    if args.profile_startup:
+        profile_startup(args)
+        return
+    from src.core.game import Game # Correct import assuming game.py is in src
     # Pygame initialization is now handled within Game.__init__
-    game = Game()
+    game = Game(record=args.record is not None, record_path=args.record or None, record_format=args.record_format,
+                time_scale=args.time_scale)
     game.run()
     # Pygame quit is handled within game loop on QUIT event or sys.exit()
 
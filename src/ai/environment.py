@@ -0,0 +1,214 @@
+"""Gym-style environment around Level and Player for agent training.
+
+The environment drives the real Level/Player simulation without drawing anything:
+each step injects a held direction (and optionally a jump/dash press) into the
+player, advances the level by frame_skip frames and returns a compact observation
+built from the level grid rather than from pixels.
+
+Observations are a dict of NumPy arrays:
+    'tiles': int8 (rows, cols) window of tile codes (TILE_CODES) centred on the player,
+             with collected coins, used-up temporary platforms and hidden periodic
+             platforms cleared, and moving spikes overlaid.
+    'state': float32 vector of the player's MovementState (see STATE_FIELDS).
+
+Rewards come through Level's own callbacks: reaching an exit calls
+trigger_level_complete and hitting a trap calls trigger_player_death, both of which
+end the episode. Coins add reward_coin each. Falling out of the level counts as a
+death. step() returns (observation, reward, terminated, truncated, info) and
+reset() returns (observation, info), as in Gymnasium.
+
+Usage:
+    env = PlatformerEnv('level_4', frame_skip=4)
+    observation, info = env.reset()
+    observation, reward, terminated, truncated, info = env.step(action_index)
+
+On machines without a display, set SDL_VIDEODRIVER=dummy.
+"""
+import numpy as np
+import pygame
+from src.settings import *
+from src.levels.level import Level
+from src.entities.moving_spike import MovingSpike
+
+FRAME_DT = 1.0 / FPS
+ACTIONS = [(held, press) for press in (None, 'jump', 'dash') for held in (0, 1, -1)] # (held direction, press)
+
+# Tile codes used in the observation window
+EMPTY_CODE = 0
+OUTSIDE_CODE = -1
+MOVING_SPIKE_CODE = 8
+TILE_CODES = {
+    'X': 1, 'M': 1, # Moving spike cells are a platform; the spike itself is overlaid
+    'S': 2,
+    'E': 3,
+    'C': 4,
+    TEMP_PLATFORM_CHAR: 5,
+    PERIODIC_PLATFORM_CHAR: 6,
+    COIN_CHAR: 7,
+}
+DYNAMIC_CHARS = (TEMP_PLATFORM_CHAR, PERIODIC_PLATFORM_CHAR, COIN_CHAR) # Cells whose code can change
+
+STATE_FIELDS = (
+    'offset_x', 'offset_y', # Player position within its tile, 0..1
+    'velocity_x', 'velocity_y', 'direction', 'air_frames', 'dash_timer',
+    'on_ground', 'is_climbing', 'is_climbing_jump', 'is_dashing', 'is_super_jumping',
+    'can_jump', 'can_dash', 'can_double_jump',
+)
+
+class _HeadlessGame:
+    """Stands in for Game so Level's callbacks report into the environment."""
+    def __init__(self):
+        self.screen = pygame.display.get_surface()
+        self.current_state = GameState.PLAYING
+        self.level_manager = self # Level calls game.level_manager.next_level() on reaching an exit
+        self.exit_reached = False
+
+    def next_level(self):
+        self.exit_reached = True
+
+class PlatformerEnv:
+    """Runs one level headlessly with a discrete action space (see ACTIONS)."""
+    def __init__(self, level=None, frame_skip=1, window=(15, 11), max_episode_steps=1000,
+                 reward_exit=1.0, reward_coin=0.1, reward_death=-1.0, reward_step=0.0):
+        if pygame.display.get_surface() is None:
+            # Tiles and sprites convert their images for the display, so keep a hidden one around
+            pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.HIDDEN)
+        self.layout = self._resolve_layout(level)
+        self.frame_skip = frame_skip
+        self.window_cols, self.window_rows = window
+        self.max_episode_steps = max_episode_steps
+        self.reward_exit = reward_exit
+        self.reward_coin = reward_coin
+        self.reward_death = reward_death
+        self.reward_step = reward_step
+        self.n_actions = len(ACTIONS)
+        self.observation_shapes = {'tiles': (self.window_rows, self.window_cols), 'state': (len(STATE_FIELDS),)}
+
+        self.game = _HeadlessGame()
+        self.level = None
+        self.steps = 0
+        self._build_grid()
+
+    def _resolve_layout(self, level):
+        """Accepts a level id, a LevelData or a list of row strings (None = the root level)."""
+        if isinstance(level, list):
+            return level
+        if level is None or isinstance(level, str):
+            from src.levels.level_data import LEVEL_LIBRARY, ROOT_LEVEL
+            level_data = LEVEL_LIBRARY.get(level) if level else ROOT_LEVEL
+            if level_data is None:
+                raise ValueError(f"Unknown level id '{level}'")
+            return level_data.layout
+        return level.layout
+
+    def _build_grid(self):
+        """Encodes the layout once into a padded int8 grid so windows near edges are plain slices."""
+        rows = len(self.layout)
+        cols = max(len(row) for row in self.layout)
+        self.pad_rows = self.window_rows // 2
+        self.pad_cols = self.window_cols // 2
+        self.grid = np.full((rows + 2 * self.pad_rows, cols + 2 * self.pad_cols), OUTSIDE_CODE, dtype=np.int8)
+        self.grid[self.pad_rows:self.pad_rows + rows, self.pad_cols:self.pad_cols + cols] = EMPTY_CODE
+        self.dynamic_cells = {} # (col, row) -> layout code
+        for row_index, row in enumerate(self.layout):
+            for col_index, cell in enumerate(row):
+                code = TILE_CODES.get(cell, EMPTY_CODE)
+                self.grid[row_index + self.pad_rows, col_index + self.pad_cols] = code
+                if cell in DYNAMIC_CHARS:
+                    self.dynamic_cells[(col_index, row_index)] = code
+        self.level_height = rows * TILE_SIZE
+
+    def reset(self, seed=None):
+        """Rebuilds the level from its layout and returns (observation, info)."""
+        self.game.current_state = GameState.PLAYING
+        self.game.exit_reached = False
+        if self.level is None:
+            self.level = Level(self.layout, self.game.screen, self.game)
+        else:
+            self.level.setup_level(self.layout)
+        self.level.player.held_input = 0
+        self.steps = 0
+        self._group_sizes = None
+        self._sync_dynamic_cells()
+        return self._observation(), {'coins': 0}
+
+    def step(self, action):
+        """Applies ACTIONS[action] for frame_skip frames (the press only on the first)."""
+        held, press = ACTIONS[action]
+        level = self.level
+        player = level.player
+        coins_before = player.coins_collected
+        player.held_input = held
+        if press and not player.movement_state.is_climbing_jump: # Same guard as Player.process_input
+            if press == 'jump':
+                player.movement_state.jump()
+            else:
+                player.movement_state.dash()
+
+        died = False
+        for _ in range(self.frame_skip):
+            level.update(FRAME_DT)
+            died = self.game.current_state == GameState.DEATH_SCREEN or player.rect.top > self.level_height + TILE_SIZE * 4
+            if died or self.game.exit_reached:
+                break
+        self.steps += 1
+
+        reward = self.reward_step + (player.coins_collected - coins_before) * self.reward_coin
+        if self.game.exit_reached:
+            reward += self.reward_exit
+        elif died:
+            reward += self.reward_death
+        terminated = died or self.game.exit_reached
+        truncated = not terminated and self.steps >= self.max_episode_steps
+        self._sync_dynamic_cells()
+        info = {'coins': player.coins_collected, 'exit_reached': self.game.exit_reached, 'died': died}
+        return self._observation(), reward, terminated, truncated, info
+
+    def _sync_dynamic_cells(self):
+        """Refreshes coin/platform cells, but only when a group's membership has changed."""
+        level = self.level
+        sizes = (len(level.obstacle_sprites), len(level.coin_sprites), len(level.trap_sprites))
+        if sizes == self._group_sizes:
+            return
+        self._group_sizes = sizes
+
+        grid = self.grid
+        cleared = set(level.chunk_streamer.consumed_cells) if level.chunk_streamer else set()
+        cleared.update((coin.rect.x // TILE_SIZE, coin.rect.y // TILE_SIZE)
+                       for coin in level.all_coins_in_level if coin.is_collected)
+        cleared.update((tile.rect.x // TILE_SIZE, tile.rect.y // TILE_SIZE)
+                       for tile in level.temp_platforms if not tile.alive())
+        periodic_code = TILE_CODES[PERIODIC_PLATFORM_CHAR]
+        periodic_visible = level.platform_scheduler.periodic_visible
+        for (col, row), code in self.dynamic_cells.items():
+            if (col, row) in cleared or (code == periodic_code and not periodic_visible):
+                code = EMPTY_CODE
+            grid[row + self.pad_rows, col + self.pad_cols] = code
+        self.moving_spikes = [sprite for sprite in level.trap_sprites if isinstance(sprite, MovingSpike)]
+
+    def _observation(self):
+        player = self.level.player
+        rect = player.rect
+        col = rect.centerx // TILE_SIZE
+        row = rect.centery // TILE_SIZE
+        # The padded grid is offset by half a window, so the window's top-left lands on (row, col)
+        tiles = np.full((self.window_rows, self.window_cols), OUTSIDE_CODE, dtype=np.int8)
+        grid_rows, grid_cols = self.grid.shape
+        top, bottom = max(row, 0), min(row + self.window_rows, grid_rows)
+        left, right = max(col, 0), min(col + self.window_cols, grid_cols)
+        if top < bottom and left < right: # Copy whatever part of the window still overlaps the grid
+            tiles[top - row:bottom - row, left - col:right - col] = self.grid[top:bottom, left:right]
+        for spike in self.moving_spikes:
+            spike_col = spike.rect.centerx // TILE_SIZE - col + self.pad_cols
+            spike_row = spike.rect.centery // TILE_SIZE - row + self.pad_rows
+            if 0 <= spike_col < self.window_cols and 0 <= spike_row < self.window_rows:
+                tiles[spike_row, spike_col] = MOVING_SPIKE_CODE
+
+        state = player.movement_state
+        vector = np.array((
+            (rect.centerx % TILE_SIZE) / TILE_SIZE, (rect.centery % TILE_SIZE) / TILE_SIZE,
+            state.velocity[0], state.velocity[1], state.direction, state.air_frames, state.dash_timer,
+            state.on_ground, state.is_climbing, state.is_climbing_jump, state.is_dashing, state.is_super_jumping,
+            state.can_jump, state.can_dash, state.can_double_jump,
+        ), dtype=np.float32)
+        return {'tiles': tiles, 'state': vector}
@@ -0,0 +1,88 @@
+"""Batched offscreen pixel observations for PlatformerEnv instances.
+
+Draws each environment's camera view straight into one preallocated uint8 array of
+shape (batch, height, width, 3) from the environment's tile-code grid and entity
+rects. Every tile type is one flat colour, and there is no sorting, alpha or display
+surface involved, so a batch of 84x84 frames costs a few NumPy gathers per instance
+instead of a full YSortCameraGroup.custom_draw.
+
+Usage:
+    renderer = BatchPixelRenderer(len(envs))
+    frames = renderer.render(envs) # frames[i] is envs[i]'s view; reused on the next call
+"""
+import numpy as np
+from src.settings import *
+from src.ai.environment import TILE_CODES, EMPTY_CODE, OUTSIDE_CODE, MOVING_SPIKE_CODE
+
+MAP_BACKGROUND_COLOR = (173, 216, 230) # Same light blue YSortCameraGroup draws behind the map
+
+# Colour per tile code; codes are shifted by one when indexing so OUTSIDE_CODE (-1) maps to row 0
+TILE_COLORS = {
+    OUTSIDE_CODE: BLACK,
+    EMPTY_CODE: MAP_BACKGROUND_COLOR,
+    TILE_CODES['X']: EARTH_BROWN,
+    TILE_CODES['S']: SILVER,
+    TILE_CODES['E']: GREEN,
+    TILE_CODES['C']: CHECKPOINT_YELLOW,
+    TILE_CODES[TEMP_PLATFORM_CHAR]: TEMP_PLATFORM_COLOR,
+    TILE_CODES[PERIODIC_PLATFORM_CHAR]: PERIODIC_PLATFORM_COLOR,
+    TILE_CODES[COIN_CHAR]: COIN_COLOR_PRIMARY,
+    MOVING_SPIKE_CODE: SILVER,
+}
+PLAYER_COLOR = LIGHT_PINK
+
+class BatchPixelRenderer:
+    """Renders up to batch_size environments per call into a reused NumPy buffer."""
+    def __init__(self, batch_size, size=(84, 84), view_size=(SCREEN_WIDTH, SCREEN_HEIGHT)):
+        self.width, self.height = size
+        self.view_width, self.view_height = view_size # World pixels covered, like the game camera
+        self.frames = np.zeros((batch_size, self.height, self.width, 3), dtype=np.uint8)
+
+        self.palette = np.zeros((max(TILE_COLORS) + 2, 3), dtype=np.uint8)
+        for code, color in TILE_COLORS.items():
+            self.palette[code + 1] = color
+
+        # World offset (within the view) sampled by each output column/row, at pixel centres
+        self.sample_x = ((np.arange(self.width) + 0.5) * self.view_width / self.width).astype(np.int32)
+        self.sample_y = ((np.arange(self.height) + 0.5) * self.view_height / self.height).astype(np.int32)
+        self.scale_x = self.width / self.view_width
+        self.scale_y = self.height / self.view_height
+
+    def camera_offset(self, env):
+        """Top-left of the view in world pixels, centred on the player and clamped like update_camera."""
+        level = env.level
+        rect = level.player.rect
+        offset_x = min(max(0, rect.centerx - self.view_width // 2), max(0, level.level_width - self.view_width))
+        offset_y = min(max(0, rect.centery - self.view_height // 2), max(0, level.level_height - self.view_height))
+        return offset_x, offset_y
+
+    def render(self, envs):
+        """Fills frames[:len(envs)] with each environment's current view and returns that slice."""
+        for index, env in enumerate(envs):
+            self.render_one(env, self.frames[index])
+        return self.frames[:len(envs)]
+
+    def render_one(self, env, out):
+        offset_x, offset_y = self.camera_offset(env)
+        grid = env.grid
+        # The camera never goes left of/above the map, so only the far edges need clamping; the
+        # env's grid is padded with OUTSIDE_CODE, so samples clamped onto the padding stay outside
+        cols = np.minimum((offset_x + self.sample_x) // TILE_SIZE + env.pad_cols, grid.shape[1] - 1)
+        rows = np.minimum((offset_y + self.sample_y) // TILE_SIZE + env.pad_rows, grid.shape[0] - 1)
+        codes = grid.take(rows, axis=0).take(cols, axis=1) # Two 1-D takes beat one 2-D fancy index
+        np.take(self.palette, codes.astype(np.intp) + 1, axis=0, out=out)
+
+        for spike in env.moving_spikes:
+            self._fill_rect(out, spike.rect, offset_x, offset_y, self.palette[MOVING_SPIKE_CODE + 1])
+        self._fill_rect(out, env.level.player.rect, offset_x, offset_y, PLAYER_COLOR)
+
+    def _fill_rect(self, out, rect, offset_x, offset_y, color):
+        """Fills a world rect in the frame, at least one pixel so small entities never vanish."""
+        left = int((rect.left - offset_x) * self.scale_x)
+        top = int((rect.top - offset_y) * self.scale_y)
+        right = max(left + 1, int((rect.right - offset_x) * self.scale_x + 0.5))
+        bottom = max(top + 1, int((rect.bottom - offset_y) * self.scale_y + 0.5))
+        left, top = max(left, 0), max(top, 0)
+        right, bottom = min(right, self.width), min(bottom, self.height)
+        if left < right and top < bottom:
+            out[top:bottom, left:right] = color
@@ -1,10 +1,52 @@
+import json
 import pygame
 import os
+from concurrent.futures import ThreadPoolExecutor
+from src.settings import ANIMATION_LOAD_WORKERS
+
+# Character states a clip is chosen for; a state's index in this tuple is its slot in Animator.state_table
+ANIMATION_STATES = ('dash', 'climbing_jump', 'wall_slide', 'wall_contact', 'jump_start', 'rising', 'apex', 'falling',
+                    'run', 'idle')
+(STATE_DASH, STATE_CLIMBING_JUMP, STATE_WALL_SLIDE, STATE_WALL_CONTACT, STATE_JUMP_START, STATE_RISING, STATE_APEX,
+ STATE_FALLING, STATE_RUN, STATE_IDLE) = range(len(ANIMATION_STATES))
+
+# Clips to try for each state, best first; the first one the character has is played
+DEFAULT_ANIMATION_GRAPH = {
+    'dash': ('dash',),
+    'climbing_jump': ('wall_jump', 'jump'),
+    'wall_slide': ('climbing', 'wall_slide', 'wall_contact', 'jump_fall'), # On a wall, sliding down
+    'wall_contact': ('climbing', 'wall_contact', 'jump_fall'), # On a wall, not moving down
+    'jump_start': ('jump_start', 'jump', 'idle'), # First frames of a jump
+    'rising': ('jump', 'idle'),
+    'apex': ('jump_transition', 'jump', 'idle'),
+    'falling': ('jump_fall', 'idle'),
+    'run': ('run', 'walk', 'idle'),
+    'idle': ('idle',),
+}
+# Optional file in a character's sprite directory: {"states": {state: [clip, ...]}, "clips": {clip: {"fps": 12, "loop": true}}}
+ANIMATION_DEFINITIONS_FILE = 'animations.json'
+
+def _frame_sort_key(filename):
+    """Sorts frame files numerically if possible, otherwise alphabetically.
+
+    Assumes filenames like frame_001.png, frame_002.png or action_0.png, action_1.png.
+    """
+    parts = filename.split('_') # or other delimiter
+    try:
+        # Try to extract number from last part before .png
+        return int(parts[-1].split('.')[0]) 
+    except (ValueError, IndexError):
+        return filename # Fallback to string sort if no number
 
 class AnimationClip:
-    """Manages a single animation sequence."""
+    """Manages a single animation sequence.
+
+    Frames are stored facing right; a mirrored, left-facing set is built once here
+    so that picking a facing per frame never allocates a new surface.
+    """
     def __init__(self, frames, fps=12, loop=True):
         self.frames = frames
+        self.frames_left = [pygame.transform.flip(frame, True, False) for frame in frames]
         self.fps = fps if fps > 0 else 12
         self.loop = loop
         self.frame_duration = 1.0 / self.fps
@@ -18,9 +60,11 @@ class AnimationClip:
             self.image = pygame.Surface((32, 32))
             self.image.fill((255, 0, 255)) # Bright pink placeholder
             pygame.draw.rect(self.image, (0,0,0), self.image.get_rect(), 1) # Black border
+            self.image_left = self.image # Symmetric placeholder
             self.is_playing = False # Nothing to play
         else:
             self.image = self.frames[self.current_frame_index]
+            self.image_left = self.frames_left[self.current_frame_index]
 
     def update(self, dt):
         """Update the animation frame based on delta time."""
@@ -40,6 +84,7 @@ class AnimationClip:
                     self.is_playing = False # Stop playing if not looping
                     self.finished_one_cycle = True
             self.image = self.frames[self.current_frame_index]
+            self.image_left = self.frames_left[self.current_frame_index]
 
     def reset(self):
         """Resets the animation to the first frame."""
@@ -49,17 +94,23 @@ class AnimationClip:
         self.finished_one_cycle = False
         if self.frames:
             self.image = self.frames[self.current_frame_index]
+            self.image_left = self.frames_left[self.current_frame_index]
 
-    def get_current_image(self):
-        """Returns the current frame's surface."""
-        return self.image
+    def get_current_image(self, facing=1):
+        """Returns the current frame's surface, pre-mirrored when facing < 0 (left)."""
+        return self.image_left if facing < 0 else self.image
 
     def is_finished(self):
         """Returns True if a non-looping animation has completed its cycle."""
         return not self.loop and self.finished_one_cycle
 
 class Animator:
-    """Manages multiple AnimationClips for a character or object."""
+    """Manages multiple AnimationClips for a character or object.
+
+    The state graph (DEFAULT_ANIMATION_GRAPH, then the sprite directory's
+    ANIMATION_DEFINITIONS_FILE, then the graph argument) is compiled once after loading
+    into state_table, so picking a clip for a state each frame is a single index.
+    """
     NON_LOOPING_ACTIONS = [
         'attack_1', 'attack_2', 'attack_3', 'air_attack', 'special_attack',
         'hurt', 'death', 'dash', 'jump_start', 'throw', 'defend', 
@@ -67,67 +118,121 @@ class Animator:
         # 'jump_transition' could be non-looping or short-looping depending on design
     ]
 
-    def __init__(self, base_sprites_path, default_fps=12):
+    def __init__(self, base_sprites_path, default_fps=12, graph=None):
         self.animations = {}
         self.current_action_name = None
+        self.current_clip = None
         self.default_fps = default_fps
+        self.graph = dict(DEFAULT_ANIMATION_GRAPH)
+        self.clip_options = {} # Clip name -> {'fps': ..., 'loop': ...} from the definitions file
         self.placeholder_image = pygame.Surface((32, 32))
         self.placeholder_image.fill((255, 105, 180)) # Hot pink
         pygame.draw.line(self.placeholder_image, (0,0,0), (0,0), (31,31), 1)
         pygame.draw.line(self.placeholder_image, (0,0,0), (0,31), (31,0), 1)
+        self.placeholder_image_left = pygame.transform.flip(self.placeholder_image, True, False)
 
         if base_sprites_path:
+            self.load_definitions(base_sprites_path)
             self.load_animations_from_directory(base_sprites_path)
         else:
             print(f"Warning: Animator initialized with no base_sprites_path.")
+        self.set_graph(graph or {})
+
+    def load_definitions(self, base_path):
+        """Reads the state graph and clip options from ANIMATION_DEFINITIONS_FILE in base_path, if there is one."""
+        path = os.path.join(base_path, ANIMATION_DEFINITIONS_FILE)
+        if not os.path.isfile(path):
+            return
+        try:
+            with open(path, encoding='utf-8') as f:
+                definitions = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not read animation definitions '{path}': {e}")
+            return
+        self.graph.update(self._checked_graph(definitions.get('states', {}), path))
+        self.clip_options = definitions.get('clips', {})
+
+    def _checked_graph(self, graph, source):
+        checked = {}
+        for state, clips in graph.items():
+            if state in ANIMATION_STATES:
+                checked[state] = tuple(clips)
+            else:
+                print(f"Warning: Unknown animation state '{state}' in {source}.")
+        return checked
+
+    def set_graph(self, graph):
+        """Overrides the fallback chains of some states and recompiles state_table."""
+        self.graph.update(self._checked_graph(graph, "Animator graph"))
+        # Resolve every chain against the loaded clips now, instead of probing self.animations each frame
+        table = []
+        for state in ANIMATION_STATES:
+            name = next((name for name in self.graph.get(state, ()) if name in self.animations), None)
+            table.append((name, self.animations[name]) if name else None) # None: the character has no clip for it
+        self.state_table = tuple(table)
 
     def trim_surface(self, surface):
         rect = surface.get_bounding_rect()
         return surface.subsurface(rect).copy()
 
     def load_animations_from_directory(self, base_path):
-        """Loads all animation sequences from subdirectories of base_path."""
+        """Loads all animation sequences from subdirectories of base_path.
+
+        Every frame file is read and decoded on a pool of worker threads first; only
+        convert_alpha() and trimming, which need the display, run here on the main thread.
+        """
         if not os.path.isdir(base_path):
             print(f"Error: Animator base path '{base_path}' not found or not a directory.")
             return
 
+        actions = [] # (action_name, action_path, sorted frame paths)
         for action_name in os.listdir(base_path):
             action_path = os.path.join(base_path, action_name)
             if os.path.isdir(action_path):
-                frames = []
                 try:
-                    # Sort files numerically if possible, otherwise alphabetically
-                    # Assumes filenames like frame_001.png, frame_002.png or action_0.png, action_1.png
                     raw_files = [f for f in os.listdir(action_path) if f.lower().endswith('.png')]
-                    
-                    # Attempt to sort numerically based on numbers in filename
-                    def sort_key(filename):
-                        parts = filename.split('_') # or other delimiter
-                        try:
-                            # Try to extract number from last part before .png
-                            return int(parts[-1].split('.')[0]) 
-                        except (ValueError, IndexError):
-                            return filename # Fallback to string sort if no number
-                    
-                    sorted_files = sorted(raw_files, key=sort_key)
-                    
-                    for frame_file in sorted_files:
-                        frame_path = os.path.join(action_path, frame_file)
+                    sorted_files = sorted(raw_files, key=_frame_sort_key)
+                    actions.append((action_name, action_path, [os.path.join(action_path, f) for f in sorted_files]))
+                except Exception as e:
+                    print(f"Error processing directory '{action_path}': {e}")
+
+        workers = ANIMATION_LOAD_WORKERS or os.cpu_count() or 1
+        pool = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+        try:
+            # Queue every frame of every action up front so the pool stays busy across folders
+            pending = [] # Per action: the frames' futures, or None to decode them inline
+            for _, _, frame_paths in actions:
+                if pool:
+                    pending.append([pool.submit(pygame.image.load, frame_path) for frame_path in frame_paths])
+                else:
+                    pending.append(None) # With one core, decoding inline is cheaper than handing off
+            for (action_name, action_path, frame_paths), futures in zip(actions, pending):
+                frames = []
+                try:
+                    for frame_index, frame_path in enumerate(frame_paths):
                         try:
-                            image = self.trim_surface(pygame.image.load(frame_path).convert_alpha())
+                            if futures:
+                                decoded = futures[frame_index].result()
+                            else:
+                                decoded = pygame.image.load(frame_path)
+                            image = self.trim_surface(decoded.convert_alpha())
                             frames.append(image)
                         except pygame.error as e:
                             print(f"Warning: Could not load image '{frame_path}': {e}")
                     
                     if frames:
-                        is_looping = action_name not in self.NON_LOOPING_ACTIONS
-                        clip = AnimationClip(frames, fps=self.default_fps, loop=is_looping)
+                        options = self.clip_options.get(action_name, {})
+                        is_looping = options.get('loop', action_name not in self.NON_LOOPING_ACTIONS)
+                        clip = AnimationClip(frames, fps=options.get('fps', self.default_fps), loop=is_looping)
                         self.animations[action_name] = clip
                         print(f"Animator: Loaded action '{action_name}' with {len(frames)} frames (looping: {is_looping}).")
                     else:
                         print(f"Warning: No valid PNG frames found in '{action_path}' for action '{action_name}'.")
                 except Exception as e:
                     print(f"Error processing directory '{action_path}': {e}")
+        finally:
+            if pool:
+                pool.shutdown(cancel_futures=True)
         
         if not self.animations:
             print(f"Warning: Animator loaded no animations from '{base_path}'.")
@@ -150,26 +255,44 @@ class Animator:
                 # Optional: Stop the previous animation if needed, though reset handles start
                 pass 
             self.current_action_name = action_name
-            self.animations[self.current_action_name].reset()
+            self.current_clip = self.animations[action_name]
+            self.current_clip.reset()
             # print(f"Animator: Set action to '{action_name}'") # For debugging
         else:
             # print(f"Warning: Animator action '{action_name}' not found. Current action: {self.current_action_name}")
             pass # Keep current animation or do nothing if no current_action_name
 
+    def set_state(self, state):
+        """Plays the clip compiled for a state (an index into ANIMATION_STATES); same rules as set_action."""
+        entry = self.state_table[state]
+        if entry is None:
+            return # No clip for this state: keep the current one, as set_action does for unknown names
+        name, clip = entry
+        if clip is self.current_clip and clip.is_playing:
+            return
+        self.current_action_name = name
+        self.current_clip = clip
+        clip.reset()
+
+    def clear_action(self):
+        """Stops the current clip; the placeholder is shown until an action is set."""
+        self.current_action_name = None
+        self.current_clip = None
+
     def update(self, dt):
         """Updates the current animation clip."""
-        if self.current_action_name and self.current_action_name in self.animations:
-            self.animations[self.current_action_name].update(dt)
-
-    def get_current_image(self):
-        """Returns the surface of the current animation's active frame."""
-        if self.current_action_name and self.current_action_name in self.animations:
-            return self.animations[self.current_action_name].get_current_image()
-        return self.placeholder_image # Return a placeholder if no valid action is set
+        if self.current_clip is not None:
+            self.current_clip.update(dt)
+
+    def get_current_image(self, facing=1):
+        """Returns the surface of the current animation's active frame for the given facing (1 right, -1 left)."""
+        if self.current_clip is not None:
+            return self.current_clip.get_current_image(facing)
+        # Return a placeholder if no valid action is set
+        return self.placeholder_image_left if facing < 0 else self.placeholder_image
     
     def is_current_action_finished(self):
         """Checks if the current non-looping animation has finished."""
-        if self.current_action_name and self.current_action_name in self.animations:
-            clip = self.animations[self.current_action_name]
-            return clip.is_finished()
+        if self.current_clip is not None:
+            return self.current_clip.is_finished()
         return True # If no action, consider it 'finished'
@@ -0,0 +1,176 @@
+import weakref
+import pygame
+from src.settings import TILE_SIZE
+
+_hitbox_masks = weakref.WeakKeyDictionary() # image -> (rect size, mask); shared images get one mask for all their sprites
+_full_masks = {} # rect size -> solid mask, for sprites without an image
+
+class SpatialHashGroup(pygame.sprite.Group):
+    """Sprite group that also indexes its sprites by grid cell for fast area queries.
+
+    Sprites are indexed by the rect they have when added, so this is meant for
+    static level geometry (tiles). The index follows add/remove/kill automatically.
+    """
+    def __init__(self, *sprites, cell_size=TILE_SIZE):
+        self.cell_size = cell_size
+        self.cells = {} # (col, row) -> list of sprites overlapping that cell
+        self._sprite_cells = {} # sprite -> cells it was indexed under
+        self._multi_cell_sprites = 0 # Sprites spanning several cells need de-duplication in query
+        super().__init__(*sprites)
+
+    def _cells_for(self, rect):
+        size = self.cell_size
+        return [(col, row)
+                for col in range(rect.left // size, (rect.right - 1) // size + 1)
+                for row in range(rect.top // size, (rect.bottom - 1) // size + 1)]
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        if sprite in self._sprite_cells:
+            return
+        cells = self._cells_for(sprite.rect)
+        self._sprite_cells[sprite] = cells
+        if len(cells) > 1:
+            self._multi_cell_sprites += 1
+        for cell in cells:
+            self.cells.setdefault(cell, []).append(sprite)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        cells = self._sprite_cells.pop(sprite, ())
+        if len(cells) > 1:
+            self._multi_cell_sprites -= 1
+        for cell in cells:
+            bucket = self.cells.get(cell)
+            if bucket:
+                bucket.remove(sprite)
+                if not bucket:
+                    del self.cells[cell]
+
+    def query(self, rect):
+        """Returns the sprites whose rects overlap rect, checking only nearby cells."""
+        size = self.cell_size
+        cells = self.cells
+        found = []
+        for col in range(rect.left // size, (rect.right - 1) // size + 1):
+            for row in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                bucket = cells.get((col, row))
+                if bucket:
+                    for sprite in bucket:
+                        if sprite.rect.colliderect(rect):
+                            found.append(sprite)
+        if self._multi_cell_sprites and len(found) > 1:
+            found = list(dict.fromkeys(found)) # Drop duplicates, keeping order
+        return found
+
+def hitbox_mask(image, size):
+    """Returns the mask of image's opaque pixels inside a size-sized rect at the image's top-left.
+
+    Built once per surface and cached for as long as the surface lives, so tiles sharing
+    an image and each animation frame cost one mask. Pixels outside the rect are cut off,
+    so a mask never collides where the sprite's rect doesn't.
+    """
+    if image is None:
+        mask = _full_masks.get(size)
+        if mask is None:
+            mask = _full_masks[size] = pygame.Mask(size, fill=True)
+        return mask
+    entry = _hitbox_masks.get(image)
+    if entry is None or entry[0] != size:
+        mask = pygame.mask.from_surface(image)
+        if mask.get_size() != size:
+            clipped = pygame.Mask(size)
+            clipped.draw(mask, (0, 0))
+            mask = clipped
+        entry = _hitbox_masks[image] = (size, mask)
+    return entry[1]
+
+def _sprite_mask(sprite):
+    mask = getattr(sprite, 'mask', None) # A fixed body shape, as pygame.sprite.collide_mask uses
+    if mask is not None:
+        return mask
+    return hitbox_mask(getattr(sprite, 'image', None), sprite.rect.size)
+
+def collide_hitbox_mask(sprite, other):
+    """Collision test for spritecollideany and friends: rects first, then the cached masks.
+
+    A sprite's mask attribute wins over its image, so bodies whose image changes every
+    frame (the player's animation) can keep a fixed shape. Sprites with neither collide
+    as their full rect.
+    """
+    if not sprite.rect.colliderect(other.rect):
+        return False
+    mask = _sprite_mask(sprite)
+    other_mask = _sprite_mask(other)
+    return mask.overlap(other_mask, (other.rect.x - sprite.rect.x, other.rect.y - sprite.rect.y)) is not None
+
+class SweepHit:
+    """Result of a swept-AABB test: time of impact in [0, 1] and the contact normal."""
+    __slots__ = ('time', 'normal', 'sprite')
+
+    def __init__(self, time, normal, sprite=None):
+        self.time = time
+        self.normal = normal # (nx, ny), pointing away from the surface that was hit
+        self.sprite = sprite
+
+def sweep_aabb(rect, dx, dy, other):
+    """Sweeps rect by (dx, dy) against the static rect other.
+
+    Returns a SweepHit for the first contact along the motion, or None when the
+    boxes don't meet. Like colliderect, merely ending flush against other is not a
+    hit, and boxes that already overlap at the start are ignored so a mover can
+    always get out.
+    """
+    if dx > 0:
+        entry_x, exit_x = other.left - rect.right, other.right - rect.left
+    else:
+        entry_x, exit_x = other.right - rect.left, other.left - rect.right
+    if dy > 0:
+        entry_y, exit_y = other.top - rect.bottom, other.bottom - rect.top
+    else:
+        entry_y, exit_y = other.bottom - rect.top, other.top - rect.bottom
+
+    if dx == 0:
+        if rect.right <= other.left or rect.left >= other.right:
+            return None
+        entry_time_x, exit_time_x = float('-inf'), float('inf')
+    else:
+        entry_time_x, exit_time_x = entry_x / dx, exit_x / dx
+    if dy == 0:
+        if rect.bottom <= other.top or rect.top >= other.bottom:
+            return None
+        entry_time_y, exit_time_y = float('-inf'), float('inf')
+    else:
+        entry_time_y, exit_time_y = entry_y / dy, exit_y / dy
+
+    entry_time = max(entry_time_x, entry_time_y)
+    exit_time = min(exit_time_x, exit_time_y)
+    # Strict inequality: a move that ends exactly touching the other box isn't a collision
+    if entry_time >= exit_time or entry_time < 0 or entry_time >= 1:
+        return None
+
+    if entry_time_x > entry_time_y:
+        normal = (-1 if dx > 0 else 1, 0)
+    else:
+        normal = (0, -1 if dy > 0 else 1)
+    return SweepHit(entry_time, normal)
+
+def sweep_rect(rect, dx, dy, obstacles):
+    """Sweeps rect by (dx, dy) through a group of obstacles and returns the earliest SweepHit.
+
+    obstacles may be a SpatialHashGroup (only cells along the path are checked) or
+    any iterable of sprites.
+    """
+    path = rect.union(rect.move(dx, dy))
+    if hasattr(obstacles, 'query'):
+        candidates = obstacles.query(path)
+    else:
+        candidates = [sprite for sprite in obstacles if sprite.rect.colliderect(path)]
+
+    first_hit = None
+    for sprite in candidates:
+        hit = sweep_aabb(rect, dx, dy, sprite.rect)
+        if hit and (first_hit is None or hit.time < first_hit.time):
+            hit.sprite = sprite
+            first_hit = hit
+    return first_hit
@@ -0,0 +1,140 @@
+import math
+import time
+import pygame
+from src.settings import (FPS, FRAME_PACING_ENABLED, SIMULATION_HZ, RENDER_FPS_CAP, MAX_SIMULATION_SUBSTEPS,
+                          RENDER_FRAME_SKIP_MAX, PACING_SPIN_S, TIME_SCALE, TIME_SCALES)
+
+def display_refresh_rate():
+    """Returns the display refresh rate in Hz, or 0 if this pygame build can't tell."""
+    get_rate = getattr(pygame.display, 'get_current_refresh_rate', None)
+    try:
+        return get_rate() if get_rate else 0
+    except pygame.error:
+        return 0
+
+class FramePacer:
+    """Decides, each pass of the game loop, how many fixed simulation steps to run and whether to draw.
+
+    Real time is accumulated and spent in whole steps of 1 / sim_hz, so the game keeps
+    its speed when drawing is slow: late steps run back to back (at most max_substeps
+    per pass, older backlog is dropped), and while catching up up to max_skipped_renders
+    draws in a row are skipped. Draws are capped at render_hz. wait() sleeps until the
+    next deadline and busy-waits the last spin_s of it for low jitter.
+
+    With pacing disabled it falls back to the classic loop: clock.tick(FPS), one step
+    with the measured dt, and one draw per pass.
+
+    time_scale scales the real time fed to the accumulator, so the game speeds up or slows
+    down in whole ticks: every step still has the same dt, which keeps the per-tick player
+    physics and the dt-driven spikes, coins and tiles in sync. Fast-forward runs several
+    steps per draw; slow motion runs a step only every few draws; 0 pauses until step_once().
+    """
+    def __init__(self, clock, enabled=FRAME_PACING_ENABLED, sim_hz=SIMULATION_HZ, render_hz=RENDER_FPS_CAP,
+                 max_substeps=MAX_SIMULATION_SUBSTEPS, max_skipped_renders=RENDER_FRAME_SKIP_MAX, spin_s=PACING_SPIN_S,
+                 time_scale=TIME_SCALE):
+        self.clock = clock # Ticked once per draw, so clock.get_time()/get_fps() describe rendering
+        self.enabled = enabled
+        self.step_s = 1.0 / sim_hz
+        self.step_dt = self.step_s # dt to pass to each simulation step
+        self.render_interval_s = 1.0 / (render_hz or display_refresh_rate() or sim_hz)
+        self.max_substeps = max_substeps
+        self.max_skipped_renders = max_skipped_renders
+        self.spin_s = spin_s
+        self.time_scale = max(0.0, time_scale)
+        self.single_steps = 0 # Steps requested with step_once(), run on top of the scaled ones
+        self.simulation_time_s = 0.0 # Total dt handed to simulation steps
+
+        self.last_time = time.perf_counter()
+        self.accumulator_s = 0.0
+        self.next_render_time = self.last_time
+        self.catching_up = False
+        self.skipped_renders = 0 # Consecutive draws skipped so far
+        self.dropped_steps = 0 # Steps given up because the loop fell more than max_substeps behind
+        self.total_skipped_renders = 0
+
+    def steps_due(self):
+        """Accumulates the real time since the last call and returns how many steps to run now."""
+        if not self.enabled:
+            self.step_dt = self.clock.tick(FPS) / 1000.0
+            # Each tick keeps the measured dt; the scale only changes how many ticks run per pass
+            self.accumulator_s += self.time_scale
+            steps = int(self.accumulator_s)
+            self.accumulator_s -= steps
+            return self._count_steps(steps)
+
+        now = time.perf_counter()
+        self.accumulator_s += (now - self.last_time) * self.time_scale
+        self.last_time = now
+        steps = int(self.accumulator_s / self.step_s)
+        steps_per_pass = max(1, math.ceil(self.time_scale)) # Fast-forward runs several steps every pass
+        max_steps = self.max_substeps * steps_per_pass
+        if steps > max_steps:
+            self.dropped_steps += steps - max_steps
+            steps = max_steps
+            self.accumulator_s = steps * self.step_s # Forget the rest: better to slow down than to spiral
+        self.accumulator_s -= steps * self.step_s
+        self.catching_up = steps > steps_per_pass
+        return self._count_steps(steps)
+
+    def _count_steps(self, steps):
+        steps += self.single_steps
+        self.single_steps = 0
+        self.simulation_time_s += steps * self.step_dt
+        return steps
+
+    def simulation_time(self):
+        """Simulated seconds so far; a clock that slows down, speeds up and pauses with the time scale."""
+        return self.simulation_time_s
+
+    def set_time_scale(self, time_scale):
+        """Sets the simulated seconds per real second (0 pauses, 0.25 is slow motion, 4 fast-forward)."""
+        self.time_scale = max(0.0, time_scale)
+        self.accumulator_s = min(self.accumulator_s, self.step_s if self.enabled else 1.0) # No burst from the old scale
+        print(f"FramePacer: Time scale x{self.time_scale:g}{' (paused)' if not self.time_scale else ''}.")
+
+    def change_time_scale(self, direction):
+        """Moves to the next slower (direction < 0) or faster (> 0) entry of TIME_SCALES."""
+        index = min(range(len(TIME_SCALES)), key=lambda i: abs(TIME_SCALES[i] - self.time_scale))
+        index = max(0, min(len(TIME_SCALES) - 1, index + (1 if direction > 0 else -1)))
+        self.set_time_scale(TIME_SCALES[index])
+
+    def step_once(self):
+        """Runs exactly one extra simulation step on the next steps_due(), e.g. to advance frame by frame while paused."""
+        self.single_steps += 1
+
+    def resync(self):
+        """Forgets time spent away from the loop (e.g. blocked on input) instead of catching up on it."""
+        self.last_time = time.perf_counter()
+        self.accumulator_s = 0.0
+
+    def should_render(self):
+        """Returns whether to draw this pass (render cap reached and not skipping under load)."""
+        if not self.enabled:
+            return True
+        now = time.perf_counter()
+        if now < self.next_render_time:
+            return False
+        if self.catching_up and self.skipped_renders < self.max_skipped_renders:
+            self.skipped_renders += 1
+            self.total_skipped_renders += 1
+            return False
+        self.skipped_renders = 0
+        # Keep a steady cadence, but don't try to make up for draws that were missed
+        self.next_render_time = max(self.next_render_time + self.render_interval_s, now)
+        self.clock.tick()
+        return True
+
+    def wait(self):
+        """Sleeps, then spins, until the next simulation step or draw is due."""
+        if not self.enabled:
+            return # clock.tick(FPS) in steps_due already waited
+        if self.time_scale:
+            next_step_time = self.last_time + (self.step_s - self.accumulator_s) / self.time_scale
+            deadline = min(next_step_time, self.next_render_time)
+        else:
+            deadline = self.next_render_time # Paused: only draws are due
+        remaining = deadline - time.perf_counter()
+        if remaining > self.spin_s:
+            time.sleep(remaining - self.spin_s)
+        while time.perf_counter() < deadline:
+            pass
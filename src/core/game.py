@@ -1,56 +1,102 @@
+import os
 import pygame
 from src.settings import *
 from src.ui.menu import Menu
+from src.ui.editor import LevelEditor
 from src.levels.level_manager import LevelManager
-from src.core.util import events_handler, draw_frame, player_input
+from src.core.util import events_handler, update_frame, draw_frame, player_input
+from src.core.frame_pacer import FramePacer
+from src.core.power_manager import PowerManager
 from src.core.input_buffer import InputBuffer
-from src.core.voice_recognizer import VoiceRecognizer
+from src.levels.level_watcher import LevelFileWatcher
+# Voice recognition (vosk, sounddevice) and video capture (numpy) are imported where they're first used
 
 class Game:
     """Main game class managing states, levels, and menus."""
-    def __init__(self):
-        """Initialize Pygame, display, clock, and game state."""
+    def __init__(self, record=False, record_path=None, record_format=VIDEO_CAPTURE_FORMAT, profiler=None,
+                 time_scale=TIME_SCALE):
+        """Initialize Pygame, display, clock, and game state (optionally recording every frame).
+
+        profiler is an optional StartupProfiler that gets a mark after each subsystem.
+        time_scale is the starting game speed (see FramePacer); F3/F4 change it while playing.
+        """
+        self.profiler = profiler
         pygame.init()
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption(GAME_NAME) # Set a window title
         self.clock = pygame.time.Clock()
+        self.pacer = FramePacer(self.clock, time_scale=time_scale) # Fixed-rate simulation steps and a separately capped draw rate
         self.font = pygame.font.SysFont(None, 74) # Fallback
         self.small_font = pygame.font.SysFont(None, 36)
         print("Starting game...")
+        self._profile_mark("init pygame + display")
 
-        self.input_buffer = InputBuffer() # Initialize input buffer
+        self.input_buffer = InputBuffer(clock=self.pacer.simulation_time) # Buffered presses expire in game time, so they survive a pause
         self.current_state = GameState.MENU # Start in the menu
 
         # Initialize voice recognition enabled flag before Menu instantiation
         self.voice_recognition_enabled = VOICE_RECOGNITION_ENABLED_BY_DEFAULT
+        # The recognizer is created by get_voice_recognizer() when voice is first started, so
+        # neither the Vosk model nor the audio libraries are loaded before the first menu frame
+        self.voice_recognizer = None
+        if not (VOSK_MODEL_PATH and os.path.isdir(VOSK_MODEL_PATH)):
+            print("Game: Vosk model not found, voice commands will be disabled regardless of toggle.")
+            self.voice_recognition_enabled = False # Force disable if model isn't there
 
         self.menu = Menu(self)
+        self._profile_mark("init menu")
         self.level_manager = LevelManager(self) # Pass self to LevelManager
+        self.editor = LevelEditor(self) # GameState.EDITOR: paint the running level with the mouse
+
+        # Level hot reload: rebuild the current level when its file changes on disk
+        self.level_watcher = None
+        if LEVEL_HOT_RELOAD_ENABLED:
+            self.level_watcher = LevelFileWatcher()
+            self.level_watcher.start()
+        self._profile_mark("init levels + watcher")
+
+        # Video capture: each flipped frame is copied to a buffer ring and encoded off-thread
+        self.video_recorder = None
+        if record:
+            from src.core.video_recorder import VideoRecorder
+            self.video_recorder = VideoRecorder(record_path, record_format)
+            if not self.video_recorder.start(self.screen):
+                self.video_recorder = None
+            self._profile_mark("init video recorder")
 
-        # Voice recognition setup
-        self.voice_recognizer = VoiceRecognizer(input_buffer=self.input_buffer)
-        if self.voice_recognizer.model:
-            if self.voice_recognition_enabled:
-                print("Game: Vosk model loaded, voice recognition enabled and starting.")
-                self.voice_recognizer.start_listening()
+        # Power saving: slow the loop down while minimized, unfocused or idle in a menu
+        self.power_manager = PowerManager(enabled=POWER_SAVING_ENABLED and not self.video_recorder)
+        self.throttled = False
+
+    def _profile_mark(self, name):
+        if self.profiler:
+            self.profiler.mark(name)
+
+    def get_voice_recognizer(self):
+        """Creates the voice recognizer on first call; returns None if its Vosk model can't be loaded."""
+        if self.voice_recognizer is None:
+            if VOICE_RECOGNITION_MODE == "process":
+                from src.core.voice_process import ProcessVoiceRecognizer
+                self.voice_recognizer = ProcessVoiceRecognizer(input_buffer=self.input_buffer) # Decodes off the game's GIL
             else:
-                print("Game: Vosk model loaded, but voice recognition is disabled by default.")
-        else:
-            print("Game: Vosk model not loaded, voice commands will be disabled regardless of toggle.")
-            self.voice_recognition_enabled = False # Force disable if model isn't there
+                from src.core.voice_recognizer import VoiceRecognizer
+                self.voice_recognizer = VoiceRecognizer(input_buffer=self.input_buffer)
+            if not self.voice_recognizer.model:
+                print("Game: Vosk model not loaded, voice commands will be disabled regardless of toggle.")
+                self.voice_recognition_enabled = False # Force disable if model isn't there
+        return self.voice_recognizer if self.voice_recognizer.model else None
 
     def try_start_voice_recognition(self):
         """Starts voice recognition if enabled, model loaded, and not already listening."""
-        if self.voice_recognition_enabled and self.voice_recognizer and self.voice_recognizer.model:
-            if not self.voice_recognizer.is_listening():
-                print("Game: Starting voice recognition...")
-                self.voice_recognizer.start_listening()
-            else:
-                print("Game: Voice recognition already active.")
-        elif not self.voice_recognizer.model:
+        if not self.voice_recognition_enabled:
+            print("Game: Voice recognition is disabled by toggle.")
+        elif not self.get_voice_recognizer():
             print("Game: Cannot start voice recognition, Vosk model not loaded.")
+        elif not self.voice_recognizer.is_listening():
+            print("Game: Starting voice recognition...")
+            self.voice_recognizer.start_listening()
         else:
-            print("Game: Voice recognition is disabled by toggle.")
+            print("Game: Voice recognition already active.")
 
     def try_stop_voice_recognition(self):
         """Stops voice recognition if it's currently active."""
@@ -64,15 +110,66 @@ class Game:
         try:
             while True:
                 # --- Event Handling ---
-                dt = self.clock.tick(FPS) / 1000.0 # Delta time in seconds
-                events_handler(pygame.event.get(), self)
-                player_input(self) # Process player input based on the current state
-                draw_frame(self, dt) # Draw the current frame based on state, now with dt
+                events = pygame.event.get()
+                if not events and not self.video_recorder:
+                    if self.throttled:
+                        events = self._wait_for_events(self.power_manager.wait_ms) # Low tick rate in the background
+                    elif self.menu.static_screen == self.current_state:
+                        events = self._wait_for_events(STATIC_SCREEN_WAIT_MS) # Nothing on a static screen changes without input
+                self.power_manager.handle_events(events)
+                self._update_power_state()
+                events_handler(events, self)
+                if self.level_watcher:
+                    changed_level_files = self.level_watcher.poll_changes()
+                    if changed_level_files:
+                        self.level_manager.apply_level_file_changes(changed_level_files)
+                if self.voice_recognizer:
+                    self.voice_recognizer.poll_commands() # Recognized voice commands -> input buffer
+                # --- Simulation: as many fixed steps as real time calls for (frozen while throttled) ---
+                if not self.throttled:
+                    for _ in range(self.pacer.steps_due()):
+                        player_input(self) # Process player input based on the current state
+                        update_frame(self, self.pacer.step_dt)
                 self.input_buffer.clear_expired_inputs() # Clear expired inputs from the buffer
-                # --- Final Update --- 
-                pygame.display.flip() # Update the full display surface once per frame
+                # --- Rendering: capped separately, skipped briefly while catching up; only repaints while throttled ---
+                if self.power_manager.take_redraw() if self.throttled else self.pacer.should_render():
+                    dirty_rects = draw_frame(self)
+                    if dirty_rects is None:
+                        pygame.display.flip() # Update the full display surface once per drawn frame
+                    elif dirty_rects:
+                        pygame.display.update(dirty_rects) # Only the regions that changed
+                    if self.video_recorder:
+                        self.video_recorder.capture(self.screen)
+                self.pacer.wait() # Sleep/spin until the next step or draw is due
         finally:
-            # Ensure voice recognizer is stopped cleanly when game exits
-            if hasattr(self, 'voice_recognizer') and self.voice_recognizer:
-                print("Game: Stopping voice recognizer on exit...")
-                self.voice_recognizer.stop_listening()
\ No newline at end of file
+            self.shutdown()
+
+    def _update_power_state(self):
+        """Enters or leaves throttled mode when the PowerManager's verdict changes."""
+        throttled = self.power_manager.is_throttled(self.current_state)
+        if throttled == self.throttled:
+            return
+        self.throttled = throttled
+        print(f"Game: {'Throttling main loop (window in background or idle)' if throttled else 'Resuming full rate'}.")
+        if self.voice_recognizer:
+            self.voice_recognizer.set_paused(throttled)
+        self.pacer.resync() # Don't catch up on the time spent throttled
+
+    def _wait_for_events(self, timeout_ms):
+        """Sleeps in SDL until an event arrives (at most timeout_ms) and returns the pending events."""
+        event = pygame.event.wait(timeout_ms)
+        self.pacer.resync() # The wait isn't simulation time to catch up on
+        if event.type == pygame.NOEVENT:
+            return [] # Timed out; the loop still polls the level watcher and voice regularly
+        return [event] + pygame.event.get()
+
+    def shutdown(self):
+        """Stops the background helpers (recorder, level watcher, voice) before exiting."""
+        if self.video_recorder:
+            self.video_recorder.stop()
+        if self.level_watcher:
+            self.level_watcher.stop()
+        # Ensure voice recognizer is stopped cleanly when game exits
+        if hasattr(self, 'voice_recognizer') and self.voice_recognizer:
+            print("Game: Stopping voice recognizer on exit...")
+            self.voice_recognizer.stop_listening()
\ No newline at end of file
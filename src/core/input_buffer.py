@@ -2,14 +2,16 @@ import time
 
 class InputBuffer:
     """A class to manage input buffering for a game."""
-    def __init__(self, buffer_duration=0.2):
+    def __init__(self, buffer_duration=0.2, clock=time.time):
         """
         Initialize the input buffer.
         
         :param buffer_duration: The duration (in seconds) for which inputs are buffered.
+        :param clock: Function returning the current time in seconds (e.g. FramePacer.simulation_time).
         """
         self.buffer = []  # List to store buffered inputs as (key, timestamp) tuples
         self.buffer_duration = buffer_duration  # Maximum duration to keep inputs in the buffer
+        self.clock = clock
 
     def add_input(self, key):
         """
@@ -17,7 +19,7 @@ class InputBuffer:
         
         :param key: The key code of the input to add.
         """
-        self.buffer.append((key, time.time()))
+        self.buffer.append((key, self.clock()))
 
     def get_and_remove_input(self, key):
         """
@@ -36,7 +38,7 @@ class InputBuffer:
         """
         Remove inputs that have expired from the buffer.
         """
-        current_time = time.time()
+        current_time = self.clock()
         self.buffer = [
             (key, timestamp) for key, timestamp in self.buffer
             if current_time - timestamp <= self.buffer_duration
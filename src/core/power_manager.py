@@ -0,0 +1,60 @@
+import time
+import pygame
+from src.settings import GameState, POWER_SAVING_ENABLED, POWER_IDLE_TIMEOUT_S, POWER_THROTTLED_HZ
+
+# Events that count as the player being at the keyboard
+INPUT_EVENTS = {
+    pygame.KEYDOWN, pygame.KEYUP, pygame.TEXTINPUT,
+    pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEMOTION, pygame.MOUSEWHEEL,
+    pygame.JOYBUTTONDOWN, pygame.JOYAXISMOTION, pygame.JOYHATMOTION,
+}
+IDLE_STATES = (GameState.MENU, GameState.DEATH_SCREEN, GameState.GAME_OVER) # Gameplay never idles out
+
+class PowerManager:
+    """Decides from SDL window events and input inactivity when the main loop may slow down.
+
+    The loop is throttled while the window is minimized or hidden, while it has lost
+    input focus, and while a menu or static screen has seen no input for
+    idle_timeout_s. Throttled, Game.run blocks on events for up to 1 / throttled_hz
+    per pass, freezes the simulation, only draws when the window needs a repaint
+    and pauses voice decoding. Input, focus or the window reappearing ends it on the
+    same pass.
+    """
+    def __init__(self, enabled=POWER_SAVING_ENABLED, idle_timeout_s=POWER_IDLE_TIMEOUT_S, throttled_hz=POWER_THROTTLED_HZ):
+        self.enabled = enabled
+        self.idle_timeout_s = idle_timeout_s
+        self.wait_ms = int(1000 / throttled_hz) # Longest a throttled pass waits for events
+        self.focused = True # SDL reports focus changes, not the initial focus
+        self.minimized = False
+        self.last_input_time = time.perf_counter()
+        self.needs_redraw = False # Window was exposed or restored while throttled
+
+    def handle_events(self, events):
+        for event in events:
+            if event.type in INPUT_EVENTS:
+                self.last_input_time = time.perf_counter()
+            elif event.type == pygame.WINDOWFOCUSGAINED:
+                self.focused = True
+                self.last_input_time = time.perf_counter()
+            elif event.type == pygame.WINDOWFOCUSLOST:
+                self.focused = False
+            elif event.type in (pygame.WINDOWMINIMIZED, pygame.WINDOWHIDDEN):
+                self.minimized = True
+            elif event.type in (pygame.WINDOWRESTORED, pygame.WINDOWMAXIMIZED, pygame.WINDOWSHOWN):
+                self.minimized = False
+                self.needs_redraw = True
+            elif event.type == pygame.WINDOWEXPOSED:
+                self.needs_redraw = True
+
+    def is_throttled(self, state):
+        """Returns whether the loop should run throttled in the given GameState."""
+        if not self.enabled:
+            return False
+        if self.minimized or not self.focused:
+            return True
+        return state in IDLE_STATES and time.perf_counter() - self.last_input_time > self.idle_timeout_s
+
+    def take_redraw(self):
+        """Returns (and clears) whether a throttled loop must draw one frame, e.g. after an expose."""
+        redraw, self.needs_redraw = self.needs_redraw and not self.minimized, False
+        return redraw
@@ -0,0 +1,76 @@
+import weakref
+import pygame
+from src.settings import RENDER_SCALE
+
+class RenderTarget:
+    """The surface the world is drawn on: the display itself, or a smaller one scaled up by present().
+
+    With scale > 1 everything is drawn at 1/scale resolution, so fills and blits touch
+    scale**2 times fewer pixels, and present() scales the result up to the display in one
+    pass. Callers keep working in display pixels; blit() uses a downscaled copy of each
+    image, made the first time that surface is drawn and dropped when it's freed. Images
+    must therefore not be drawn on after they're first shown; sprites that change look
+    switch to another surface instead (see Tile).
+    """
+    def __init__(self, display_surface, scale=RENDER_SCALE):
+        self.display_surface = display_surface
+        self.scale = max(1, int(scale))
+        if self.scale == 1:
+            self.surface = display_surface
+        else:
+            width, height = display_surface.get_size()
+            self.surface = pygame.Surface((width // self.scale, height // self.scale)).convert(display_surface)
+        self.scaled_images = weakref.WeakKeyDictionary() # Source surface -> downscaled copy
+
+    def fill(self, color, rect=None):
+        """Fills rect (display pixels, whole surface if None) with color."""
+        if rect is not None and self.scale > 1:
+            scale = self.scale
+            left, top = rect.left // scale, rect.top // scale
+            rect = pygame.Rect(left, top, rect.right // scale - left, rect.bottom // scale - top)
+        self.surface.fill(color, rect)
+
+    def blit(self, image, pos):
+        """Draws image with its top-left at pos (display pixels)."""
+        if self.scale == 1:
+            self.surface.blit(image, pos)
+            return
+        scaled = self.scaled_images.get(image)
+        if scaled is None:
+            scaled = self.scaled_images[image] = self._downscale(image)
+        self.surface.blit(scaled, (int(pos[0]) // self.scale, int(pos[1]) // self.scale))
+
+    def blit_sprites(self, sprites, offset):
+        """Draws each sprite's image at its rect's top-left minus offset, in order, in one blits() call."""
+        offset_x, offset_y = offset
+        if self.scale == 1:
+            self.surface.blits([(sprite.image, (sprite.rect.x - offset_x, sprite.rect.y - offset_y))
+                                for sprite in sprites], False)
+            return
+        scale = self.scale
+        scaled_images = self.scaled_images
+        batch = []
+        for sprite in sprites:
+            image = sprite.image
+            scaled = scaled_images.get(image)
+            if scaled is None:
+                scaled = scaled_images[image] = self._downscale(image)
+            batch.append((scaled, (int(sprite.rect.x - offset_x) // scale, int(sprite.rect.y - offset_y) // scale)))
+        self.surface.blits(batch, False)
+
+    def invalidate(self, image):
+        """Drops the downscaled copy of an image that was drawn on in place (e.g. a re-baked level chunk)."""
+        self.scaled_images.pop(image, None)
+
+    def _downscale(self, image):
+        width, height = image.get_size()
+        size = (max(1, width // self.scale), max(1, height // self.scale))
+        try:
+            return pygame.transform.smoothscale(image, size) # Averages pixels, so thin details survive
+        except ValueError: # smoothscale only takes 24/32-bit surfaces
+            return pygame.transform.scale(image, size)
+
+    def present(self):
+        """Scales the low-resolution surface up onto the display (nothing to do at scale 1)."""
+        if self.scale > 1:
+            pygame.transform.scale(self.surface, self.display_surface.get_size(), self.display_surface)
@@ -0,0 +1,29 @@
+class SpritePool:
+    """Keeps killed sprites for reuse, so rebuilding a level reinitializes instances instead of allocating new ones.
+
+    Pooled classes implement reinit(*args), which must leave the sprite in the same
+    state as __init__(*args) would. Sprites are kept per class; get() falls back to
+    constructing a new one when the pool has none left.
+    """
+    def __init__(self):
+        self.free = {} # class -> released sprites
+        self.reused = 0 # Sprites handed out from the pool instead of constructed
+        self.created = 0
+
+    def get(self, cls, *args):
+        free = self.free.get(cls)
+        if free:
+            sprite = free.pop()
+            sprite.reinit(*args)
+            self.reused += 1
+            return sprite
+        self.created += 1
+        return cls(*args)
+
+    def release(self, sprite):
+        """Removes sprite from all its groups and keeps it for a later get()."""
+        sprite.kill()
+        self.free.setdefault(type(sprite), []).append(sprite)
+
+    def __len__(self):
+        return sum(len(free) for free in self.free.values())
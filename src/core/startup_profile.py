@@ -0,0 +1,23 @@
+import time
+
+class StartupProfiler:
+    """Times each step of game startup for `main.py --profile-startup`.
+
+    mark(name) records the time since the previous mark, so each subsystem is marked
+    right after it's imported or initialized; report() prints the breakdown.
+    """
+    def __init__(self, start=None):
+        self.start = time.perf_counter() if start is None else start
+        self.last = self.start
+        self.sections = [] # (name, seconds)
+
+    def mark(self, name):
+        now = time.perf_counter()
+        self.sections.append((name, now - self.last))
+        self.last = now
+
+    def report(self):
+        print("Startup profile:")
+        for name, seconds in self.sections:
+            print(f"  {name:<32} {seconds * 1000:8.1f} ms")
+        print(f"  {'total':<32} {(self.last - self.start) * 1000:8.1f} ms")
@@ -1,6 +1,6 @@
 import pygame
 import sys
-from src.settings import GameState
+from src.settings import GameState, SCREEN_WIDTH, WHITE
 
 def events_handler(events, game_instance):   
     for event in events:
@@ -14,11 +14,32 @@ def event_handler(event, game_instance):
             sys.exit()
         case pygame.KEYDOWN:
             keyboard_handler(event, game_instance)  # Delegate to keyboard handler
+        case pygame.MOUSEBUTTONDOWN | pygame.MOUSEBUTTONUP | pygame.MOUSEMOTION | pygame.MOUSEWHEEL:
+            if game_instance.current_state == GameState.EDITOR:
+                game_instance.editor.handle_mouse(event)
+        case pygame.WINDOWEXPOSED:
+            game_instance.menu.static_screen = None # Repaint a static screen the window system may have lost
         case _:
             pass
 
+def time_scale_key(event, pacer):
+    """Handles the game speed keys; returns True if event was one of them."""
+    if event.key == pygame.K_F3:
+        pacer.change_time_scale(-1) # Slower, down to paused
+    elif event.key == pygame.K_F4:
+        pacer.change_time_scale(1) # Faster
+    elif event.key == pygame.K_F5:
+        pacer.set_time_scale(1.0)
+    elif event.key == pygame.K_F6:
+        pacer.step_once() # One tick, for stepping through a dash while paused
+    else:
+        return False
+    return True
+
 def keyboard_handler(event, game_instance):
     """Handle keyboard input based on the current game state."""
+    if game_instance.current_state in (GameState.PLAYING, GameState.EDITOR) and time_scale_key(event, game_instance.pacer):
+        return
     match game_instance.current_state:
         case GameState.PLAYING:  # Use Enum member
             # Special case for 'N' key to advance to next level
@@ -26,15 +47,20 @@ def keyboard_handler(event, game_instance):
                 # Skip to next level immediately
                 print("Skipping to next level...")
                 game_instance.level_manager.next_level()
+            elif event.key == pygame.K_F2:
+                game_instance.editor.enter()
             else:
                 game_instance.input_buffer.add_input(event.key)  # Buffer other key presses
+        case GameState.EDITOR:
+            if not game_instance.editor.handle_key(event):
+                game_instance.input_buffer.add_input(event.key) # The player stays playable for testing edits
         case _:
             game_instance.menu.handle_input(event)  # Assuming Menu has handle_input
 
 def player_input(game_instance):
     """Process player input for the current game state."""
     match game_instance.current_state:
-        case GameState.PLAYING:  # Use Enum member
+        case GameState.PLAYING | GameState.EDITOR:  # Use Enum member
             # Voice jump is now handled by Player.process_input via VOICE_COMMAND_JUMP in buffer
             # Process buffered keyboard/controller/voice inputs via Player class
             if game_instance.level_manager and game_instance.level_manager.level and game_instance.level_manager.level.player:
@@ -42,22 +68,55 @@ def player_input(game_instance):
         case _:
             pass  # No player input to process in other states
 
-def draw_frame(game_instance, dt):
-    """Draw a single frame of the game, using delta time for updates."""
+def update_frame(game_instance, dt):
+    """Advance the simulation by one step for the current game state."""
+    match game_instance.current_state:
+        case GameState.PLAYING: # Use Enum member
+            if game_instance.level_manager.level:
+                game_instance.level_manager.level.update(dt) # Update logic only; drawing happens in draw_frame
+        case GameState.EDITOR:
+            game_instance.editor.update(dt) # The level keeps running while it's edited
+        case _:
+            pass # Menus and screens have no simulation of their own
+
+def draw_frame(game_instance):
+    """Draw a single frame of the game for the current state.
+
+    Returns the list of display rects that changed, or None if the whole display did.
+    """
+    dirty_rects = None
     match game_instance.current_state:
         case GameState.MENU: # Use Enum member
             game_instance.menu.draw() # Use the interactive draw method
         case GameState.PLAYING: # Use Enum member
             if game_instance.level_manager.level:
-                game_instance.level_manager.level.run(dt) # Update logic AND draw level content here, now with dt
+                game_instance.level_manager.level.draw() # Draw the level as the last update left it
             else:
                 # Safety check: If in PLAYING state but no level, return to menu
                 print("Warning: PLAYING state with no level loaded. Returning to menu.")
                 game_instance.menu.return_to_menu()
+        case GameState.EDITOR:
+            game_instance.editor.draw()
         case GameState.DEATH_SCREEN: # Use Enum member
-            game_instance.menu.draw_death_screen() # Placeholder call
+            dirty_rects = game_instance.menu.draw_death_screen() # Drawn once, then nothing changes
         case GameState.GAME_OVER: # Use Enum member
-            game_instance.menu.draw_game_over_screen() # Placeholder call
+            dirty_rects = game_instance.menu.draw_game_over_screen()
         case _:
             print("Unknown game state. Returning to menu.")
-            game_instance.menu.return_to_menu()
\ No newline at end of file
+            game_instance.menu.return_to_menu()
+    if dirty_rects is None:
+        game_instance.menu.static_screen = None # Something else is on the display now
+        if game_instance.pacer.time_scale != 1.0 and game_instance.current_state in (GameState.PLAYING, GameState.EDITOR):
+            draw_time_scale(game_instance)
+    return dirty_rects
+
+_time_scale_labels = {} # time scale -> rendered label, so the indicator isn't re-rendered every frame
+
+def draw_time_scale(game_instance):
+    """Shows the game speed in the top-right corner while it isn't normal."""
+    scale = game_instance.pacer.time_scale
+    label = _time_scale_labels.get(scale)
+    if label is None:
+        text = f"x{scale:g}" if scale else "PAUSED (F6: step)"
+        label = _time_scale_labels[scale] = game_instance.small_font.render(text, True, WHITE)
+    game_instance.screen.blit(label, label.get_rect(topright=(SCREEN_WIDTH - 10, 10)))
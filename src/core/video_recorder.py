@@ -0,0 +1,136 @@
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import numpy as np
+import pygame
+from src.settings import FPS, VIDEO_CAPTURE_DIR, VIDEO_CAPTURE_FORMAT, VIDEO_CAPTURE_BUFFER_SLOTS
+
+class VideoRecorder:
+    """Records displayed frames to a video (via ffmpeg) or a PNG sequence in the background.
+
+    capture() only copies the frame's raw pixels into one of a fixed ring of
+    preallocated buffers; an encoder thread converts queued frames to RGB, feeds them
+    to ffmpeg or saves them as PNGs, and hands each buffer back. When the encoder
+    falls behind and no buffer is free, the frame is dropped and counted instead of
+    stalling the game loop.
+    """
+    def __init__(self, output_path=None, output_format=VIDEO_CAPTURE_FORMAT, fps=FPS, slots=VIDEO_CAPTURE_BUFFER_SLOTS):
+        if output_format == 'ffmpeg' and not shutil.which('ffmpeg'):
+            print("VideoRecorder: ffmpeg not found on PATH, recording a PNG sequence instead.")
+            output_format = 'png'
+        self.output_format = output_format
+        self.fps = fps
+        self.slot_count = slots
+        if output_path is None:
+            stamp = time.strftime('%Y%m%d_%H%M%S')
+            output_path = os.path.join(VIDEO_CAPTURE_DIR, f"run_{stamp}.mp4" if output_format == 'ffmpeg' else f"run_{stamp}")
+        self.output_path = output_path
+
+        self.captured_frames = 0 # Frames copied into a buffer (and later encoded)
+        self.dropped_frames = 0 # Frames skipped because every buffer was still queued
+        self.encoded_frames = 0
+        self.frame_size = None
+        self.slots = [] # Preallocated raw frame buffers, allocated by start()
+        self.free_slots = queue.Queue()
+        self.filled_slots = queue.Queue()
+        self.ffmpeg = None
+        self.thread = None
+        self.failed = False
+
+    def start(self, surface):
+        """Allocates the frame buffers for surface's size and format and starts the encoder."""
+        bytes_per_pixel = surface.get_bytesize()
+        if bytes_per_pixel not in (3, 4):
+            print(f"VideoRecorder: Unsupported {bytes_per_pixel}-byte pixel format, recording disabled.")
+            return False
+        self.frame_size = surface.get_size()
+        self.pitch = surface.get_pitch()
+        self.bytes_per_pixel = bytes_per_pixel
+        # Byte position of R, G and B inside one pixel, so the encoder can reorder without pygame
+        offsets = [shift // 8 for shift in surface.get_shifts()[:3]]
+        self.channel_offsets = offsets if sys.byteorder == 'little' else [bytes_per_pixel - 1 - o for o in offsets]
+
+        self.slots = [np.empty(self.pitch * self.frame_size[1], dtype=np.uint8) for _ in range(self.slot_count)]
+        for index in range(self.slot_count):
+            self.free_slots.put(index)
+
+        try:
+            if self.output_format == 'ffmpeg':
+                os.makedirs(os.path.dirname(self.output_path) or '.', exist_ok=True)
+                width, height = self.frame_size
+                self.ffmpeg = subprocess.Popen(
+                    ['ffmpeg', '-loglevel', 'error', '-y',
+                     '-f', 'rawvideo', '-pix_fmt', 'rgb24', '-s', f"{width}x{height}", '-r', str(self.fps), '-i', '-',
+                     '-an', '-c:v', 'libx264', '-preset', 'ultrafast', '-pix_fmt', 'yuv420p', self.output_path],
+                    stdin=subprocess.PIPE)
+            else:
+                os.makedirs(self.output_path, exist_ok=True)
+        except OSError as e:
+            print(f"VideoRecorder: Could not open '{self.output_path}': {e}")
+            return False
+
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        print(f"VideoRecorder: Recording to '{self.output_path}' ({self.output_format}).")
+        return True
+
+    def capture(self, surface):
+        """Queues a copy of surface's pixels for encoding; returns False if the frame was dropped."""
+        if not self.thread or surface.get_size() != self.frame_size:
+            return False
+        try:
+            index = self.free_slots.get_nowait()
+        except queue.Empty:
+            self.dropped_frames += 1
+            return False
+        view = surface.get_view('1') # Raw pixel bytes; locks the surface until released
+        self.slots[index][:] = np.frombuffer(view, dtype=np.uint8)
+        del view
+        self.filled_slots.put((index, self.captured_frames))
+        self.captured_frames += 1
+        return True
+
+    def _run(self):
+        width, height = self.frame_size
+        rgb = np.empty((height, width, 3), dtype=np.uint8) # Reused conversion target
+        while True:
+            item = self.filled_slots.get()
+            if item is None:
+                return
+            index, frame_number = item
+            pixels = self.slots[index].reshape(height, self.pitch)[:, :width * self.bytes_per_pixel]
+            np.take(pixels.reshape(height, width, self.bytes_per_pixel), self.channel_offsets, axis=2, out=rgb)
+            self.free_slots.put(index) # The raw buffer can be reused as soon as it's converted
+            if self.failed:
+                continue
+            try:
+                if self.ffmpeg:
+                    self.ffmpeg.stdin.write(rgb.data)
+                else:
+                    frame = pygame.image.frombuffer(rgb, (width, height), 'RGB')
+                    pygame.image.save(frame, os.path.join(self.output_path, f"frame_{frame_number:06d}.png"))
+                self.encoded_frames += 1
+            except (OSError, ValueError, pygame.error) as e:
+                print(f"VideoRecorder: Encoding failed, discarding further frames: {e}")
+                self.failed = True
+
+    def stop(self):
+        """Encodes the frames still queued, closes the output and prints the frame counters."""
+        if not self.thread:
+            return
+        self.filled_slots.put(None)
+        self.thread.join()
+        self.thread = None
+        if self.ffmpeg:
+            try:
+                self.ffmpeg.stdin.close()
+            except OSError:
+                pass
+            self.ffmpeg.wait()
+            self.ffmpeg = None
+        print(f"VideoRecorder: Wrote {self.encoded_frames} frames to '{self.output_path}' "
+              f"({self.dropped_frames} dropped of {self.captured_frames + self.dropped_frames}).")
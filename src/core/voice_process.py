@@ -0,0 +1,230 @@
+import json
+import multiprocessing
+import os
+import time
+from multiprocessing import shared_memory
+import numpy as np
+from src.settings import (VOSK_MODEL_PATH, VOSK_SAMPLE_RATE, VOSK_CHANNELS, VOSK_DEVICE_ID, VOICE_COMMAND_JUMP,
+                          VOICE_AUDIO_RING_SECONDS)
+
+SAMPLE_BYTES = 2 # int16 PCM, as Vosk expects
+
+class AudioRing:
+    """Single-producer, single-consumer byte ring in shared memory.
+
+    The header holds two byte counts: how far the writer has claimed (set before it
+    copies a block in) and how far it has written (advanced after the copy), so the
+    reader never sees a partial block. Like a seqlock, the reader rechecks the claimed
+    count after copying and drops whatever the writer may have overwritten meanwhile.
+    A reader that falls more than a full ring behind skips to the newest audio.
+    """
+    HEADER_BYTES = 16
+
+    def __init__(self, shm, size):
+        self.size = size
+        self.write_count = np.ndarray((1,), dtype=np.uint64, buffer=shm.buf)
+        self.claim_count = np.ndarray((1,), dtype=np.uint64, buffer=shm.buf, offset=8)
+        self.data = np.ndarray((size,), dtype=np.uint8, buffer=shm.buf, offset=self.HEADER_BYTES)
+        self.read_count = 0
+        self.skipped_bytes = 0 # Audio the reader lost by falling behind
+
+    @classmethod
+    def shm_size(cls, size):
+        return cls.HEADER_BYTES + size
+
+    def write(self, block):
+        """Appends a block of audio (any buffer, e.g. the sounddevice callback's array)."""
+        source = np.frombuffer(block, dtype=np.uint8)
+        count = int(self.write_count[0])
+        if len(source) > self.size: # Only the newest ring-full survives; count the rest as written
+            count += len(source) - self.size
+            source = source[-self.size:]
+        self.claim_count[0] = count + len(source) # Before touching the data, so readers can tell what they raced with
+        start = count % self.size
+        first = min(len(source), self.size - start)
+        self.data[start:start + first] = source[:first]
+        self.data[:len(source) - first] = source[first:]
+        self.write_count[0] = count + len(source)
+
+    def read(self):
+        """Returns all audio written since the last read as bytes (b'' if there is none)."""
+        written = int(self.write_count[0])
+        if written - self.read_count > self.size:
+            self.skipped_bytes += written - self.size - self.read_count
+            self.read_count = written - self.size
+        available = written - self.read_count
+        if not available:
+            return b''
+        start = self.read_count % self.size
+        first = min(available, self.size - start)
+        chunk = self.data[start:start + first].tobytes()
+        if first < available:
+            chunk += self.data[:available - first].tobytes()
+        # Bytes older than a ring behind the writer's claim may have been overwritten while we copied
+        overwritten = min(int(self.claim_count[0]) - self.size - self.read_count, available)
+        if overwritten > 0:
+            self.skipped_bytes += overwritten
+            chunk = chunk[overwritten:]
+        self.read_count = written
+        return chunk
+
+def _capture_main(shm_name, ring_size, stop_event, device_id):
+    """Child process: streams microphone audio into the shared ring until stop_event is set."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    ring = AudioRing(shm, ring_size)
+
+    def audio_callback(indata, frames, time_info, status):
+        if status:
+            print(f"Sounddevice status: {status}")
+        ring.write(indata) # Straight into shared memory, no per-block bytes() copy or queue
+
+    try:
+        import sounddevice as sd
+        if device_id is None:
+            device_id = sd.default.device[0]
+        with sd.InputStream(samplerate=VOSK_SAMPLE_RATE, channels=VOSK_CHANNELS, dtype='int16',
+                            device=device_id, callback=audio_callback, blocksize=400):
+            print(f"Voice capture process: Stream started on device ID {device_id}.")
+            stop_event.wait()
+    except Exception as e:
+        print(f"Voice capture process: Error with sounddevice stream: {e}")
+    finally:
+        del ring # Release the numpy views before closing the mapping
+        shm.close()
+
+def _decoder_main(shm_name, ring_size, model_path, stop_event, pause_event, command_conn):
+    """Child process: runs Vosk on audio from the ring and sends commands back over command_conn."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    ring = AudioRing(shm, ring_size)
+    try:
+        import vosk
+        recognizer = vosk.KaldiRecognizer(vosk.Model(model_path), VOSK_SAMPLE_RATE)
+        print("Voice decoder process: Vosk recognizer created. Listening for 'jump'...")
+        detected_jump_in_current_segment = False
+        while not stop_event.is_set():
+            if pause_event.is_set():
+                ring.read() # Drop audio captured while paused, so nothing stale is decoded on resume
+                time.sleep(0.1)
+                continue
+            data = ring.read()
+            if not data:
+                time.sleep(0.01) # Audio arrives in 25 ms blocks
+                continue
+            if recognizer.AcceptWaveform(data):
+                detected_jump_in_current_segment = False
+                command = json.loads(recognizer.Result()).get('text', '').lower()
+                print(f"Final recognized: {command}")
+            else:
+                partial_command = json.loads(recognizer.PartialResult()).get('partial', '').lower()
+                if "jump" in partial_command and not detected_jump_in_current_segment:
+                    command_conn.send(VOICE_COMMAND_JUMP)
+                    detected_jump_in_current_segment = True
+    except Exception as e:
+        print(f"Voice decoder process: Error in Vosk audio processing: {e}")
+    finally:
+        command_conn.close()
+        del ring
+        shm.close()
+
+class ProcessVoiceRecognizer:
+    """Voice recognition with audio capture and Vosk decoding in child processes.
+
+    Same interface as VoiceRecognizer, so Game can use either. Audio moves from the
+    capture process to the decoder process through an AudioRing in shared memory, and
+    recognized commands come back over a one-way pipe; the game loop drains it into the
+    InputBuffer with poll_commands(), so decoding never holds the game's GIL.
+    """
+    def __init__(self, input_buffer, model_path=VOSK_MODEL_PATH):
+        self.input_buffer = input_buffer
+        self.model_path = model_path
+        # The model itself is loaded by the decoder process; here we only check it's there
+        self.model = model_path if model_path and os.path.isdir(model_path) else None
+        if not self.model:
+            print(f"Error: Vosk model directory '{model_path}' not found.")
+            print("You can download models from: https://alphacephei.com/vosk/models")
+        self.ring_size = int(VOSK_SAMPLE_RATE * VOICE_AUDIO_RING_SECONDS) * VOSK_CHANNELS * SAMPLE_BYTES
+        self._context = multiprocessing.get_context('spawn') # No forking of the SDL/pygame process
+        self._listening_flag = False
+        self.shm = None
+        self.stop_event = None
+        self.pause_event = self._context.Event() # Set while decoding is paused (see set_paused)
+        self.command_conn = None
+        self.processes = []
+
+    def start_listening(self):
+        """Starts the capture and decoder processes."""
+        if not self.model:
+            print("Cannot start listening: Vosk model not found.")
+            return
+        if self.is_listening():
+            print("Already listening.")
+            return
+        if self._listening_flag: # A child process died; reap it and free its ring before starting over
+            print("Voice recognizer process exited, restarting.")
+            self._release()
+
+        self.shm = shared_memory.SharedMemory(create=True, size=AudioRing.shm_size(self.ring_size))
+        self.shm.buf[:AudioRing.HEADER_BYTES] = bytes(AudioRing.HEADER_BYTES) # Write counter starts at 0
+        self.stop_event = self._context.Event()
+        self.command_conn, child_conn = self._context.Pipe(duplex=False)
+        self.processes = [
+            self._context.Process(target=_capture_main, name="voice-capture", daemon=True,
+                                  args=(self.shm.name, self.ring_size, self.stop_event, VOSK_DEVICE_ID)),
+            self._context.Process(target=_decoder_main, name="voice-decoder", daemon=True,
+                                  args=(self.shm.name, self.ring_size, self.model_path, self.stop_event, self.pause_event,
+                                        child_conn)),
+        ]
+        for process in self.processes:
+            process.start()
+        child_conn.close() # Only the decoder writes to it now
+        self._listening_flag = True
+        print("Voice recognizer processes started.")
+
+    def set_paused(self, paused):
+        """Pauses or resumes decoding in the decoder process; capture keeps running so resuming is immediate."""
+        if paused:
+            self.pause_event.set()
+        else:
+            self.pause_event.clear()
+
+    def poll_commands(self):
+        """Moves commands recognized since the last call into the InputBuffer (call once per frame)."""
+        if not self.command_conn:
+            return 0
+        received = 0
+        try:
+            while self.command_conn.poll():
+                self.input_buffer.add_input(self.command_conn.recv())
+                received += 1
+        except (EOFError, OSError):
+            self.command_conn = None # Decoder exited
+        return received
+
+    def stop_listening(self):
+        """Stops both processes and frees the shared ring."""
+        if not self._listening_flag:
+            return
+        print("Stopping voice recognizer...")
+        self._release()
+        print("Voice recognizer stopped.")
+
+    def _release(self):
+        """Stops both processes and frees the pipe and the shared ring."""
+        self._listening_flag = False
+        self.stop_event.set()
+        for process in self.processes:
+            process.join(timeout=1.0)
+            if process.is_alive():
+                print(f"Voice recognizer process '{process.name}' did not stop in time, terminating.")
+                process.terminate()
+        self.processes = []
+        if self.command_conn:
+            self.command_conn.close()
+            self.command_conn = None
+        self.shm.close()
+        self.shm.unlink()
+        self.shm = None
+
+    def is_listening(self):
+        """Returns True while both child processes are running."""
+        return self._listening_flag and all(process.is_alive() for process in self.processes)
@@ -1,5 +1,3 @@
-import vosk
-import sounddevice as sd
 import threading
 import json
 import queue
@@ -24,10 +22,12 @@ class VoiceRecognizer:
         self._listening_flag = False
         self.thread = None
         self.audio_queue = queue.Queue()
+        self.paused = False # While True, captured audio is dropped instead of decoded
 
         try:
             if not VOSK_MODEL_PATH:
                 raise ValueError("VOSK_MODEL_PATH is not set in settings.py")
+            import vosk # Imported here so the game starts without it when voice is unused
             self.model = vosk.Model(self.model_path)
             print(f"Vosk model loaded successfully from {self.model_path}")
         except Exception as e:
@@ -42,6 +42,7 @@ class VoiceRecognizer:
             self._listening_flag = False
             return
 
+        import vosk
         self.recognizer = vosk.KaldiRecognizer(self.model, VOSK_SAMPLE_RATE)
         print("Vosk recognizer created. Listening for 'jump'...")
 
@@ -50,6 +51,8 @@ class VoiceRecognizer:
         while self._listening_flag:
             try:
                 data = self.audio_queue.get(timeout=0.05)
+                if self.paused:
+                    continue # Drop audio captured while paused
                 
                 if self.recognizer.AcceptWaveform(data):
                     detected_jump_in_current_segment = False
@@ -89,6 +92,7 @@ class VoiceRecognizer:
 
         self._listening_flag = True
         try:
+            import sounddevice as sd # Raises OSError without PortAudio, so only on demand
             # Query devices if VOSK_DEVICE_ID is None to help user choose
             if VOSK_DEVICE_ID is None:
                 print("Available audio input devices:")
@@ -153,6 +157,14 @@ class VoiceRecognizer:
         """Returns True if the recognizer is actively listening, False otherwise."""
         return self._listening_flag and self.thread is not None and self.thread.is_alive()
 
+    def set_paused(self, paused):
+        """Pauses or resumes decoding; the stream stays open so resuming is immediate."""
+        self.paused = paused
+
+    def poll_commands(self):
+        """Nothing to collect: the recognizer thread adds commands to the InputBuffer itself."""
+        return 0
+
 # Example Usage (for testing this module directly, not part of the game integration)
 if __name__ == '__main__':
     import time
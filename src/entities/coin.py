@@ -1,55 +1,88 @@
 import pygame
 from src.settings import TILE_SIZE, COIN_COLOR_PRIMARY, COIN_COLOR_SHINE, COIN_ANIMATION_SPEED, COIN_RADIUS
 
-class Coin(pygame.sprite.Sprite):
-    """Represents a rotating coin that can be collected by the player."""
-    def __init__(self, pos, groups):
-        super().__init__(groups)
-        self.frames = []
-        self._create_frames()
+class CoinAnimation:
+    """Level-wide clock that spins every coin in sync using one shared frame set."""
+    def __init__(self):
+        self.frames = Coin.get_frames()
+        self.reset()
+
+    def update(self, dt):
+        """Advances the shared coin animation."""
+        self.animation_timer += dt
+        if self.animation_timer >= COIN_ANIMATION_SPEED:
+            self.animation_timer = 0
+            self.current_frame_index = (self.current_frame_index + 1) % len(self.frames)
+            self.image = self.frames[self.current_frame_index]
+
+    def reset(self):
+        """Restarts the animation on its first frame."""
+        self.animation_timer = 0
         self.current_frame_index = 0
         self.image = self.frames[self.current_frame_index]
-        
+
+class Coin(pygame.sprite.Sprite):
+    """Represents a rotating coin that can be collected by the player.
+
+    Coins don't animate themselves: their image comes from the CoinAnimation the
+    level drives once per frame, so each coin only stores its position and whether
+    it has been collected.
+    """
+    _frames = None # Frame set shared by every coin, built on first use
+
+    def __init__(self, pos, groups, animation=None):
+        super().__init__()
+        self.reinit(pos, groups, animation)
+
+    def reinit(self, pos, groups, animation=None):
+        """(Re)initializes the coin in place; used by __init__ and when the level's SpritePool reuses it."""
+        self.animation = animation
+
         # Center the coin within the tile grid cell it's placed in
         center_x = pos[0] + TILE_SIZE // 2
         center_y = pos[1] + TILE_SIZE // 2
         self.rect = self.image.get_rect(center=(center_x, center_y))
 
-        self.animation_timer = 0
         self.is_collected = False
+        self.add(groups)
+
+    @property
+    def image(self):
+        """The current frame of the shared coin animation."""
+        if self.animation:
+            return self.animation.image
+        return Coin.get_frames()[0]
+
+    @classmethod
+    def get_frames(cls):
+        """Returns the shared animation frames, creating them on first call."""
+        if cls._frames is None:
+            cls._frames = cls._create_frames()
+        return cls._frames
 
-    def _create_frames(self):
+    @staticmethod
+    def _create_frames():
         """Creates the animation frames for the coin programmatically."""
+        frames = []
         # Frame 1: Full circle
         frame_1 = pygame.Surface((COIN_RADIUS * 2, COIN_RADIUS * 2), pygame.SRCALPHA)
         pygame.draw.circle(frame_1, COIN_COLOR_PRIMARY, (COIN_RADIUS, COIN_RADIUS), COIN_RADIUS)
         pygame.draw.circle(frame_1, COIN_COLOR_SHINE, (COIN_RADIUS - COIN_RADIUS // 3, COIN_RADIUS - COIN_RADIUS // 3), COIN_RADIUS // 4) # Shine
-        self.frames.append(frame_1)
+        frames.append(frame_1)
 
         # Frame 2: Squashed ellipse (width reduced)
         frame_2 = pygame.Surface((COIN_RADIUS * 2, COIN_RADIUS * 2), pygame.SRCALPHA)
         pygame.draw.ellipse(frame_2, COIN_COLOR_PRIMARY, pygame.Rect(COIN_RADIUS // 2, 0, COIN_RADIUS, COIN_RADIUS * 2))
-        self.frames.append(frame_2)
+        frames.append(frame_2)
 
         # Frame 3: Thin line (edge-on view)
         frame_3 = pygame.Surface((COIN_RADIUS * 2, COIN_RADIUS * 2), pygame.SRCALPHA)
         pygame.draw.line(frame_3, COIN_COLOR_PRIMARY, (COIN_RADIUS, 0), (COIN_RADIUS, COIN_RADIUS * 2), 3) # Line width 3
-        self.frames.append(frame_3)
+        frames.append(frame_3)
 
         # Frame 4: Squashed ellipse (same as frame 2, for smoother loop)
-        self.frames.append(frame_2.copy()) # Reuse frame 2
-
-    def update(self, dt):
-        """Updates the coin's animation."""
-        if not self.is_collected:
-            self.animation_timer += dt
-            if self.animation_timer >= COIN_ANIMATION_SPEED:
-                self.animation_timer = 0
-                self.current_frame_index = (self.current_frame_index + 1) % len(self.frames)
-                self.image = self.frames[self.current_frame_index]
-                # Keep rect centered if size changes, though for this animation it shouldn't significantly
-                # current_center = self.rect.center
-                # self.rect = self.image.get_rect(center=current_center)
+        frames.append(frame_2) # Shared frames are never drawn on, so reuse frame 2 as-is
+        return frames
 
     def collect(self):
         """Marks the coin as collected and makes it disappear."""
@@ -60,6 +93,4 @@ class Coin(pygame.sprite.Sprite):
     def reset(self):
         """Resets the coin to its initial state (uncollected)."""
         self.is_collected = False
-        self.current_frame_index = 0
-        self.image = self.frames[self.current_frame_index]
         # Note: The Level class will be responsible for adding it back to sprite groups.
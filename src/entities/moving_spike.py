@@ -4,9 +4,13 @@ from src.settings import TILE_SIZE, MOVING_SPIKE_SPEED, MOVING_SPIKE_HORIZONTAL_
 class MovingSpike(pygame.sprite.Sprite):
     """Represents a spike trap that moves horizontally."""
     def __init__(self, pos, groups):
-        super().__init__(groups)
+        super().__init__()
         self.image = pygame.Surface((TILE_SIZE, TILE_SIZE // 2)) # Make spikes shorter like traps
         self.image.fill(SILVER)
+        self.reinit(pos, groups)
+
+    def reinit(self, pos, groups):
+        """(Re)initializes the spike in place; used by __init__ and when the level's SpritePool reuses it."""
         # Adjust rect position to sit on top of the platform tile visually
         self.rect = self.image.get_rect(midbottom = (pos[0] + TILE_SIZE // 2, pos[1] + TILE_SIZE))
 
@@ -15,6 +19,7 @@ class MovingSpike(pygame.sprite.Sprite):
         self.max_x = self.start_x + (MOVING_SPIKE_HORIZONTAL_RANGE * TILE_SIZE)
         self.direction = 1 # 1 for right, -1 for left
         self.speed = MOVING_SPIKE_SPEED
+        self.add(groups)
 
     def update(self, dt=None):
         """Move the spike horizontally and reverse direction at boundaries.
@@ -0,0 +1,100 @@
+import pygame
+from src.settings import TILE_SIZE, LEVEL_CHUNK_SIZE, LEVEL_CHUNK_LOAD_MARGIN, LEVEL_CHUNK_EVICT_MARGIN
+
+class Chunk:
+    """A fixed-size square of the level grid whose sprites exist only while it is loaded."""
+    def __init__(self, key, rect):
+        self.key = key
+        self.rect = rect # World-space area covered by this chunk
+        self.sprites = [] # Everything built for this chunk's cells
+        self.surface = pygame.Surface(rect.size, pygame.SRCALPHA) # Static tiles, pre-rendered
+
+    def bake(self, sprite):
+        """Draws a static sprite into the chunk surface so it needn't be drawn per frame."""
+        self.surface.blit(sprite.image, (sprite.rect.x - self.rect.x, sprite.rect.y - self.rect.y))
+
+    def clear_cell(self, pos):
+        """Erases whatever was baked into the tile cell at pos (world pixels)."""
+        self.surface.fill((0, 0, 0, 0), pygame.Rect(pos[0] - self.rect.x, pos[1] - self.rect.y, TILE_SIZE, TILE_SIZE))
+
+class ChunkStreamer:
+    """Builds and evicts level chunks around the camera so large levels stay bounded.
+
+    Chunks within LEVEL_CHUNK_LOAD_MARGIN of the camera view are built through
+    Level.create_cell_sprites; chunks beyond LEVEL_CHUNK_EVICT_MARGIN are released
+    again. The gap between the two margins keeps chunks from thrashing at a border.
+    """
+    def __init__(self, level, layout, chunk_tiles=LEVEL_CHUNK_SIZE):
+        self.level = level
+        self.layout = layout
+        self.chunk_tiles = chunk_tiles
+        self.chunk_px = chunk_tiles * TILE_SIZE
+        self.width_tiles = max(len(row) for row in layout)
+        self.height_tiles = len(layout)
+        self.chunks_x = -(-self.width_tiles // chunk_tiles) # Ceiling division
+        self.chunks_y = -(-self.height_tiles // chunk_tiles)
+        self.chunks = {} # (chunk_x, chunk_y) -> Chunk
+        self.layers = {} # (chunk_x, chunk_y) -> (surface, rect), drawn by YSortCameraGroup
+        self.consumed_cells = set() # Cells whose coin/temporary platform is gone until respawn
+        self._view_span = None # Chunk range the camera covered at the last stream() call
+
+    def keys_around(self, view_rect, margin):
+        """Returns the chunk keys overlapping view_rect grown by margin chunks."""
+        first_x = max(0, view_rect.left // self.chunk_px - margin)
+        last_x = min(self.chunks_x - 1, (view_rect.right - 1) // self.chunk_px + margin)
+        first_y = max(0, view_rect.top // self.chunk_px - margin)
+        last_y = min(self.chunks_y - 1, (view_rect.bottom - 1) // self.chunk_px + margin)
+        return {(x, y) for x in range(first_x, last_x + 1) for y in range(first_y, last_y + 1)}
+
+    def chunk_at(self, col, row):
+        """Returns the loaded chunk containing grid cell (col, row), or None."""
+        return self.chunks.get((col // self.chunk_tiles, row // self.chunk_tiles))
+
+    def stream(self, view_rect):
+        """Loads chunks near view_rect and evicts those that drifted far away."""
+        view_span = (view_rect.left // self.chunk_px, view_rect.top // self.chunk_px,
+                     (view_rect.right - 1) // self.chunk_px, (view_rect.bottom - 1) // self.chunk_px)
+        if view_span == self._view_span:
+            return # Camera hasn't crossed a chunk border, so the loaded set is already right
+        self._view_span = view_span
+        keep = self.keys_around(view_rect, LEVEL_CHUNK_EVICT_MARGIN)
+        for key in [key for key in self.chunks if key not in keep]:
+            self.evict(key)
+        for key in self.keys_around(view_rect, LEVEL_CHUNK_LOAD_MARGIN):
+            if key not in self.chunks:
+                self.load(key)
+
+    def load(self, key):
+        """Builds the sprites and static surface for one chunk."""
+        chunk_x, chunk_y = key
+        first_col = chunk_x * self.chunk_tiles
+        first_row = chunk_y * self.chunk_tiles
+        last_col = min(first_col + self.chunk_tiles, self.width_tiles)
+        last_row = min(first_row + self.chunk_tiles, self.height_tiles)
+        rect = pygame.Rect(first_col * TILE_SIZE, first_row * TILE_SIZE,
+                           (last_col - first_col) * TILE_SIZE, (last_row - first_row) * TILE_SIZE)
+        chunk = Chunk(key, rect)
+
+        for row_index in range(first_row, last_row):
+            row = self.layout[row_index]
+            for col_index in range(first_col, min(last_col, len(row))):
+                cell = row[col_index]
+                if cell == ' ' or (col_index, row_index) in self.consumed_cells:
+                    continue
+                pos = (col_index * TILE_SIZE, row_index * TILE_SIZE)
+                chunk.sprites.extend(self.level.create_cell_sprites(cell, pos, chunk))
+
+        self.chunks[key] = chunk
+        self.layers[key] = (chunk.surface, chunk.rect)
+        return chunk
+
+    def evict(self, key):
+        """Releases a chunk's sprites and surface."""
+        chunk = self.chunks.pop(key)
+        del self.layers[key]
+        self.consumed_cells |= self.level.release_sprites(chunk.sprites)
+        chunk.sprites.clear()
+        cell_sprites = self.level.cell_sprites
+        for col in range(chunk.rect.left // TILE_SIZE, chunk.rect.right // TILE_SIZE):
+            for row in range(chunk.rect.top // TILE_SIZE, chunk.rect.bottom // TILE_SIZE):
+                cell_sprites.pop((col, row), None)
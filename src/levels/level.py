@@ -1,9 +1,15 @@
+import itertools
 import pygame
 from src.settings import *
 from src.levels.tile import Tile
 from src.player.player import Player
 from src.entities.moving_spike import MovingSpike
-from src.entities.coin import Coin
+from src.entities.coin import Coin, CoinAnimation
+from src.levels.platform_scheduler import PlatformScheduler
+from src.levels.chunks import ChunkStreamer
+from src.core.collision import SpatialHashGroup
+from src.core.render_target import RenderTarget
+from src.core.sprite_pool import SpritePool
 
 class Level:
     """Manages the game level, including tiles, player, and interactions."""
@@ -12,31 +18,46 @@ class Level:
         self.world_shift = 0
         self.game = game_instance
 
-        # map size
-        self.level_width = len(level_data[0]) * TILE_SIZE
-        self.level_height = len(level_data) * TILE_SIZE
+        # map size (recomputed by setup_level, since a hot-reloaded layout may change it)
+        self.level_width = 0
+        self.level_height = 0
 
         # Sprite group setup
         self.visible_sprites = YSortCameraGroup(self.level_width, self.level_height)
-        self.obstacle_sprites = pygame.sprite.Group()
+        self.active_sprites = pygame.sprite.Group() # Sprites with per-frame logic (player, moving spikes)
+        self.obstacle_sprites = SpatialHashGroup() # Indexed by tile cell for swept collision queries
         self.exit_sprites = pygame.sprite.Group() # Group for exit points
         self.checkpoint_sprites = pygame.sprite.Group() # Group for checkpoints
         self.moving_spike_sprites = pygame.sprite.Group() # Group for moving spikes
         self.trap_sprites = pygame.sprite.Group() # Group for traps
         self.coin_sprites = pygame.sprite.Group() # Group for coins
         self.all_coins_in_level = [] # Keep track of all coins for reset
+        self.coin_animation = CoinAnimation() # Single clock shared by every coin's spin
         self.temp_platforms = [] # Keep track of all temporary platforms for reset
-        self.periodic_platforms = [] # Keep track of all periodic platforms
+        self.platform_scheduler = PlatformScheduler(self.obstacle_sprites) # One clock for periodic/temp platforms
         self.initial_player_pos = None
         self.last_checkpoint_pos = None
         self.player = None
+        self.layout = level_data
+        self.chunk_streamer = None # Set by setup_level for levels large enough to stream
+        self.cell_sprites = {} # (col, row) -> sprites built for that layout cell (only built cells)
+        self.sprite_pool = SpritePool() # Tiles, coins and spikes from earlier layouts, reused by the next one
+        self.setup_count = 0 # Bumped by setup_level, so update() can tell the layout was swapped under it
 
         self.setup_level(level_data)
 
     def setup_level(self, layout):
         """Creates tiles and player based on the layout."""
+        # Return the previous layout's sprites to the pool; the player is kept and reinitialized below
+        player = self.player
+        for sprite in self._layout_sprites():
+            if sprite is not player:
+                self.sprite_pool.release(sprite)
+        self.setup_count += 1
+
         # Clear groups and reset state for new level load
         self.visible_sprites.empty()
+        self.active_sprites.empty()
         self.obstacle_sprites.empty()
         self.exit_sprites.empty()
         self.checkpoint_sprites.empty()
@@ -44,66 +65,217 @@ class Level:
         self.trap_sprites.empty()
         self.coin_sprites.empty()
         self.all_coins_in_level.clear() # Reset coins
+        self.cell_sprites.clear()
+        self.coin_animation.reset()
         self.temp_platforms.clear() # Reset temporary platforms list
-        self.periodic_platforms.clear() # Reset periodic platforms list
+        self.platform_scheduler.clear() # Reset periodic platforms and the shared platform clock
         self.initial_player_pos = None
         self.last_checkpoint_pos = None
         self.player = None
 
+        # map size
+        self.level_width = max(len(row) for row in layout) * TILE_SIZE
+        self.level_height = len(layout) * TILE_SIZE
+        self.visible_sprites.level_width = self.level_width
+        self.visible_sprites.level_height = self.level_height
+
+        self.layout = list(layout) # Own copy of the rows, since apply_cell_changes edits them
+        self.chunk_streamer = None
+        if LEVEL_CHUNK_STREAMING_ENABLED and (self.level_width // TILE_SIZE) * len(layout) >= LEVEL_CHUNK_STREAMING_MIN_CELLS:
+            # Large level: sprites are only built for chunks near the camera (see update_streaming)
+            self.chunk_streamer = ChunkStreamer(self, self.layout)
+        else:
+            for row_index, row in enumerate(layout):
+                for col_index, cell in enumerate(row):
+                    self.create_cell_sprites(cell, (col_index * TILE_SIZE, row_index * TILE_SIZE))
+        self.visible_sprites.chunk_layers = self.chunk_streamer.layers if self.chunk_streamer else {}
+
+        self.initial_player_pos = self._find_player_start(layout)
+        if player: # Groups and callbacks belong to this Level, so the same Player fits every layout
+            player.reinit(self.initial_player_pos, [self.visible_sprites, self.active_sprites])
+            self.player = player
+        else:
+            self.player = Player(
+                self.initial_player_pos,
+                [self.visible_sprites, self.active_sprites],
+                self.obstacle_sprites,
+                self.trap_sprites,
+                self.exit_sprites,
+                self.coin_sprites, # Added coin_sprites group for player to interact with
+                self.trigger_level_complete, 
+                self.trigger_player_death
+            )
+        self.update_streaming()
+
+    @staticmethod
+    def _find_player_start(layout):
+        """Returns the position of the first 'P' in the layout."""
         for row_index, row in enumerate(layout):
-            for col_index, cell in enumerate(row):
-                x = col_index * TILE_SIZE
-                y = row_index * TILE_SIZE
-                pos = (x, y)
-
-                if cell == 'X':
-                    Tile(pos, [self.visible_sprites, self.obstacle_sprites], tile_type='platform')
-                elif cell == 'S':
-                    Tile(pos, [self.visible_sprites, self.trap_sprites], tile_type='trap')
-                elif cell == 'E':
-                    Tile(pos, [self.visible_sprites, self.exit_sprites], tile_type='exit')
-                elif cell == 'C': 
-                    # Checkpoint should NOT be an obstacle
-                    tile = Tile(pos, [self.visible_sprites], tile_type='checkpoint') 
-                    self.checkpoint_sprites.add(tile) # Add ONLY to the dedicated checkpoint group
-                elif cell == 'M': 
-                    # Create platform below the moving spike's path
-                    Tile((x, y), [self.visible_sprites, self.obstacle_sprites])
-                    # Create the Moving Spike itself (ensure it's added to traps)
-                    MovingSpike((x, y), [self.visible_sprites, self.trap_sprites])
-                elif cell == TEMP_PLATFORM_CHAR:
-                    tile = Tile(pos, [self.visible_sprites, self.obstacle_sprites], tile_type='temp_platform')
-                    self.temp_platforms.append(tile)
-                elif cell == PERIODIC_PLATFORM_CHAR:
-                    tile = Tile(pos, [self.visible_sprites], tile_type='periodic_platform') # Only add to visible initially
-                    self.periodic_platforms.append(tile)
-                    if tile.is_currently_visible: # Add to obstacles if starting visible
-                        self.obstacle_sprites.add(tile)
-                elif cell == 'P': 
-                    if not self.initial_player_pos:
-                        self.initial_player_pos = pos
-                elif cell == COIN_CHAR:
-                    coin = Coin(pos, [self.visible_sprites, self.coin_sprites])
-                    self.all_coins_in_level.append(coin)
-
-        self.initial_player_pos = self.initial_player_pos if self.initial_player_pos else (100, 100) # Fallback position
-        self.player = Player(
-            self.initial_player_pos,
-            [self.visible_sprites],
-            self.obstacle_sprites,
-            self.trap_sprites,
-            self.exit_sprites,
-            self.coin_sprites, # Added coin_sprites group for player to interact with
-            self.trigger_level_complete, 
-            self.trigger_player_death
-        )
+            col_index = row.find('P')
+            if col_index != -1:
+                return (col_index * TILE_SIZE, row_index * TILE_SIZE)
+        return (100, 100) # Fallback position
+
+    def create_cell_sprites(self, cell, pos, chunk=None):
+        """Creates the sprites for one layout cell and returns them.
+
+        When a chunk is given, static tiles (platforms, traps, exits) are baked into the
+        chunk's render surface and only join their collision groups, not visible_sprites.
+        """
+        sprites = []
+        if cell == 'X':
+            sprites.append(self._static_tile(pos, [self.obstacle_sprites], 'platform', chunk))
+        elif cell == 'S':
+            sprites.append(self._static_tile(pos, [self.trap_sprites], 'trap', chunk))
+        elif cell == 'E':
+            sprites.append(self._static_tile(pos, [self.exit_sprites], 'exit', chunk))
+        elif cell == 'C': 
+            # Checkpoint should NOT be an obstacle
+            tile = self.sprite_pool.get(Tile, pos, [self.visible_sprites], 'checkpoint')
+            self.checkpoint_sprites.add(tile) # Add ONLY to the dedicated checkpoint group
+            if pos == self.last_checkpoint_pos: # Rebuilt by streaming after being activated
+                tile.activate()
+            sprites.append(tile)
+        elif cell == 'M': 
+            # Create platform below the moving spike's path
+            sprites.append(self._static_tile(pos, [self.obstacle_sprites], 'platform', chunk))
+            # Create the Moving Spike itself (ensure it's added to traps)
+            sprites.append(self.sprite_pool.get(MovingSpike, pos, [self.visible_sprites, self.active_sprites, self.trap_sprites]))
+        elif cell == TEMP_PLATFORM_CHAR:
+            tile = self.sprite_pool.get(Tile, pos, [self.visible_sprites, self.obstacle_sprites], 'temp_platform')
+            self.temp_platforms.append(tile)
+            self.platform_scheduler.add_temp(tile)
+            sprites.append(tile)
+        elif cell == PERIODIC_PLATFORM_CHAR:
+            tile = self.sprite_pool.get(Tile, pos, [self.visible_sprites], 'periodic_platform') # Scheduler adds it to obstacles while visible
+            self.platform_scheduler.add_periodic(tile)
+            sprites.append(tile)
+        elif cell == COIN_CHAR:
+            coin = self.sprite_pool.get(Coin, pos, [self.visible_sprites, self.coin_sprites], self.coin_animation)
+            self.all_coins_in_level.append(coin)
+            sprites.append(coin)
+        if sprites:
+            self.cell_sprites[(pos[0] // TILE_SIZE, pos[1] // TILE_SIZE)] = sprites
+        return sprites
+
+    def _static_tile(self, pos, groups, tile_type, chunk):
+        if chunk is None:
+            return self.sprite_pool.get(Tile, pos, [self.visible_sprites, *groups], tile_type)
+        tile = self.sprite_pool.get(Tile, pos, groups, tile_type)
+        chunk.bake(tile)
+        return tile
+
+    def _layout_sprites(self):
+        """Every sprite built from the current layout, including collected coins and used-up platforms."""
+        return dict.fromkeys(itertools.chain(
+            self.visible_sprites, self.active_sprites, self.obstacle_sprites, self.exit_sprites,
+            self.checkpoint_sprites, self.trap_sprites, self.coin_sprites,
+            self.all_coins_in_level, self.temp_platforms, self.platform_scheduler.periodic_platforms))
+
+    def release_sprites(self, sprites):
+        """Returns sprites built by create_cell_sprites to the pool (used when a chunk is evicted).
+
+        Returns the grid cells whose coin was collected or whose temporary platform was
+        used up, so the streamer doesn't bring them back before the next respawn.
+        """
+        consumed_cells = set()
+        for sprite in sprites:
+            if isinstance(sprite, Coin):
+                self.all_coins_in_level.remove(sprite)
+                if sprite.is_collected:
+                    consumed_cells.add((sprite.rect.centerx // TILE_SIZE, sprite.rect.centery // TILE_SIZE))
+            elif isinstance(sprite, Tile) and sprite.tile_type == 'temp_platform':
+                self.temp_platforms.remove(sprite)
+                if sprite.timer_active or not sprite.alive():
+                    consumed_cells.add((sprite.rect.x // TILE_SIZE, sprite.rect.y // TILE_SIZE))
+            elif isinstance(sprite, Tile) and sprite.tile_type == 'periodic_platform':
+                self.platform_scheduler.remove_periodic(sprite)
+            self.sprite_pool.release(sprite)
+        return consumed_cells
+
+    def apply_cell_changes(self, changes):
+        """Edits the layout in place, rebuilding only the sprites of the cells that changed.
+
+        changes maps (col, row) grid cells to their new layout character. Collision
+        groups, entity lists, baked chunk surfaces and the player start follow the edit,
+        while the player, the platform clock and every other sprite keep running, so a
+        single cell costs about as much as building that cell. Cells in chunks that aren't
+        loaded only change the layout. Returns the number of cells that changed.
+        """
+        width_tiles = self.level_width // TILE_SIZE
+        changed = 0
+        start_changed = False
+        for (col, row), cell in changes.items():
+            if not (0 <= row < len(self.layout) and 0 <= col < width_tiles):
+                print(f"Warning: Ignoring level edit outside the grid at {(col, row)}.")
+                continue
+            line = self.layout[row].ljust(col + 1)
+            if line[col] == cell:
+                continue
+            start_changed = start_changed or 'P' in (line[col], cell)
+            self.layout[row] = line[:col] + cell + line[col + 1:]
+            self._rebuild_cell(col, row, cell)
+            changed += 1
+        if start_changed:
+            self.initial_player_pos = self._find_player_start(self.layout)
+        return changed
+
+    def layout_changes(self, layout):
+        """Returns the {(col, row): char} edits that turn the current layout into layout, or None if the grid size differs."""
+        width_tiles = self.level_width // TILE_SIZE
+        if len(layout) != len(self.layout) or max(len(row) for row in layout) != width_tiles:
+            return None
+        changes = {}
+        for row_index, (old_row, new_row) in enumerate(zip(self.layout, layout)):
+            if old_row.rstrip() != new_row.rstrip():
+                old_row, new_row = old_row.ljust(width_tiles), new_row.ljust(width_tiles)
+                changes.update(((col_index, row_index), cell)
+                               for col_index, (old_cell, cell) in enumerate(zip(old_row, new_row)) if old_cell != cell)
+        return changes
+
+    def _rebuild_cell(self, col, row, cell):
+        """Replaces the sprites of one cell with those for its new character."""
+        pos = (col * TILE_SIZE, row * TILE_SIZE)
+        if pos == self.last_checkpoint_pos:
+            self.last_checkpoint_pos = None # The active checkpoint was painted over
+        chunk = None
+        if self.chunk_streamer:
+            self.chunk_streamer.consumed_cells.discard((col, row))
+            chunk = self.chunk_streamer.chunk_at(col, row)
+            if chunk is None:
+                return # Not built; the chunk reads the new layout when it loads
+
+        old_sprites = self.cell_sprites.pop((col, row), None)
+        if old_sprites:
+            self.release_sprites(old_sprites)
+        if chunk:
+            if old_sprites:
+                chunk.sprites = [sprite for sprite in chunk.sprites if sprite not in old_sprites]
+            chunk.clear_cell(pos)
+            if self.visible_sprites.render_target:
+                self.visible_sprites.render_target.invalidate(chunk.surface)
+        sprites = self.create_cell_sprites(cell, pos, chunk)
+        if chunk:
+            chunk.sprites.extend(sprites)
+
+    def update_streaming(self):
+        """Builds chunks near the camera and evicts far ones (no-op for non-streamed levels)."""
+        if self.chunk_streamer and self.player:
+            self.visible_sprites.update_camera(self.player)
+            self.chunk_streamer.stream(self.visible_sprites.get_view_rect())
 
     def trigger_level_complete(self):
         """Callback for when the player reaches the exit. Calls game's method."""
+        if self.game.current_state == GameState.EDITOR:
+            self.reset_player_to_respawn(GameState.EDITOR) # Playtesting in the editor stays on the level being edited
+            return
         self.game.level_manager.next_level()
 
     def trigger_player_death(self):
         """Callback for when the player hits a trap. Calls game's method."""
+        if self.game.current_state == GameState.EDITOR:
+            self.reset_player_to_respawn(GameState.EDITOR) # No death screen while editing
+            return
         self.game.current_state = GameState.DEATH_SCREEN
 
     def check_checkpoint_collisions(self):
@@ -115,8 +287,7 @@ class Level:
             if not checkpoint.is_active:
                 for cp in self.checkpoint_sprites:
                     if cp.is_active and cp != checkpoint:
-                         cp.is_active = False
-                         cp.image.fill(CHECKPOINT_YELLOW) 
+                         cp.deactivate()
 
                 checkpoint.activate() # Visually activate
                 self.last_checkpoint_pos = checkpoint.rect.topleft # Update last activated position
@@ -129,13 +300,17 @@ class Level:
             return (100, 100) 
         return respawn_pos
 
-    def reset_player_to_respawn(self):
-        """Reset the player's state and position to the last checkpoint or start."""
+    def reset_player_to_respawn(self, state=GameState.PLAYING):
+        """Reset the player's state and position to the last checkpoint or start, then enter state."""
         if self.player:
             respawn_pos = self.get_respawn_position()
             print("[DEBUG] Level.reset_player_to_respawn called.") # DEBUG
             self.player.reset_state(respawn_pos)
-            self.game.current_state = GameState.PLAYING
+            self.game.current_state = state
+
+            # Let the streamer rebuild collected coins and used-up platforms in evicted chunks
+            if self.chunk_streamer:
+                self.chunk_streamer.consumed_cells.clear()
 
             # Reset coins so they reappear
             for coin in self.all_coins_in_level:
@@ -148,6 +323,7 @@ class Level:
 
             # Reset temporary platforms
             print(f"[DEBUG] Resetting {len(self.temp_platforms)} temporary platforms.") # DEBUG
+            self.platform_scheduler.cancel_expiries()
             for i, platform in enumerate(self.temp_platforms):
                 print(f"[DEBUG] TempPlatform {i}: Initial alive state: {platform.alive()}") # DEBUG
                 platform.reset_timer()
@@ -173,29 +349,31 @@ class Level:
         self.last_checkpoint_pos = None 
         for checkpoint in self.checkpoint_sprites:
             if checkpoint.is_active:
-                checkpoint.is_active = False
-                checkpoint.image.fill(CHECKPOINT_YELLOW) 
+                checkpoint.deactivate()
 
-    def run(self, dt):
-        """Update and draw all sprites in the level, using delta time."""
-        if not self.player: return 
+    def update(self, dt):
+        """Advances the level by one simulation step without drawing anything."""
+        if not self.player: return
 
-        self.visible_sprites.custom_draw(self.player) # Draw based on previous frame's state, before updates
+        self.update_streaming() # Build/evict chunks around the camera before anything collides
 
-        self.visible_sprites.update(dt) # Update all sprites (player, tiles, entities)
+        # Advance periodic/temporary platforms first so collision membership matches
+        # what the player sees this frame; membership only changes on transition ticks.
+        self.platform_scheduler.update(dt)
+        self.coin_animation.update(dt)
 
-        # Update periodic platform collision status AFTER their state has been updated by visible_sprites.update()
-        # This ensures collision status matches visual status for the current frame.
-        for platform in self.periodic_platforms:
-            if platform.is_currently_visible:
-                if platform not in self.obstacle_sprites:
-                    self.obstacle_sprites.add(platform)
-            else: # It's invisible
-                if platform in self.obstacle_sprites:
-                    self.obstacle_sprites.remove(platform)
+        setup_count = self.setup_count
+        self.active_sprites.update(dt) # Tiles and coins have no per-frame logic, so only these need updating
+        if self.setup_count != setup_count:
+            return # The player reached an exit and the next layout was loaded into this Level
 
         self.check_checkpoint_collisions() # Checkpoint logic can run after player has moved
 
+    def draw(self):
+        """Draws the level in its current state, centred on the player."""
+        if not self.player: return
+        self.visible_sprites.custom_draw(self.player)
+
 
 class YSortCameraGroup(pygame.sprite.Group):
     def __init__(self, level_width, level_height):
@@ -209,18 +387,15 @@ class YSortCameraGroup(pygame.sprite.Group):
         self.level_width = level_width
         self.level_height = level_height
 
-        # default background color and surface
+        # default background color
         self.default_bg_color = (0, 0, 0)
-        self.default_bg_surf = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        self.default_bg_surf.fill(self.default_bg_color)
+        self.render_target = None # Created for the display surface on first draw (see RENDER_SCALE)
 
-    def custom_draw(self, player):
-        """Draw layers, centering the camera on the player."""
-        if not self.display_surface:
-            self.display_surface = pygame.display.get_surface()  # Try to get surface again
-        if not self.display_surface:
-            return  # Cannot draw
+        # Static chunk surfaces of a streamed level: {chunk_key: (surface, world_rect)}
+        self.chunk_layers = {}
 
+    def update_camera(self, player):
+        """Centers the camera offset on the player, clamped to the map."""
         # Calculate camera offset based on player center
         self.offset.x = player.rect.centerx - self.half_width
         self.offset.y = player.rect.centery - self.half_height
@@ -231,18 +406,37 @@ class YSortCameraGroup(pygame.sprite.Group):
         self.offset.x = max(0, min(self.offset.x, max_x_offset))
         self.offset.y = max(0, min(self.offset.y, max_y_offset))
 
+    def get_view_rect(self):
+        """Returns the world-space rect currently covered by the camera."""
+        return pygame.Rect(int(self.offset.x), int(self.offset.y), SCREEN_WIDTH, SCREEN_HEIGHT)
+
+    def custom_draw(self, player):
+        """Draw layers, centering the camera on the player."""
+        if not self.display_surface:
+            self.display_surface = pygame.display.get_surface()  # Try to get surface again
+        if not self.display_surface:
+            return  # Cannot draw
+
+        self.update_camera(player)
+        if self.render_target is None or self.render_target.display_surface is not self.display_surface:
+            self.render_target = RenderTarget(self.display_surface)
+        target = self.render_target
+
         # --- Draw Default Background ---
-        self.display_surface.blit(self.default_bg_surf, (0, 0))
+        target.fill(self.default_bg_color)
 
         # --- Draw Map Background ---
         map_rect = pygame.Rect(-self.offset.x, -self.offset.y, self.level_width, self.level_height)
-        pygame.draw.rect(
-            self.display_surface,
-            (173, 216, 230),  # Light blue color for the map background
-            map_rect
-        )
-
-        # Draw sprites sorted by Y (optional sort, depends on visuals)
-        for sprite in sorted(self.sprites(), key=lambda sprite: sprite.rect.centery):
-            offset_pos = sprite.rect.topleft - self.offset  # Calculate position relative to camera
-            self.display_surface.blit(sprite.image, offset_pos)  # Draw the sprite
+        target.fill((173, 216, 230), map_rect)  # Light blue color for the map background
+
+        # --- Draw Pre-rendered Static Chunks (streamed levels only) ---
+        if self.chunk_layers:
+            view_rect = self.get_view_rect()
+            for surface, chunk_rect in self.chunk_layers.values():
+                if chunk_rect.colliderect(view_rect):
+                    target.blit(surface, chunk_rect.topleft - self.offset)
+
+        # Draw sprites sorted by Y (optional sort, depends on visuals), relative to the camera
+        target.blit_sprites(sorted(self.sprites(), key=lambda sprite: sprite.rect.centery), self.offset)
+
+        target.present() # Scale a low-resolution frame up to the window
@@ -1,3 +1,7 @@
+import os
+from src.settings import LEVELS_DIR, ROOT_LEVEL_ID
+from src.levels.level_file import load_level_file
+
 class LevelData:
     """Represents the data and metadata for a game level."""
     def __init__(self,
@@ -5,296 +9,101 @@ class LevelData:
                  name="Unnamed Level",
                  background_music=None,
                  next_level=None,
-                 hidden_level=None):
-        self.layout = layout.split('\n')[1:]  # The 2D layout of the level
+                 hidden_level=None,
+                 level_id=None,
+                 source_path=None):
+        # The 2D layout of the level; inline strings start with a newline after the opening quotes
+        self.layout = layout.split('\n')[1:] if isinstance(layout, str) else list(layout)
         self.name = name  # Level name
         self.background_music = background_music  # Path to background music file
         self.next_level = next_level  # Next level to load after this one
         self.hidden_level = hidden_level  # Hidden level to load after this one
+        self.level_id = level_id  # File stem of the level in LEVELS_DIR, if loaded from disk
+        self.source_path = source_path  # Level file this data was loaded from, if any
 
-# Level 1 and Level 2 have been deleted
+class LevelLibrary:
+    """Loads every level file in a directory and links levels by their 'next'/'hidden' ids.
 
-# Define all levels first without next_level references, then set up progression later
-# LEVEL_3 -> LEVEL_4 -> LEVEL_5 -> LEVEL_6 -> LEVEL_3 (loop)
+    Nothing is read until a level is first asked for (or load_all() is called).
+    """
+    def __init__(self, directory=LEVELS_DIR):
+        self.directory = directory
+        self.levels = {} # level_id -> LevelData
+        self._links = {} # level_id -> (next_id, hidden_id)
+        self.loaded = False
+
+    def load_all(self):
+        """Loads (or reloads) every .txt level in the directory."""
+        for file_name in sorted(os.listdir(self.directory)):
+            if file_name.endswith('.txt'):
+                self._load(os.path.join(self.directory, file_name))
+        self._link()
+        self.loaded = True
+        return self
 
-LEVEL_3 = LevelData(
-    layout=
-"""
-X                                                                                          
-X
-X
-X
-X                        S                              
-X        T        o      X      T T T   S                      E
-X      XXXXXXXaaaaaaaaaaaX              S             X             XXXXXXXXXX
-X      X     X                          X             X             X
-X      X     X                          X                           X
-X      X     X                                                      X
-X      X     X                                                      XXXXXXXXXXX
-X      X     X
-X      X     X
-X      X     X
-X      X     X
-X P    X     XSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSS
-XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXTXTXTXTXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX
-""",
-    name="Level 3",
-    background_music=None
-)
+    def reload(self, path):
+        """Re-reads one level file, updating its LevelData in place, and returns it."""
+        if not self.loaded:
+            self.load_all() # Links need the other levels too; this already reads path
+            return self.levels.get(self.level_id_for_path(path))
+        level = self._load(path)
+        self._link()
+        return level
 
-LEVEL_4 = LevelData(
-    layout=                                                                  
-"""                                                           
-XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX
-                XXXXXXXXXXXXXXXXXXXXXXXXXXSSSSSSSSSSSSSSSXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX
-P               XXXXXSSSSSSSSSSSSSSSSXX                XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX
-XXXX            XXXXX                XX                    XX                          XXXXXXXXXXXX
-XXXX            XXXXX                XX                    XX                                 XXXXX
-XXXX            XXXXX                XX                    XX                                 XXXXX
-XXXX            XXXXX                XX                    XX                                 XXXXX
-XXXX               XX                                                                         
-XXXX               XX                                                                         
-XXXX                                 o                     o                                      E
-XXXX                                                                                          XXXXX
-XX                 o                                                                          XXXXX
-XX                                                         SS                                 XXXXX
-XX                           o       SS                    XX              o            XXXXXXXXXXX
-XX                 SS                XX          o         XX                           XXXXXXXXXXX
-XX                 XX                XX                    XX                                SXXXXX
-XX                 XX                XX                    XX                               SXXXXXX
-XX                 XX                XX                    XXS                             SXXXXXXX
-XX                 XX                XX                    XXXXS                      SXXXXXXXXXXXX
-XXXXXXXX           XX                XX                    XXXXS                     SXXXXXXXXXXXXX
-XXXXXXXXXSSSSSSSSSSXXSSSSSSSSSSSSSSSSXXSSSSSSSSSSSSSSSSSSSSXXXXXSSSSSSSSSSSSSSSSSSSSSXXXXXXXXXXXXXX
-XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX
-""",
-    name="Level 4",
-    background_music=None
-)
+    def get(self, level_id):
+        if not self.loaded:
+            self.load_all()
+        return self.levels.get(level_id)
 
-LEVEL_5 = LevelData(
-    layout=
-"""                                                           
-XS                                                             
-XS                                                             
-XS                                                             
-XS                                                               aaaaaaaaa                           
-XS                                                               SSSSSSSSS                           
-XS                                                               XXXXXXXXX                           
-XS                                                        o      XXXXXXXXX                  E            
-XS                                                                            XXXXXXXXXXXXXXXXXXXXXXX
-                                                    o         
-XS                                          M                                              
-XS                             o        XXXXXXXXX                                          
-XS                                      XXXXXXXXX                                          
-XS                        o                                                                                                  
-XS                                                             
-XS            aaaaaaaa                                               
-XS       o    SSSSSSSS                                               
-XS            XXXXXXXX                                               
-XS                                                                                                                                                                                       
-XS                                                             
-XS                                                             
-XS  TT                                                                                                                      
-XS  TT                                                o                                  
-XS                                                                                                                          
-XS                                                             
-XS                 SSSS        SSSS                                     S                  
-XS          TTTTTTT    aaaaaaaa    TTTTTTT                           TTTTTTTTT      
-XS                                                             
-XS                                                             
-XS                                                                                    o                      
-XS                                                                                                                          
-XS                                                             
-XS                                                                                              TT        
-XS                                                                                              TT        
-XS                                                                                                                          
-XS                                                             
-XS                                                                            TTTTTTTT                         
-XS                                                                            SSSSSSSS                         
-XS                                                                            XXXXXXXX                         
-XS                                                             
-XS                                                                   o
-XS                                                            o
-XS                                                                                                                                                                                                                                
-XS                                             aaaaaaaaa                             
-XS                                             SSSSSSSSS                             
-XS                                             XXXXXXXXX                             
-XS                                      o                     
-XS                                                                                
-XS                             o                                
-XS                                                             
-XS              TTTTTTTTTT                                           
-XS              SSSSSSSSSS                                           
-XS              XXXXXXXXXX                                           
-XS              XXXXXXXXXX                                                 
-XS                                                             
-XS                                                                                                                                                                                                                                                   
-XS      p                                                        
-XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX
-""",
-    name="Level 5",
-    background_music=None
-)
+    def level_id_for_path(self, path):
+        return os.path.splitext(os.path.basename(path))[0]
 
-# Create blank Level 6 template for user customization
-LEVEL_6 = LevelData(
-    layout=
-"""                                                           
-   SSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSXX                                                                                                                                               
-XXX                                    SXX                                                                                                                                              
-XXX                                     SXX                                                                                                                                             
-XXX                             O        SXX                                                                                                                      
-XXX                                       SXX                                                                                               
-XXX        O                               SXX                                                                                              
-XXX                                         SXXX                                                                                            
-XXX                    XX                    SXX                                                
-XXX                    XX                     SXXX                                                                                                                 
-XXX                    XX       O             SXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX
-XXX                    XX                       XXS                          XXXX         
-XXX                    XX                       XXS                             XXXXXXXXXXXX
-XXX                    XX                       XXS                 O                      XXXXXXXXXXXX
-XXX                    XX                       XXS                                        XXXXXXXXXXXX
-XXX                    XX                O      XXS                            O           XXXXXXXXXXXX
-XXX                    XX                       XXS               SSS                      XXXXXXXXXXXX
-XXX                    XX                       XXS              SXXXS                     XXXXXXXXXXXX                                                                                                       
-XXX                    XX                                        SXXXS                     XXXXXXXXXXXX                                                                                                                     
-XXX                    XX                                        SXXXS                     XXXXXXXXXXXX                                                                                                          
-XXX                    XX                                        SXXXS                                XXXXXXXXXXXX                                                                                                
-XXX                    XX       O                         O      SXXXS                                          XXXXXXXXXXXX                                                                                  
-XXX                    XX                                        SXXXS                                                     XXXXXXXXXXXXXXXXXXXXXXX                                                            
-XXX                    XX                                        SXXXS                       O                                        XXXXXXXXXXXX                                                            
-XXX                      SSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSSXXXS                                                                XXXXXXXXXXXX                                                            
-XXX                                                             SSXXXSS                                                               XXXXXXXXXXXX                                                            
-XXX                                                                SSSSSS                                  O                        XXXXXXXXXXXX                                                            
-XXXS                   XX                                             SSSSSSSSS                                                     XXXXXXXXXXXX                                                            
-XXXS                   XX                                                     SSSSSSS                                               XXXXXXXXXXXX                                                            
-XXXS                   XX                                                            SSSSSS                                         XXXXXXXXXXXX                                                           
-XXX                   SXX                                                                  SSSS                                     XXXXXXXXXXXX                                                                                                                                                      
-XXX                   SXX                                                                     SSSS                                  XXXXXXXXXXXX                                                                                                                                                        
-XXX                   SXX                                                                        SS                XXS              XXXXXXXXXXXX                                                                                                                                                      
-XXX                   SXX                                                                          SS              XXS              XXXXXXXXXXXX                                                                                                                                                        
-XXX                    XX                                                                          SS              XXS              XXXXXXXXXXXX                                                                                                                                                        
-XXX                    XX                                                                          SS              XXS              XXXXXXXXXXXX                                                                                                                                                        
-XXX                    XX                                                                          SS              XX              SXXXXXXXXXXXX                                                                                                                                                        
-XXX                    XX                                                                          SS              XX              SXXXXXXXXXXXX                                                                                                                                                        
-XXXS                   XX                                                                          SS              XX              SXXXXXXXXXXXX                                                                                                                                                        
-XXXS                   XX                                                                          SS              XX              SXXXXXXXXXXXX                                                                                                                                                        
-XXXS                   XX                                                                          SS              XXS              XXXXXXXXXXXX
-XXXS                   XX                                                                           SS             XXS              XXXXXXXXXXXX
-XXX                    XX                                                                            SS                             XXXXXXXXXXXX
-XXX                   SXX                                                                            SS                             XXXXXXXXXXXX
-XXX                   SXX                                                                            SS                             XXXXXXXXXXXX
-XXX                   SXX                                                                            SS                             XXXXXXXXXXXX
-XXX                   SXX                                                                             SS                                   XXXXX
-XXX                   SXX                                                                             SSSS                                    XX       
-XXX                    XX                                                                                SSS                                  XX                                                                                                                                                                            
-XXX                    XX                                                                                  SSSSS                              XX                                                                          
-XXX                    XX                                                                                       SSSSSS                        XX                                                                          
-XXX                    XX                                                                                             SSSS                    XX                                                                          
-XXX                    XX                                                                                                 SS                  XX                                                                          
-XXXS                   XX                                                                                                   SS                XX                                                                          
-XXXS                   XX                                                                                                     SS              XX                                                                          
-XXXS                   XX                                                                                                       SS            XX                                                                          
-XXXS                   XX                                                                                                       SS            XX                                                                          
-XXX                    XX                                                                                                       SS            XX                                                                          
-XXX                   SXX                                                                                                       SS              XX                                                                       
-XXX                   SXX                                                                                                       SS                XX                                                                      
-XXX                   SXX                                                                                                       SS                XX                                                                      
-XXX                   SXX                                                                                                       SS                XXXXXXX                                                                    
-XXX                   SXX                                                                                                       SS                       XX                                                               
-XXX                    XX                                                                                                        SS                        XX                                                                                                                                                       
-XXX                    XX                                                                                                          SS                        XX                                                    
-XXX                    XX                                                                                                            SS                        XX                                                  
-XXX                    XX                                                                                                             SS                         XX                                                
-XXX                    XX                                                                                                              SSSS                      XXX                                                 
-XXX                    XX                                                                                                                  SSS                   XXXXX              XX                                 
-XXXS                   XX                                                                                                                    SSS                     XX          XX                                  
-XXXS                   XX                                                                                                                       SS                     XX      XX                                    
-XXXS                   XX                                                                                                                         SS                     XX  XX                                      
-XXXS                   XX                                                 					                                                 SS                      XX                                      
-XXXS                   XX                                                                                                                       SSS                                                                                          
-XXXS                   XX                                                                                                                    SSS                                                                                          
-XXXS                   XX                                                                                                                 SSS                                                                                          
-XXX        e           SXX                                                                                                                S                                                                                          
-XXXXXXXXXXXXXXXXXXXXXXXXX                                                                                                                      S               P                                                                           
-                                                                                                                                        XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-                                                                                
-P                                                                             E
-XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX
-""",
-    name="Level 6 - Custom",
-    background_music=None
-)
+    def _load(self, path):
+        level_id = self.level_id_for_path(path)
+        metadata, rows = load_level_file(path)
+        level = self.levels.get(level_id)
+        if level is None:
+            level = LevelData(rows, level_id=level_id, source_path=path)
+            self.levels[level_id] = level
+        else:
+            level.layout = rows # Keep the same object so existing references see the change
+        level.name = metadata.get('name') or level_id
+        level.background_music = metadata.get('music')
+        self._links[level_id] = (metadata.get('next'), metadata.get('hidden'))
+        return level
 
-# Set up level progression chain (now that all levels are defined)
-LEVEL_3.next_level = LEVEL_4  # Level 3 leads to Level 4
-LEVEL_4.next_level = LEVEL_5  # Level 4 leads to Level 5
-LEVEL_5.next_level = LEVEL_6  # Level 5 leads to Level 6
-LEVEL_6.next_level = LEVEL_3  # Level 6 loops back to Level 3
+    def _link(self):
+        for level_id, (next_id, hidden_id) in self._links.items():
+            level = self.levels[level_id]
+            level.next_level = self._resolve(level_id, next_id)
+            level.hidden_level = self._resolve(level_id, hidden_id)
+
+    def _resolve(self, level_id, target_id):
+        if not target_id:
+            return None
+        if target_id not in self.levels:
+            print(f"Warning: Level '{level_id}' links to unknown level '{target_id}'.")
+        return self.levels.get(target_id)
+
+# Levels live in LEVELS_DIR as text files (see src/levels/level_file.py for the format);
+# progression is declared by each file's 'next'/'hidden' header.
+# Level 1 and Level 2 have been deleted
+# LEVEL_3 -> LEVEL_4 -> LEVEL_5 -> LEVEL_6 -> LEVEL_3 (loop)
+LEVEL_LIBRARY = LevelLibrary() # Files are read on first access, not at import
 
-# Set Level 3 as the starting level
-ROOT_LEVEL = LEVEL_3
+# Module constants resolved on first access (PEP 562), so importing this module reads no files.
+# ROOT_LEVEL is the configured starting level; LEVELS exports all levels for other modules.
+_LEVEL_CONSTANTS = {
+    'LEVEL_3': 'level_3',
+    'LEVEL_4': 'level_4',
+    'LEVEL_5': 'level_5',
+    'LEVEL_6': 'level_6',
+    'ROOT_LEVEL': ROOT_LEVEL_ID,
+}
 
-# Export all levels for access by other modules
-LEVELS = [LEVEL_3, LEVEL_4, LEVEL_5, LEVEL_6]
\ No newline at end of file
+def __getattr__(name):
+    if name in _LEVEL_CONSTANTS:
+        return LEVEL_LIBRARY.get(_LEVEL_CONSTANTS[name])
+    if name == 'LEVELS':
+        return [LEVEL_LIBRARY.get(level_id) for level_id in ('level_3', 'level_4', 'level_5', 'level_6')]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,128 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+from src.settings import LEVEL_CACHE_DIR
+
+# Level files are plain text for authoring:
+#
+#   name: Level 3
+#   next: level_4
+#   hidden:
+#   music:
+#   ---
+#   X      XXXX
+#   X P       E
+#   XXXXXXXXXXX
+#
+# Header lines are "key: value" pairs up to the "---" separator; every line after it
+# is a row of the layout. Compiled copies live in LEVEL_CACHE_DIR, named after the
+# SHA-256 of the text, as a fixed header, JSON metadata and a width*height byte grid
+# padded with spaces. Loading a compiled copy maps the file instead of parsing text.
+
+HEADER_SEPARATOR = '---'
+CACHE_MAGIC = b'LVLC'
+CACHE_VERSION = 1
+CACHE_HEADER = struct.Struct('<4sBxHHI') # magic, version, width, height, metadata length
+METADATA_KEYS = ('name', 'next', 'hidden', 'music')
+
+class LevelFileError(ValueError):
+    """Raised when a level file can't be parsed."""
+
+def parse_level_text(text):
+    """Parses level file text into (metadata dict, list of row strings)."""
+    lines = text.splitlines()
+    try:
+        separator_index = lines.index(HEADER_SEPARATOR)
+    except ValueError:
+        raise LevelFileError(f"Level file is missing the '{HEADER_SEPARATOR}' header separator")
+
+    metadata = {key: None for key in METADATA_KEYS}
+    for line in lines[:separator_index]:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        key, colon, value = line.partition(':')
+        if not colon:
+            raise LevelFileError(f"Malformed level header line: '{line}'")
+        metadata[key.strip().lower()] = value.strip() or None
+
+    rows = [row.rstrip() for row in lines[separator_index + 1:]]
+    while rows and not rows[-1]: # Ignore trailing blank lines
+        rows.pop()
+    if not rows:
+        raise LevelFileError("Level file has an empty layout")
+    return metadata, rows
+
+def format_level_text(metadata, rows):
+    """Formats metadata and layout rows as level file text (the inverse of parse_level_text)."""
+    keys = list(METADATA_KEYS) + [key for key in metadata if key not in METADATA_KEYS]
+    header = [f"{key}: {metadata[key]}" if metadata.get(key) else f"{key}:" for key in keys]
+    return '\n'.join(header + [HEADER_SEPARATOR] + [row.rstrip() for row in rows]) + '\n'
+
+def save_level_file(path, metadata, rows, cache_dir=LEVEL_CACHE_DIR):
+    """Writes a level file atomically and compiles its cache entry, so reloading it needn't parse text."""
+    text_bytes = format_level_text(metadata, rows).encode('utf-8')
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(text_bytes)
+    os.replace(temp_path, path) # Atomic, so the level watcher never reads a half-written file
+    try:
+        compile_level(metadata, rows, cache_path_for(text_bytes, cache_dir))
+    except OSError as e:
+        print(f"Warning: Could not write level cache for '{path}': {e}")
+
+def cache_path_for(text_bytes, cache_dir=LEVEL_CACHE_DIR):
+    """Returns the compiled cache path for the given level file contents."""
+    return os.path.join(cache_dir, hashlib.sha256(text_bytes).hexdigest() + '.lvlc')
+
+def compile_level(metadata, rows, cache_path):
+    """Writes the compiled binary form of a parsed level to cache_path."""
+    width = max(len(row) for row in rows)
+    grid = b''.join(row.ljust(width).encode('ascii') for row in rows)
+    metadata_bytes = json.dumps(metadata).encode('utf-8')
+
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    temp_path = cache_path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(CACHE_HEADER.pack(CACHE_MAGIC, CACHE_VERSION, width, len(rows), len(metadata_bytes)))
+        f.write(metadata_bytes)
+        f.write(grid)
+    os.replace(temp_path, cache_path) # Atomic, so a watcher never sees a half-written cache
+
+def read_compiled_level(cache_path):
+    """Maps a compiled level and returns (metadata dict, list of row strings)."""
+    with open(cache_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        magic, version, width, height, metadata_length = CACHE_HEADER.unpack_from(mapped, 0)
+        if magic != CACHE_MAGIC or version != CACHE_VERSION:
+            raise LevelFileError(f"'{cache_path}' is not a compatible compiled level")
+        offset = CACHE_HEADER.size
+        metadata = json.loads(mapped[offset:offset + metadata_length])
+        offset += metadata_length
+        rows = [mapped[offset + row * width:offset + (row + 1) * width].decode('ascii') for row in range(height)]
+    return metadata, rows
+
+def load_level_file(path, cache_dir=LEVEL_CACHE_DIR):
+    """Loads a level file, going through (and filling) the compiled cache.
+
+    Returns (metadata dict, list of row strings). Rows from the cache are padded
+    to a common width.
+    """
+    with open(path, 'rb') as f:
+        text_bytes = f.read()
+
+    cache_path = cache_path_for(text_bytes, cache_dir)
+    if os.path.exists(cache_path):
+        try:
+            return read_compiled_level(cache_path)
+        except (OSError, ValueError, struct.error) as e:
+            print(f"Warning: Ignoring unreadable level cache '{cache_path}': {e}")
+
+    metadata, rows = parse_level_text(text_bytes.decode('utf-8'))
+    try:
+        compile_level(metadata, rows, cache_path)
+        return read_compiled_level(cache_path)
+    except OSError as e:
+        print(f"Warning: Could not write level cache '{cache_path}': {e}")
+        return metadata, rows
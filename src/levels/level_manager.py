@@ -1,15 +1,36 @@
+import gc
 import os
+from contextlib import contextmanager
 from src.levels.level import Level
-from src.levels.level_data import ROOT_LEVEL
+from src.levels.level_data import LEVEL_LIBRARY
+from src.levels.level_file import LevelFileError
 from src.settings import *
 
+@contextmanager
+def level_transition_gc(enabled=LEVEL_TRANSITION_GC_FREEZE):
+    """Keeps the cyclic GC out of a level transition, then collects once and freezes what's left."""
+    if not enabled:
+        yield
+        return
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        gc.unfreeze() # Objects frozen after the previous load may be garbage by now
+        gc.collect()
+        gc.freeze()
+        if was_enabled:
+            gc.enable()
+
 class LevelManager:
     """Manages the loading and switching of levels."""
     def __init__(self, game_instance):
         self.screen = game_instance.screen
         self.game = game_instance
-        self.current_level_data = ROOT_LEVEL
+        self.current_level_data = None # Set by load_level; level files are read on game entry
         self.level = None
+        self.retired_level = None # Level left by unload_level, rebuilt in place by the next load_level
         self.next = None
         self.hidden = None
 
@@ -19,14 +40,27 @@ class LevelManager:
         self.next = level_data.next_level
         self.hidden = level_data.hidden_level
 
-        # Create a Level instance
-        self.level = Level(level_layout, self.screen, self.game)
+        with level_transition_gc():
+            level = self.level or self.retired_level
+            self.retired_level = None
+            if level:
+                level.setup_level(level_layout) # Reuses the Level, its Player and its pooled sprites
+            else:
+                level = Level(level_layout, self.screen, self.game)
+            self.level = level
         self.current_level_data = level_data
         self.game.current_state = GameState.PLAYING  # Set game state to playing
         print(f"Level {level_data.name} loaded successfully.")
         return self.level
 
 
+    def unload_level(self):
+        """Leaves the current level (e.g. back to the menu), keeping its Level object for the next load."""
+        if self.level:
+            self.level.reset_checkpoints()
+            self.retired_level = self.level
+            self.level = None
+
     def next_level(self):
         """Advance to the next level."""
         if not self.next:
@@ -42,6 +76,30 @@ class LevelManager:
         """Reload the current level."""
         return self.load_level(self.current_level_data)
 
+    def apply_level_file_changes(self, paths):
+        """Reloads changed level files and rebuilds the current level in place if it changed."""
+        for path in paths:
+            try:
+                level_data = LEVEL_LIBRARY.reload(path)
+            except (OSError, LevelFileError) as e:
+                print(f"Warning: Could not reload level file '{path}': {e}")
+                continue
+            print(f"Level file reloaded: {path}")
+
+            if level_data is self.current_level_data:
+                self.next = level_data.next_level
+                self.hidden = level_data.hidden_level
+            if self.level and level_data is self.current_level_data:
+                changes = self.level.layout_changes(level_data.layout)
+                if changes is not None:
+                    self.level.apply_cell_changes(changes) # Same grid size: only the edited cells are rebuilt
+                    continue
+                # Rebuild in place, keeping the player where they were so designers can iterate
+                player_pos = self.level.player.rect.topleft if self.level.player else None
+                self.level.setup_level(level_data.layout)
+                if player_pos and self.level.player:
+                    self.level.player.rect.topleft = player_pos
+
     def game_entry(self):
         """Entry point for the game."""
-        self.load_level(ROOT_LEVEL)
\ No newline at end of file
+        self.load_level(LEVEL_LIBRARY.get(ROOT_LEVEL_ID))
\ No newline at end of file
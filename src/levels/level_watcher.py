@@ -0,0 +1,65 @@
+import os
+import queue
+import threading
+from src.settings import LEVELS_DIR, LEVEL_WATCH_INTERVAL_S
+
+class LevelFileWatcher:
+    """Polls the level directory in a background thread and reports changed level files.
+
+    The thread only compares file stamps; the actual reload happens on the main thread
+    when the game drains poll_changes(), since sprites must not be touched off-thread.
+    """
+    def __init__(self, directory=LEVELS_DIR, interval_s=LEVEL_WATCH_INTERVAL_S):
+        self.directory = directory
+        self.interval_s = interval_s
+        self.changed_paths = queue.Queue()
+        self._stop_event = threading.Event()
+        self.thread = None
+
+    def _snapshot(self):
+        """Returns {path: (mtime_ns, size)} for every level file in the directory."""
+        stamps = {}
+        try:
+            for entry in os.scandir(self.directory):
+                if entry.is_file() and entry.name.endswith('.txt'):
+                    stat = entry.stat()
+                    stamps[entry.path] = (stat.st_mtime_ns, stat.st_size)
+        except OSError as e:
+            print(f"LevelFileWatcher: Could not scan '{self.directory}': {e}")
+        return stamps
+
+    def _run(self):
+        previous = self._snapshot()
+        while not self._stop_event.wait(self.interval_s):
+            current = self._snapshot()
+            for path, stamp in current.items():
+                if previous.get(path) != stamp:
+                    self.changed_paths.put(path)
+            previous = current
+
+    def start(self):
+        """Starts watching in a daemon thread."""
+        if self.thread and self.thread.is_alive():
+            return
+        self._stop_event.clear()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        print(f"LevelFileWatcher: Watching '{self.directory}' for level changes.")
+
+    def stop(self):
+        """Stops the watcher thread."""
+        self._stop_event.set()
+        if self.thread and self.thread.is_alive():
+            self.thread.join(timeout=1.0)
+        self.thread = None
+
+    def poll_changes(self):
+        """Returns the (deduplicated) level file paths changed since the last call."""
+        paths = []
+        while True:
+            try:
+                path = self.changed_paths.get_nowait()
+            except queue.Empty:
+                return paths
+            if path not in paths:
+                paths.append(path)
@@ -0,0 +1,86 @@
+import heapq
+from src.settings import PERIODIC_PLATFORM_VISIBLE_S, PERIODIC_PLATFORM_INVISIBLE_S, TEMP_PLATFORM_DURATION_S
+
+class PlatformScheduler:
+    """Drives periodic and temporary platforms from a single level clock.
+
+    All periodic platforms share one global phase, so their visibility is a pure
+    function of the clock and collision membership only changes on the ticks where
+    that phase flips. Temporary platform expiries are kept in a heap ordered by the
+    clock time at which they run out, so nothing is polled per platform per frame.
+    """
+    def __init__(self, obstacle_sprites):
+        self.obstacle_sprites = obstacle_sprites
+        self.visible_s = PERIODIC_PLATFORM_VISIBLE_S
+        self.period_s = PERIODIC_PLATFORM_VISIBLE_S + PERIODIC_PLATFORM_INVISIBLE_S
+        self.periodic_platforms = []
+        self.clear()
+
+    def clear(self):
+        """Forget all platforms and restart the clock (used when a level is (re)built)."""
+        self.clock_s = 0.0
+        self.periodic_platforms.clear()
+        self.periodic_visible = True
+        self.next_periodic_flip_s = self.visible_s
+        self._expiries = [] # Heap of (expire_at_s, sequence, tile); sequence is also the tile's expiry_token
+        self._sequence = 0
+
+    def is_periodic_visible_at(self, time_s):
+        """Returns whether periodic platforms are visible at the given clock time."""
+        return time_s % self.period_s < self.visible_s
+
+    def add_periodic(self, tile):
+        """Registers a periodic platform and syncs it to the current global phase."""
+        self.periodic_platforms.append(tile)
+        tile.set_visible(self.periodic_visible)
+        if self.periodic_visible:
+            self.obstacle_sprites.add(tile)
+
+    def remove_periodic(self, tile):
+        """Unregisters a periodic platform (e.g. when its tile is destroyed)."""
+        if tile in self.periodic_platforms:
+            self.periodic_platforms.remove(tile)
+
+    def add_temp(self, tile):
+        """Registers a temporary platform so its timer expires through this scheduler."""
+        tile.scheduler = self
+
+    def schedule_expiry(self, tile, duration_s=TEMP_PLATFORM_DURATION_S):
+        """Queues a temporary platform to disappear duration_s from now."""
+        heapq.heappush(self._expiries, (self.clock_s + duration_s, self._sequence, tile))
+        tile.expiry_token = self._sequence # Only this entry may expire the tile, not ones left from an earlier use
+        self._sequence += 1
+
+    def cancel_expiries(self):
+        """Drops all pending temporary platform expiries (used on respawn)."""
+        self._expiries.clear()
+
+    def update(self, dt):
+        """Advance the shared clock and apply any transitions that fall due."""
+        self.clock_s += dt
+
+        if self.clock_s >= self.next_periodic_flip_s:
+            self._apply_periodic_phase()
+
+        while self._expiries and self._expiries[0][0] <= self.clock_s:
+            _, sequence, tile = heapq.heappop(self._expiries)
+            # Skip entries for platforms reset since they were queued, or pooled and reused elsewhere
+            if tile.timer_active and tile.expiry_token == sequence:
+                tile.kill()
+
+    def _apply_periodic_phase(self):
+        """Recomputes the global periodic phase and flips platforms if it changed."""
+        phase_s = self.clock_s % self.period_s
+        cycle_start_s = self.clock_s - phase_s
+        visible = phase_s < self.visible_s
+        self.next_periodic_flip_s = cycle_start_s + (self.visible_s if visible else self.period_s)
+
+        if visible == self.periodic_visible:
+            return
+        self.periodic_visible = visible
+        for tile in self.periodic_platforms:
+            tile.set_visible(visible)
+        if visible:
+            self.obstacle_sprites.add(*self.periodic_platforms)
+        else:
+            self.obstacle_sprites.remove(*self.periodic_platforms)
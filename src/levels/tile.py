@@ -1,6 +1,6 @@
 import pygame
 import os
-from src.settings import TILE_SIZE, EARTH_BROWN, SILVER, GREEN, CHECKPOINT_YELLOW, CHECKPOINT_ACTIVE_BLUE, TEMP_PLATFORM_COLOR, TEMP_PLATFORM_FADING_COLOR, TEMP_PLATFORM_DURATION_S, PERIODIC_PLATFORM_VISIBLE_S, PERIODIC_PLATFORM_INVISIBLE_S, PERIODIC_PLATFORM_COLOR # Keep GREEN for fallback
+from src.settings import TILE_SIZE, EARTH_BROWN, SILVER, GREEN, CHECKPOINT_YELLOW, CHECKPOINT_ACTIVE_BLUE, TEMP_PLATFORM_COLOR, TEMP_PLATFORM_FADING_COLOR, PERIODIC_PLATFORM_COLOR # Keep GREEN for fallback
 
 # Construct the path relative to the tile.py file
 # Go up one level from src (..) to the project root, then down into assets/images
@@ -8,93 +8,111 @@ BASE_DIR = os.path.dirname(os.path.dirname(__file__)) # Gets the Group_AIGame di
 DOOR_IMAGE_PATH = os.path.join(BASE_DIR, '..', 'assets', 'images', '—Pngtree—vector painted open door_2570210.png')
 
 class Tile(pygame.sprite.Sprite):
-    """Represents a static tile in the game world (platform, trap, exit, checkpoint)."""
+    """Represents a static tile in the game world (platform, trap, exit, checkpoint).
+
+    Tile images are shared between tiles and never drawn on: a tile that changes look
+    (checkpoint, temporary or periodic platform) switches to another shared image. That
+    keeps per-image caches such as RenderTarget's downscaled copies valid.
+    """
+    _door_image = None # Scaled exit door, loaded once and shared by every exit tile
+    _shared_images = {} # (colour, flags) or 'trap' -> image shared by every tile showing it
+
+    @classmethod
+    def _filled_image(cls, color, flags=0):
+        """Returns the shared TILE_SIZE square filled with color."""
+        image = cls._shared_images.get((color, flags))
+        if image is None:
+            image = cls._shared_images[(color, flags)] = pygame.Surface((TILE_SIZE, TILE_SIZE), flags)
+            image.fill(color)
+        return image
+
+    @classmethod
+    def _trap_image(cls):
+        image = cls._shared_images.get('trap')
+        if image is None:
+            image = cls._shared_images['trap'] = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA) # Use SRCALPHA for transparency
+            image.fill((0,0,0,0)) # Transparent background
+            pygame.draw.polygon(image, SILVER, [(0, TILE_SIZE), (TILE_SIZE // 2, 0), (TILE_SIZE, TILE_SIZE)])
+        return image
+
     def __init__(self, pos, groups, tile_type='platform'):
-        super().__init__(groups)
+        super().__init__() # Groups are joined once the rect exists (spatial groups index by rect)
+        self.reinit(pos, groups, tile_type)
+
+    def reinit(self, pos, groups, tile_type='platform'):
+        """(Re)initializes the tile in place; used by __init__ and when the level's SpritePool reuses it."""
         self.tile_type = tile_type
         self.is_active = False # Relevant for checkpoints
 
         # Temporary platform specific attributes
         self.timer_active = False
-        self.time_left_s = TEMP_PLATFORM_DURATION_S
+        self.scheduler = None # PlatformScheduler that expires this platform once touched
+        self.expiry_token = None # Identifies the scheduler's current expiry entry for this platform
 
         # Determine image based on type
         match self.tile_type:
             case 'platform':
-                self.image = pygame.Surface((TILE_SIZE, TILE_SIZE))
-                self.image.fill(EARTH_BROWN)
+                self.image = self._filled_image(EARTH_BROWN)
             case 'trap':
-                self.image = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA) # Use SRCALPHA for transparency
-                self.image.fill((0,0,0,0)) # Transparent background
-                pygame.draw.polygon(self.image, SILVER, [(0, TILE_SIZE), (TILE_SIZE // 2, 0), (TILE_SIZE, TILE_SIZE)])
+                self.image = self._trap_image()
             case 'exit':
                 # Load the image HERE, inside init, after pygame.display is initialized
                 try:
-                    raw_door_image = pygame.image.load(DOOR_IMAGE_PATH).convert_alpha()
-                    self.image = pygame.transform.scale(raw_door_image, (TILE_SIZE, TILE_SIZE))
+                    if Tile._door_image is None:
+                        raw_door_image = pygame.image.load(DOOR_IMAGE_PATH).convert_alpha()
+                        Tile._door_image = pygame.transform.scale(raw_door_image, (TILE_SIZE, TILE_SIZE))
+                    self.image = Tile._door_image # Never drawn on, so it's safe to share
                     # Optional: print success only once or remove if too noisy
                     # print(f"Loaded door image for tile at {pos}")
                 except pygame.error as e:
                     print(f"Warning: Failed to load door image from {DOOR_IMAGE_PATH}. Error: {e}")
                     print(f"Falling back to green square for exit tile at {pos}.")
                     # Fallback to green square if image loading failed
-                    self.image = pygame.Surface((TILE_SIZE, TILE_SIZE))
-                    self.image.fill(GREEN)
+                    self.image = self._filled_image(GREEN)
             case 'checkpoint': # Handle checkpoint type
-                self.image = pygame.Surface((TILE_SIZE, TILE_SIZE))
                 # Draw a simple flag or just color for now
-                self.image.fill(CHECKPOINT_YELLOW) # Start yellow (inactive)
-                # Could add more detail like a small rectangle post
-                # pygame.draw.rect(self.image, BLACK, (TILE_SIZE // 2 - 2, TILE_SIZE // 2, 4, TILE_SIZE // 2)) # Example post
+                self.image = self._filled_image(CHECKPOINT_YELLOW) # Start yellow (inactive)
             case 'temp_platform':
-                self.image = pygame.Surface((TILE_SIZE, TILE_SIZE))
-                self.image.fill(TEMP_PLATFORM_COLOR)
+                self.image = self._filled_image(TEMP_PLATFORM_COLOR)
             case 'periodic_platform':
-                self.image = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA) # Support alpha for transparency
-                self.image.fill(PERIODIC_PLATFORM_COLOR)
-                self.is_currently_visible = True # Start visible
-                self.cycle_timer_s = PERIODIC_PLATFORM_VISIBLE_S
+                self.image = self._filled_image(PERIODIC_PLATFORM_COLOR, pygame.SRCALPHA) # Support alpha for transparency
+                self.is_currently_visible = True # Start visible; PlatformScheduler drives the phase
             case _: # Default or unknown type
-                self.image = pygame.Surface((TILE_SIZE, TILE_SIZE))
-                self.image.fill(EARTH_BROWN) # Default to Earth Brown
+                self.image = self._filled_image(EARTH_BROWN) # Default to Earth Brown
 
         self.rect = self.image.get_rect(topleft=pos)
+        self.add(groups)
 
     def activate(self):
         """Activate the checkpoint (visually)."""
         if self.tile_type == 'checkpoint' and not self.is_active:
             self.is_active = True
-            self.is_active = True
-            self.image.fill(CHECKPOINT_ACTIVE_BLUE) # Change to blue when active
-            # Add any other visual change if needed
+            self.image = self._filled_image(CHECKPOINT_ACTIVE_BLUE) # Change to blue when active
+
+    def deactivate(self):
+        """Return the checkpoint to its inactive look."""
+        if self.tile_type == 'checkpoint':
+            self.is_active = False
+            self.image = self._filled_image(CHECKPOINT_YELLOW)
 
     def activate_timer(self):
         """Activates the timer for a temporary platform."""
         if self.tile_type == 'temp_platform' and not self.timer_active:
             self.timer_active = True
-            self.image.fill(TEMP_PLATFORM_FADING_COLOR) # Change color to indicate it's active
+            self.image = self._filled_image(TEMP_PLATFORM_FADING_COLOR) # Change color to indicate it's active
+            if self.scheduler:
+                self.scheduler.schedule_expiry(self)
 
-    def update(self, dt):
-        """Update tile state, e.g., for temporary platforms."""
-        if self.tile_type == 'temp_platform' and self.timer_active:
-            self.time_left_s -= dt
-            if self.time_left_s <= 0:
-                self.kill() # Remove the tile from all groups
-        elif self.tile_type == 'periodic_platform':
-            self.cycle_timer_s -= dt
-            if self.cycle_timer_s <= 0:
-                self.is_currently_visible = not self.is_currently_visible
-                if self.is_currently_visible:
-                    self.cycle_timer_s = PERIODIC_PLATFORM_VISIBLE_S
-                    self.image.set_alpha(255) # Opaque
-                else:
-                    self.cycle_timer_s = PERIODIC_PLATFORM_INVISIBLE_S
-                    self.image.set_alpha(0) # Transparent
+    def set_visible(self, visible):
+        """Shows or hides a periodic platform (collision membership is handled by the scheduler)."""
+        if self.tile_type == 'periodic_platform':
+            self.is_currently_visible = visible
+            self.image = self._filled_image(PERIODIC_PLATFORM_COLOR if visible else (0, 0, 0, 0), pygame.SRCALPHA)
 
     def reset_timer(self):
         """Resets a temporary platform to its initial state."""
         if self.tile_type == 'temp_platform':
             self.timer_active = False
-            self.time_left_s = TEMP_PLATFORM_DURATION_S
-            self.image.fill(TEMP_PLATFORM_COLOR)
+            self.expiry_token = None
+            self.image = self._filled_image(TEMP_PLATFORM_COLOR)
             # The Level class will handle re-adding to sprite groups if it was killed.
@@ -1,8 +1,56 @@
 from src.settings import *
 
+class PhysicsParams:
+    """Movement constants for one MovementState; the defaults are the settings.py values.
+
+    Pass overrides by name, e.g. PhysicsParams(gravity=0.5, dash_speed=24), to tune one
+    character (or one headless simulation) without touching the module globals. Instances
+    are plain picklable objects, so tools can ship them to worker processes.
+    """
+    gravity = PLAYER_GRAVITY
+    jump_strength = PLAYER_JUMP_STRENGTH # Negative: up
+    double_jump_rate = PLAYER_DOUBLE_JUMP_STRENGTH_RATE
+    super_jump_rate = PLAYER_SUPER_JUMP_STRENGTH_RATE # Horizontal boost of a jump out of a dash's prepare frames
+    max_fall_speed = None # None: as fast as a jump starts (-jump_strength), so tuning the jump tunes the fall too
+    run_speed = PLAYER_SPEED
+    acceleration_frames = ACELERATION_FRAME
+    deceleration_frames = DECELERATION_FRAME
+    jump_tolerance_frames = JUMP_TOLERANCE_FRAME # Coyote time after walking off a ledge
+    climbing_jump_frames = CLIMBING_JUMP_FRAME
+    climb_speed = 1.5 # Slide-down speed while clinging to a wall
+    dash_speed = PLAYER_DASH_SPEED
+    dash_duration = PLAYER_DASH_DURATION
+    dash_prepare_frames = PLAYER_DASH_PREPARE_FRAMES
+
+    NAMES = ('gravity', 'jump_strength', 'double_jump_rate', 'super_jump_rate', 'max_fall_speed', 'run_speed',
+             'acceleration_frames', 'deceleration_frames', 'jump_tolerance_frames', 'climbing_jump_frames',
+             'climb_speed', 'dash_speed', 'dash_duration', 'dash_prepare_frames')
+
+    def __init__(self, **overrides):
+        for name, value in overrides.items():
+            if name not in self.NAMES:
+                raise TypeError(f"Unknown physics parameter '{name}'")
+            setattr(self, name, value)
+        self.terminal_fall_speed = -self.jump_strength if self.max_fall_speed is None else self.max_fall_speed
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.NAMES}
+
+    def replace(self, **changes):
+        """Returns a copy with some parameters changed."""
+        return PhysicsParams(**{**self.as_dict(), **changes})
+
+    def __repr__(self):
+        changed = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.NAMES
+                            if getattr(self, name) != getattr(PhysicsParams, name))
+        return f"PhysicsParams({changed})"
+
+DEFAULT_PHYSICS = PhysicsParams()
+
 class MovementState:
     """Class to manage the movement state of a character."""
-    def __init__(self):
+    def __init__(self, params=None):
+        self.params = params or DEFAULT_PHYSICS # Shared, never mutated; copy with replace() to tune
         self.direction = 1 # 1 for right, -1 for left
 
         self.air_frames = 0
@@ -24,10 +72,10 @@ class MovementState:
         self.is_idle = True
 
         self.velocity = [0, 0]  # [x_velocity, y_velocity]
-        self.dash_speed = PLAYER_DASH_SPEED
-        self.run_speed = PLAYER_SPEED
-        self.jump_force = PLAYER_JUMP_STRENGTH
-        self.gravity = PLAYER_GRAVITY
+        self.dash_speed = self.params.dash_speed
+        self.run_speed = self.params.run_speed
+        self.jump_force = self.params.jump_strength
+        self.gravity = self.params.gravity
     
     def apply_gravity(self):
         """Apply gravity to the player."""
@@ -35,8 +83,8 @@ class MovementState:
         if not self.is_dashing:
             self.velocity[1] += self.gravity
             # Basic terminal velocity
-            if self.velocity[1] > -PLAYER_JUMP_STRENGTH:
-                self.velocity[1] = -PLAYER_JUMP_STRENGTH
+            if self.velocity[1] > self.params.terminal_fall_speed:
+                self.velocity[1] = self.params.terminal_fall_speed
 
     def update(self):
         """Update the movement state based on velocity and gravity."""
@@ -49,22 +97,22 @@ class MovementState:
 
     def jump(self):
         """Trigger a jump if not already jumping or falling."""
-        if self.is_dashing and self.dash_frame <= PLAYER_DASH_PREPARE_FRAMES and self.can_jump:
+        if self.is_dashing and self.dash_frame <= self.params.dash_prepare_frames and self.can_jump:
             self.is_dashing = False
             self.is_super_jumping = True
             self.can_jump = False
-            self.velocity[0] = self.dash_speed * self.direction * PLAYER_SUPER_JUMP_STRENGTH_RATE
+            self.velocity[0] = self.dash_speed * self.direction * self.params.super_jump_rate
             self.velocity[1] = self.jump_force
         elif self.is_climbing:
             self.is_climbing_jump = True
             self.is_idle = False
             self.is_climbing = False
             self.climbing_jump_frame = 0
-        elif self.can_double_jump and self.air_frames > JUMP_TOLERANCE_FRAME:
+        elif self.can_double_jump and self.air_frames > self.params.jump_tolerance_frames:
             self.can_double_jump = False
             self.is_idle = False
-            self.velocity[1] = self.jump_force * PLAYER_DOUBLE_JUMP_STRENGTH_RATE
-        elif (self.on_ground or self.air_frames < JUMP_TOLERANCE_FRAME) and self.can_jump and not self.is_dashing:
+            self.velocity[1] = self.jump_force * self.params.double_jump_rate
+        elif (self.on_ground or self.air_frames < self.params.jump_tolerance_frames) and self.can_jump and not self.is_dashing:
             self.on_ground = False
             self.is_idle = False
             self.can_jump = False
@@ -75,7 +123,7 @@ class MovementState:
         if self.can_dash:
             self.is_dashing = True
             self.can_dash = False
-            self.dash_timer = PLAYER_DASH_DURATION
+            self.dash_timer = self.params.dash_duration
             self.dash_frame = 0
             if self.is_climbing: self.direction *= -1
 
@@ -88,9 +136,9 @@ class MovementState:
                 self.is_dashing = False
                 self.is_super_jumping = False
             else:
-                if self.dash_frame > PLAYER_DASH_PREPARE_FRAMES:
+                if self.dash_frame > self.params.dash_prepare_frames:
                     self.velocity[0] = self.dash_speed * self.direction
-                elif self.dash_frame <= PLAYER_DASH_PREPARE_FRAMES and not self.is_super_jumping:
+                elif self.dash_frame <= self.params.dash_prepare_frames and not self.is_super_jumping:
                     self.velocity[0] = 0
 
     def move_left(self):
@@ -100,7 +148,7 @@ class MovementState:
         self.direction = -1  # Set direction to left
         if self.velocity[0] > 0:
             self.velocity[0] = 0  # Reset horizontal speed before moving
-        self.velocity[0] -= self.run_speed / ACELERATION_FRAME
+        self.velocity[0] -= self.run_speed / self.params.acceleration_frames
         self.velocity[0] = max(-self.run_speed, self.velocity[0])  # Limit left speed
 
     def move_right(self):
@@ -110,7 +158,7 @@ class MovementState:
         self.direction = 1
         if self.velocity[0] < 0:  # If moving left, stop moving left
             self.velocity[0] = 0  # Reset horizontal speed before moving
-        self.velocity[0] += self.run_speed / ACELERATION_FRAME
+        self.velocity[0] += self.run_speed / self.params.acceleration_frames
         self.velocity[0] = min(self.run_speed, self.velocity[0]) # Limit right speed
 
     def stop_horizontal(self):
@@ -133,11 +181,11 @@ class MovementState:
         """Gradually reduce horizontal speed."""
         if self.is_running:
             if self.velocity[0] > 0:
-                self.velocity[0] -= self.run_speed / DECELERATION_FRAME
+                self.velocity[0] -= self.run_speed / self.params.deceleration_frames
                 if self.velocity[0] < 0:
                     self.velocity[0] = 0
             elif self.velocity[0] < 0:
-                self.velocity[0] += self.run_speed / DECELERATION_FRAME
+                self.velocity[0] += self.run_speed / self.params.deceleration_frames
                 if self.velocity[0] > 0:
                     self.velocity[0] = 0
 
@@ -151,23 +199,23 @@ class MovementState:
     def start_climbing(self):
         """Start climbing."""
         self.is_climbing = True
-        self.air_frames = CLIMBING_JUMP_FRAME
+        self.air_frames = self.params.climbing_jump_frames
         self.reset_actions()
     
     def update_climbing(self):
         """Update climbing state."""
         if self.is_climbing:
-            self.velocity[1] = 1.5
+            self.velocity[1] = self.params.climb_speed
 
     def update_climbing_jump(self):
         """Update climbing jump state."""
         if self.is_climbing_jump:
             self.climbing_jump_frame += 1
-            if self.climbing_jump_frame > CLIMBING_JUMP_FRAME:
+            if self.climbing_jump_frame > self.params.climbing_jump_frames:
                 self.is_climbing_jump = False
                 self.direction *= -1
                 self.is_running = True
                 self.velocity[1] *= 0.6
             else:
-                self.velocity[1] = PLAYER_JUMP_STRENGTH * PLAYER_DOUBLE_JUMP_STRENGTH_RATE
-                self.velocity[0] = PLAYER_SPEED * -self.direction
+                self.velocity[1] = self.jump_force * self.params.double_jump_rate
+                self.velocity[0] = self.run_speed * -self.direction
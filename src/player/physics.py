@@ -0,0 +1,78 @@
+from src.core.collision import sweep_rect
+
+class PlayerPhysics:
+    """Movement and collision resolution for the player, independent of input and rendering.
+
+    Player mixes this in; headless simulations (e.g. the level solver) reuse it with
+    their own rect, movement_state and obstacle_sprites so they follow exactly the
+    same rules as the game.
+    """
+    def apply_held_input(self, horizontal):
+        """Applies a held horizontal input for one frame (1 right, -1 left, 0 none)."""
+        if self.movement_state.is_climbing_jump: return
+
+        if not self.movement_state.is_dashing and not self.movement_state.is_super_jumping:
+            if horizontal > 0:
+                self.movement_state.move_right()
+            elif horizontal < 0:
+                self.movement_state.move_left()
+            else:
+                self.movement_state.decelerate()
+
+    def step_physics(self):
+        """Advances the movement state one frame and resolves it against obstacles."""
+        self.movement_state.update()
+        self.vertical_collision() # Includes gravity application
+        self.horizontal_collision()
+
+    def horizontal_collision(self):
+        """Handle horizontal movement, sweeping against obstacles so a dash can't tunnel through walls."""
+        # Round the move exactly as assigning to rect.x would, then sweep along it
+        target = self.rect.copy()
+        target.x += self.movement_state.velocity[0]
+        dx = target.x - self.rect.x
+        self.movement_state.is_climbing = False
+        hit = sweep_rect(self.rect, dx, 0, self.obstacle_sprites) if dx else None
+        if not hit:
+            self.rect.x = target.x
+            return
+
+        if not self.movement_state.on_ground and self.movement_state.air_frames > self.movement_state.params.climbing_jump_frames:
+            self.movement_state.start_climbing()
+        self.movement_state.stop_horizontal() # Stop on collision
+        if hit.normal[0] < 0: # Hit the left side of a wall while moving right
+            self.rect.right = hit.sprite.rect.left
+        else: # Hit the right side of a wall while moving left
+            self.rect.left = hit.sprite.rect.right
+
+    def vertical_collision(self):
+        """Handle vertical movement, sweeping against obstacles."""
+        target = self.rect.copy()
+        target.y += self.movement_state.velocity[1]
+        dy = target.y - self.rect.y
+
+        previous_on_ground = self.movement_state.on_ground
+        self.movement_state.on_ground = False # Assume not on ground until collision check
+        self.movement_state.air_frames += 1 # Increment air frames
+        if self.movement_state.is_dashing:
+            self.movement_state.velocity[1] = 0 # Stop vertical movement during dash
+        hit = sweep_rect(self.rect, 0, dy, self.obstacle_sprites) if dy else None
+        if not hit:
+            self.rect.y = target.y
+        else:
+            sprite = hit.sprite
+            if hit.normal[1] < 0: # Landed on top of something (falling)
+                self.rect.bottom = sprite.rect.top
+                self.movement_state.on_ground = True
+                self.movement_state.air_frames = 0 # Reset air frames
+                self.movement_state.is_climbing = False # Stop climbing
+                # Check if landed on a temporary platform and activate its timer
+                if hasattr(sprite, 'tile_type') and sprite.tile_type == 'temp_platform':
+                    if hasattr(sprite, 'activate_timer'):
+                        sprite.activate_timer()
+            else: # Hit a ceiling (jumping)
+                self.rect.top = sprite.rect.bottom
+            self.movement_state.velocity[1] = 0 # Stop vertical movement
+        # Reset jumps if landed on ground
+        if self.movement_state.on_ground and not previous_on_ground:
+             self.movement_state.reset_actions()
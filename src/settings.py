@@ -7,6 +7,7 @@ GAME_NAME = "I Wanna Study Computer Science"
 SCREEN_WIDTH = 1024
 SCREEN_HEIGHT = 768
 TILE_SIZE = 32
+RENDER_SCALE = 1 # Integer; draw the world at 1/RENDER_SCALE resolution (2 -> 512x384) and scale it up to the window
 
 # Colors
 WHITE = (255, 255, 255)
@@ -29,6 +30,7 @@ class GameState(Enum):
     SETTINGS = auto() # Placeholder if needed
     DEATH_SCREEN = auto()
     GAME_OVER = auto() # Optional: If all levels completed
+    EDITOR = auto() # Painting the running level with the mouse (F2 while playing, see src/ui/editor.py)
 
 # Player setting
 ACELERATION_FRAME = 6 # Frames to reach max speed
@@ -52,6 +54,22 @@ MOVING_SPIKE_HORIZONTAL_RANGE = 3 # Number of tiles the spike moves left/right f
 # Framerate
 FPS = 60
 
+# Frame Pacing: simulation runs at a fixed rate, rendering at its own (capped) rate
+FRAME_PACING_ENABLED = True # False = one input step, update and draw per clock.tick(FPS)
+SIMULATION_HZ = FPS # Physics is per tick, so this is the game speed
+RENDER_FPS_CAP = 0 # Max draws per second; 0 = the display refresh rate when pygame reports it, else SIMULATION_HZ
+MAX_SIMULATION_SUBSTEPS = 5 # Catch-up ticks per loop; older backlog is dropped so a stall can't snowball
+RENDER_FRAME_SKIP_MAX = 2 # While catching up, skip up to this many draws in a row (0 = never skip)
+PACING_SPIN_S = 0.002 # Last stretch before a deadline is busy-waited instead of slept, for low jitter
+TIME_SCALE = 1.0 # Simulated seconds per real second: > 1 fast-forwards (more ticks per frame), < 1 is slow motion
+TIME_SCALES = (0.0, 0.125, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0) # Stepped through with F3/F4 while playing; 0 pauses (F6 steps one tick)
+STATIC_SCREEN_WAIT_MS = 100 # Death/game-over screens block on input for up to this long per loop pass instead of pacing
+
+# Power saving: throttle the main loop while the window is minimized/unfocused or a menu sits idle
+POWER_SAVING_ENABLED = True # Always off while recording, so recordings keep their frame rate
+POWER_IDLE_TIMEOUT_S = 30.0 # Menus and static screens throttle after this long without input
+POWER_THROTTLED_HZ = 5 # Loop passes per second while throttled; input still wakes the loop at once
+
 # --- Calculate Project Root based on settings.py location ---
 # Path to the directory containing settings.py (src/)
 _SETTINGS_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -65,8 +83,30 @@ FONTS_DIR = os.path.join(ASSETS_DIR, "fonts")
 # Example: ELEGANT_FONT_NAME = "Quicksand-Regular.ttf" # Replace with your font file
 ELEGANT_FONT_NAME = None # Set to a font file name like "YourFont.ttf"
 ELEGANT_FONT_PATH = os.path.join(FONTS_DIR, ELEGANT_FONT_NAME) if ELEGANT_FONT_NAME else None
+
+# Sprite animation loading
+ANIMATION_LOAD_WORKERS = 0 # Threads decoding sprite frames in parallel (0 = one per CPU core)
 # --------------------------
 
+# --- Level Files ---
+LEVELS_DIR = os.path.join(ASSETS_DIR, "levels") # One <level_id>.txt file per level
+LEVEL_CACHE_DIR = os.path.join(LEVELS_DIR, ".cache") # Compiled binary grids, keyed by content hash
+ROOT_LEVEL_ID = "level_3" # Level loaded by "Start Game"
+LEVEL_HOT_RELOAD_ENABLED = True # Watch LEVELS_DIR and rebuild the current level when its file changes
+LEVEL_WATCH_INTERVAL_S = 0.5 # How often the watcher polls level files for changes
+
+# Chunked streaming: large levels only keep sprites for chunks near the camera
+LEVEL_CHUNK_STREAMING_ENABLED = True
+LEVEL_CHUNK_STREAMING_MIN_CELLS = 16384 # Stream levels with at least this many grid cells (width * height)
+LEVEL_CHUNK_SIZE = 8 # Chunk edge length in tiles
+LEVEL_CHUNK_LOAD_MARGIN = 1 # Chunks around the camera view that are built
+LEVEL_CHUNK_EVICT_MARGIN = 2 # Chunks further than this from the view are evicted (keep > load margin)
+
+# Level transitions: the cyclic GC is paused while a layout is torn down and rebuilt, then run once;
+# the survivors are frozen so GC passes during play don't keep scanning the level's long-lived objects
+LEVEL_TRANSITION_GC_FREEZE = True
+# -------------------
+
 # Fonts (Consider using a specific font file later)
 MENU_FONT_SIZE = 50
 MENU_FONT_COLOR = WHITE
@@ -106,6 +146,8 @@ VOSK_CHANNELS = 1         # Mono audio
 # Optional: Specify microphone device ID if the default is not correct.
 # Run voice_recognizer.py directly (once model path is set) to see available devices if needed.
 VOSK_DEVICE_ID = None     # None for default device, or an integer device ID
+VOICE_RECOGNITION_MODE = "process" # "process": capture and Vosk decoding in child processes; "thread": in the game process
+VOICE_AUDIO_RING_SECONDS = 2.0 # Audio the shared-memory ring between the capture and decoder processes can hold
 
 # Temporary Platform Settings
 TEMP_PLATFORM_CHAR = 'T'  # Character to represent temporary platforms in level data
@@ -126,5 +168,16 @@ PERIODIC_PLATFORM_VISIBLE_S = 2.0  # Duration visible
 PERIODIC_PLATFORM_INVISIBLE_S = 2.0  # Duration invisible
 PERIODIC_PLATFORM_COLOR = (100, 50, 15)  # Darker brown, similar to EARTH_BROWN but darker
 
+# Level Editor Settings (F2 while playing)
+EDITOR_BRUSHES = ('X', 'S', 'E', 'C', 'M', TEMP_PLATFORM_CHAR, PERIODIC_PLATFORM_CHAR, COIN_CHAR, 'P') # Keys 1-9, in order
+EDITOR_FONT_SIZE = 24
+EDITOR_CURSOR_COLOR = (255, 255, 255) # Outline of the cell under the mouse
+EDITOR_HUD_BG_COLOR = (0, 0, 0, 160) # Translucent strip behind the editor's help line
+
 # Voice Recognition Toggle Setting
 VOICE_RECOGNITION_ENABLED_BY_DEFAULT = True
+
+# Video Capture Settings (python main.py --record)
+VIDEO_CAPTURE_DIR = os.path.join(_PROJECT_ROOT, "recordings")
+VIDEO_CAPTURE_FORMAT = "ffmpeg" # "ffmpeg" (raw frames piped to ffmpeg, needs it on PATH) or "png" (numbered PNGs)
+VIDEO_CAPTURE_BUFFER_SLOTS = 8 # Preallocated frame buffers; frames are dropped (and counted) when all are in use
@@ -0,0 +1,580 @@
+"""Reachability solver for level layouts.
+
+Searches over player states with the same MovementState rules and collision code
+the game uses (PlayerPhysics), to check that 'P' can reach an 'E' and report an input
+sequence that gets there. Inputs are discretised into macro steps: a held direction
+for a few frames, optionally with a jump or dash press on the first frame. States are
+hashed on a quantised position plus the movement flags (speed is left out), and a
+weighted A* ordered by a tile-path estimate of the frames left finds a route quickly;
+it is not necessarily the fastest one. Because states are merged, a level with no
+route found is only reported UNREACHABLE when solid tiles wall the start off.
+
+--exact keeps speed in the state key and searches with a true lower bound instead.
+It is far slower, but a route it finds is the fastest one, and a search that runs
+out of states without hitting the budget proves the level UNREACHABLE.
+
+Usage:
+    python -m src.tools.level_solver                   # every level in LEVELS
+    python -m src.tools.level_solver level_4 --inputs  # one level, print the inputs
+    python -m src.tools.level_solver --generate 20     # also 20 generated levels
+    python -m src.tools.level_solver level_3 --exact --max-expansions 500000
+"""
+import argparse
+import copy
+import heapq
+from collections import deque
+import itertools
+import math
+import random
+import sys
+import time
+import pygame
+from src.settings import *
+from src.core.collision import SpatialHashGroup, collide_hitbox_mask, hitbox_mask
+from src.entities.coin import Coin
+from src.entities.moving_spike import MovingSpike
+from src.levels.tile import Tile
+from src.player.movement_state import DEFAULT_PHYSICS, MovementState
+from src.player.physics import PlayerPhysics
+
+FRAME_DT = 1.0 / FPS
+PLAYER_SIZE = (20, 32) # Must match Player.rect
+HELD_INPUTS = (1, -1, 0) # Right, left, none
+PRESS_INPUTS = (None, 'jump', 'dash')
+HELD_NAMES = {1: 'R', -1: 'L', 0: '-'}
+SOLID_CELLS = ('X', 'M') # Cells nothing ever passes through; every other cell may be open at some point
+LANDING_CELLS = SOLID_CELLS + ('E', TEMP_PLATFORM_CHAR, PERIODIC_PLATFORM_CHAR, COIN_CHAR) # Anything a falling player can stop, climb or recharge on
+NEIGHBOURS = [(dc, dr) for dc in (-1, 0, 1) for dr in (-1, 0, 1) if dc or dr]
+
+class SolveResult:
+    """Outcome of a solve.
+
+    reachable is True (a route was found), False (proven impossible: there is no exit,
+    solid tiles wall the start off from all of them, or an exact search tried every state
+    within budget) or None (no route found). A fast search merges states that differ only
+    in speed, so its None is not proof even when budget_hit is False.
+    """
+    def __init__(self, reachable, frames=None, actions=None, expanded=0, elapsed_s=0.0, budget_hit=False):
+        self.reachable = reachable
+        self.frames = frames # Frames the route found takes; the fewest only for an exact search within budget
+        self.actions = actions or [] # (held, press) per macro step
+        self.expanded = expanded
+        self.elapsed_s = elapsed_s
+        self.budget_hit = budget_hit # Stopped at max_expansions or max_frames
+
+    def format_inputs(self, macro_frames):
+        """Run-length encodes the action list, e.g. 'R x12f, R+jump x4f'."""
+        parts = []
+        for (held, press), group in itertools.groupby(self.actions):
+            count = len(list(group))
+            if press:
+                parts.extend([f"{HELD_NAMES[held]}+{press} x{macro_frames}f"] +
+                             ([f"{HELD_NAMES[held]} x{(count - 1) * macro_frames}f"] if count > 1 else []))
+            else:
+                parts.append(f"{HELD_NAMES[held]} x{count * macro_frames}f")
+        return ', '.join(parts)
+
+class _SolverTile(pygame.sprite.Sprite):
+    """Collision-only stand-in for a Tile."""
+    def __init__(self, rect, tile_type, solver=None, index=None, image=None):
+        super().__init__()
+        self.rect = rect
+        self.tile_type = tile_type
+        self.image = image # Only traps need one, for the same pixel test the player uses
+        self.solver = solver
+        self.index = index
+
+    def activate_timer(self):
+        """Called by PlayerPhysics on landing; records the temporary platform's expiry."""
+        self.solver._activate_temp(self.index)
+
+class _SolverBody(PlayerPhysics):
+    """Headless player body; obstacle_sprites is the solver's time-dependent obstacle view."""
+    def __init__(self, obstacle_view):
+        self.rect = pygame.Rect((0, 0), PLAYER_SIZE)
+        self.mask = hitbox_mask(None, PLAYER_SIZE) # Same solid body as Player.mask
+        self.movement_state = MovementState()
+        self.obstacle_sprites = obstacle_view
+
+class _ObstacleView:
+    """Obstacles as seen at the solver's current frame (duck-types SpatialHashGroup.query)."""
+    def __init__(self, solver):
+        self.solver = solver
+        self.has_periodic = bool(solver.periodic_sprites) # Group.__bool__ is too slow to ask every frame
+        self.has_temps = bool(solver.temp_sprites)
+
+    def query(self, rect):
+        solver = self.solver
+        found = solver.solid_sprites.query(rect)
+        if self.has_periodic and solver._periodic_visible(solver._frame):
+            found.extend(solver.periodic_sprites.query(rect))
+        if self.has_temps:
+            for sprite in solver.temp_sprites.query(rect):
+                expiry = solver._temps.get(sprite.index)
+                if expiry is None or solver._frame < expiry:
+                    found.append(sprite)
+        return found
+
+class _Node:
+    __slots__ = ('rect', 'movement_state', 'frame', 'coins', 'temps', 'parent', 'action')
+
+    def __init__(self, rect, movement_state, frame, coins, temps, parent=None, action=None):
+        self.rect = rect
+        self.movement_state = movement_state
+        self.frame = frame
+        self.coins = coins # Bitmask of collected coins
+        self.temps = temps # Temporary platform index -> frame it disappears
+        self.parent = parent
+        self.action = action
+
+class LevelSolver:
+    """Weighted A* search from the player start to any exit over discretised player states.
+
+    With exact=True the search is plain A* with the straight-line lower bound and speed
+    kept in the state key, so a route found is the fastest and a search that runs out of
+    states proves the level unreachable (for these macro steps and position quantum).
+    """
+    def __init__(self, layout, macro_frames=4, position_quantum=8, heuristic_weight=3.0,
+                 max_frames=FPS * 120, max_expansions=50000, physics=None, exact=False):
+        self.layout = layout
+        self.physics = physics or DEFAULT_PHYSICS # PhysicsParams the player moves with
+        self.exact = exact
+        self.heuristic_weight = 1.0 if exact else heuristic_weight # Higher searches greedier: sooner, but longer routes
+        self.macro_frames = macro_frames
+        self.position_quantum = position_quantum
+        self.max_frames = max_frames
+        self.max_expansions = max_expansions
+        self.level_height = len(layout) * TILE_SIZE
+        self.temp_duration_frames = round(TEMP_PLATFORM_DURATION_S * FPS)
+        self.periodic_period_frames = round((PERIODIC_PLATFORM_VISIBLE_S + PERIODIC_PLATFORM_INVISIBLE_S) * FPS)
+        self.max_speed_x = max(self.physics.run_speed, self.physics.dash_speed * self.physics.super_jump_rate)
+        self.max_speed_y = max(abs(self.physics.jump_strength), self.physics.terminal_fall_speed)
+        self.kill_y = self.level_height + TILE_SIZE * 4 # Past this the player has fallen out of the level
+        self.grid_cols = max(map(len, layout), default=0)
+        self.grid_rows = len(layout)
+        self._build(layout)
+        self.exit_frames = self._exit_frames(layout)
+        self.exit_steps = self._exit_steps(layout) if exact else {}
+        self.lowest_landing_rows = [max((row_index for row_index, row in enumerate(layout)
+                                         if col_index < len(row) and row[col_index] in LANDING_CELLS), default=-1)
+                                    for col_index in range(self.grid_cols)]
+        self._frame = 0
+        self._temps = {}
+
+    def _build(self, layout):
+        self.solid_sprites = SpatialHashGroup()
+        self.periodic_sprites = SpatialHashGroup()
+        self.temp_sprites = SpatialHashGroup()
+        self.trap_sprites = SpatialHashGroup()
+        self.exit_rects = []
+        self.coin_rects = []
+        self.spikes = [] # MovingSpike instances, stepped to precompute their path
+        self.spike_paths = [] # Per spike: rect at each frame
+        self.start = None
+        coin_size = Coin.get_frames()[0].get_size()
+        temp_index = itertools.count()
+
+        for row_index, row in enumerate(layout):
+            for col_index, cell in enumerate(row):
+                pos = (col_index * TILE_SIZE, row_index * TILE_SIZE)
+                rect = pygame.Rect(pos, (TILE_SIZE, TILE_SIZE))
+                if cell == 'X':
+                    self.solid_sprites.add(_SolverTile(rect, 'platform'))
+                elif cell == 'S':
+                    self.trap_sprites.add(_SolverTile(rect, 'trap', image=Tile._trap_image()))
+                elif cell == 'E':
+                    self.exit_rects.append(rect)
+                elif cell == 'M':
+                    self.solid_sprites.add(_SolverTile(rect, 'platform'))
+                    spike = MovingSpike(pos, [])
+                    self.spikes.append(spike)
+                    self.spike_paths.append([])
+                elif cell == TEMP_PLATFORM_CHAR:
+                    self.temp_sprites.add(_SolverTile(rect, 'temp_platform', self, next(temp_index)))
+                elif cell == PERIODIC_PLATFORM_CHAR:
+                    self.periodic_sprites.add(_SolverTile(rect, 'periodic_platform'))
+                elif cell == COIN_CHAR:
+                    self.coin_rects.append(pygame.Rect((0, 0), coin_size))
+                    self.coin_rects[-1].center = rect.center
+                elif cell == 'P' and self.start is None:
+                    self.start = pos
+        self.start = self.start or (100, 100) # Same fallback as Level
+
+        # Periodic platforms and moving spikes repeat; fold time into the state key over their common cycle
+        cycles = []
+        if self.periodic_sprites:
+            cycles.append(self.periodic_period_frames)
+        if self.spikes:
+            cycles.append(round(4 * MOVING_SPIKE_HORIZONTAL_RANGE * TILE_SIZE / MOVING_SPIKE_SPEED))
+        self.cycle_frames = math.lcm(*cycles) if cycles else 0
+
+    def _periodic_visible(self, frame):
+        return (frame * FRAME_DT) % (PERIODIC_PLATFORM_VISIBLE_S + PERIODIC_PLATFORM_INVISIBLE_S) < PERIODIC_PLATFORM_VISIBLE_S
+
+    def _spike_rect(self, spike_index, frame):
+        path = self.spike_paths[spike_index]
+        spike = self.spikes[spike_index]
+        while len(path) <= frame: # Spikes move before the player in Level.run
+            spike.update(FRAME_DT)
+            path.append(spike.rect.copy())
+        return path[frame]
+
+    def _activate_temp(self, index):
+        if index not in self._temps:
+            self._temps[index] = self._frame + self.temp_duration_frames
+
+    def _exit_frames(self, layout):
+        """Estimated frames from each cell to the nearest exit, moving tile by tile around solid cells.
+
+        Sideways steps are costed at dash speed, falls at terminal speed and climbs at a
+        jump's average rise. Cells that can't reach an exit are left out; the layout gets a
+        one-cell open border, since the player can leave the drawn area and come back in.
+        """
+        step_x = TILE_SIZE / self.physics.dash_speed
+        step_down = TILE_SIZE / self.physics.terminal_fall_speed
+        step_up = TILE_SIZE / (-self.physics.jump_strength / 2) # Average climb speed over a jump
+        estimates = {}
+        queue = []
+        for row_index, row in enumerate(layout):
+            for col_index, cell in enumerate(row):
+                if cell == 'E':
+                    queue.append((0, (col_index, row_index)))
+        while queue: # Dijkstra outwards from the exits
+            frames, (col, row) = heapq.heappop(queue)
+            if (col, row) in estimates:
+                continue
+            estimates[(col, row)] = frames
+            for dc, dr in NEIGHBOURS:
+                cell = (col + dc, row + dr)
+                if cell in estimates or not (-1 <= cell[0] <= self.grid_cols and -1 <= cell[1] <= self.grid_rows):
+                    continue
+                if self._is_solid_cell(layout, *cell):
+                    continue
+                step_y = step_up if dr > 0 else step_down if dr < 0 else 0 # dr > 0: the player climbs up from the cell below
+                heapq.heappush(queue, (frames + max(abs(dc) * step_x, step_y), cell))
+        return estimates
+
+    def _is_solid_cell(self, layout, col, row):
+        return 0 <= row < self.grid_rows and 0 <= col < len(layout[row]) and layout[row][col] in SOLID_CELLS
+
+    def _exit_steps(self, layout):
+        """8-way steps through non-solid cells from each cell to one where the player's top-left can touch an exit.
+
+        The player's top-left corner is always in a non-solid cell, and cells 2 steps
+        apart are a whole tile apart, so from a cell n steps away the player must still
+        move (n - 1) tiles along one axis or the other. That makes it a true lower bound.
+        """
+        steps = {}
+        queue = deque()
+        for row_index, row in enumerate(layout):
+            for col_index, cell in enumerate(row):
+                if cell != 'E':
+                    continue
+                for cell_pos in ((col_index - 1, row_index - 1), (col_index, row_index - 1),
+                                 (col_index - 1, row_index), (col_index, row_index)):
+                    if cell_pos not in steps and not self._is_solid_cell(layout, *cell_pos):
+                        steps[cell_pos] = 0
+                        queue.append(cell_pos)
+        while queue:
+            col, row = queue.popleft()
+            for dc, dr in NEIGHBOURS:
+                cell = (col + dc, row + dr)
+                if cell in steps or not (-1 <= cell[0] <= self.grid_cols and -1 <= cell[1] <= self.grid_rows):
+                    continue
+                if not self._is_solid_cell(layout, *cell):
+                    steps[cell] = steps[(col, row)] + 1
+                    queue.append(cell)
+        return steps
+
+    def _heuristic(self, rect):
+        """Estimated frames to touch an exit, or math.inf if solid tiles wall the player off from every exit.
+
+        The larger of the straight-line gap at the per-axis top speeds (a true lower bound)
+        and the tile path around walls from exit_frames (an estimate, since super jumps
+        outrun a dash). Exact searches use the lower bound alone.
+        """
+        best = math.inf
+        for exit_rect in self.exit_rects:
+            gap_x = max(0, exit_rect.left - rect.right, rect.left - exit_rect.right)
+            gap_y = max(0, exit_rect.top - rect.bottom, rect.top - exit_rect.bottom)
+            best = min(best, max(gap_x / self.max_speed_x, gap_y / self.max_speed_y))
+
+        cols = range(rect.left // TILE_SIZE, (rect.right - 1) // TILE_SIZE + 1)
+        rows = range(rect.top // TILE_SIZE, (rect.bottom - 1) // TILE_SIZE + 1)
+        if cols[0] < -1 or rows[0] < -1 or cols[-1] > self.grid_cols or rows[-1] > self.grid_rows:
+            return best # Outside the mapped area; the straight-line bound still holds
+        estimate = min(self.exit_frames.get((col, row), math.inf) for col in cols for row in rows)
+        if self.exact and estimate != math.inf:
+            steps = self.exit_steps.get((rect.left // TILE_SIZE, rect.top // TILE_SIZE), math.inf)
+            return max(best, (steps - 1) * TILE_SIZE / max(self.max_speed_x, self.max_speed_y))
+        return max(best, estimate)
+
+    def _fall_frames(self, velocity_y, distance):
+        """Upper bound on the frames a player moving at velocity_y takes to fall distance px."""
+        terminal = self.physics.terminal_fall_speed
+        speeding_up = max(0, math.ceil((terminal - velocity_y) / self.physics.gravity))
+        # Never higher than the apex while speeding up, then at least terminal speed
+        return speeding_up + math.ceil((distance + self._rise(velocity_y)) / terminal) + 1
+
+    def _rise(self, velocity_y):
+        """Height (px) a player moving up at velocity_y still climbs before falling."""
+        return max(0, -velocity_y) ** 2 / (2 * self.physics.gravity)
+
+    def _stranded(self, node):
+        """True if the player can only fall and has nothing to land on before falling out.
+
+        Without a jump, dash or wall to cling to (a double jump just delays the fall), a
+        player with no platform, coin or exit below it within horizontal reach is as good as dead.
+        """
+        state = node.movement_state
+        if (state.on_ground or state.is_climbing or state.is_climbing_jump or state.is_dashing or state.can_dash or
+                (state.can_jump and state.air_frames < self.physics.jump_tolerance_frames)):
+            return False
+        left, top, width, height = node.rect
+        frames = self._fall_frames(state.velocity[1], self.kill_y - top)
+        rise = self._rise(state.velocity[1])
+        if state.can_double_jump: # Upper bound: jump again from the highest point, then fall the whole way
+            double_jump = self.physics.jump_strength * self.physics.double_jump_rate
+            frames += self._fall_frames(double_jump, self.kill_y - top + rise)
+            rise += self._rise(double_jump)
+        reach = frames * max(abs(state.velocity[0]), self.physics.run_speed) # Held input can't speed the player up past either
+        top_row = int(top - rise) // TILE_SIZE
+        first_col = max(0, int(left - reach) // TILE_SIZE)
+        last_col = min(self.grid_cols - 1, int(left + width + reach) // TILE_SIZE)
+        return all(self.lowest_landing_rows[col] < top_row for col in range(first_col, last_col + 1))
+
+    def _state_key(self, node):
+        state = node.movement_state
+        quantum = self.position_quantum
+        temps = tuple(sorted((index, max(0, expiry - node.frame) // self.macro_frames)
+                             for index, expiry in node.temps.items()))
+        phase = (node.frame % self.cycle_frames) // self.macro_frames if self.cycle_frames else 0
+        # Speed is left out of fast searches: states that only differ in it are merged, which keeps the search small
+        speed = (round(state.velocity[0]), round(state.velocity[1])) if self.exact else ()
+        return (node.rect[0] // quantum, node.rect[1] // quantum, *speed, state.direction,
+                state.on_ground, state.can_jump, state.can_dash, state.can_double_jump,
+                state.is_dashing, state.dash_timer, state.is_super_jumping, state.is_running,
+                state.is_climbing, state.is_climbing_jump, state.climbing_jump_frame,
+                min(state.air_frames, self.physics.climbing_jump_frames + 1), node.coins, temps, phase)
+
+    def _useful_presses(self, state):
+        """Prunes presses that can't do anything in this state."""
+        presses = [None]
+        if state.is_climbing_jump:
+            return presses # Player.process_input ignores presses during a climbing jump
+        if (state.can_jump or state.can_double_jump or state.is_climbing or
+                (state.is_dashing and state.dash_frame <= self.physics.dash_prepare_frames)):
+            presses.append('jump')
+        if state.can_dash:
+            presses.append('dash')
+        return presses
+
+    def _expand(self, node, held, press, body, frames=None):
+        """Simulates one macro step (or frames frames) from node. Returns (child, reached_exit) or (None, False) on death."""
+        body.rect.topleft = node.rect[:2]
+        state = copy.copy(node.movement_state)
+        state.velocity = list(state.velocity)
+        body.movement_state = state
+        self._temps = dict(node.temps)
+        coins = node.coins
+        frame = node.frame
+
+        for step in range(frames or self.macro_frames):
+            frame += 1
+            self._frame = frame
+            if step == 0 and press == 'jump': # Presses are processed before the level updates
+                state.jump()
+            elif step == 0 and press == 'dash':
+                state.dash()
+
+            body.apply_held_input(held)
+            body.step_physics()
+            rect = body.rect
+
+            if not state.is_dashing: # Dashing grants trap immunity
+                if any(collide_hitbox_mask(body, trap) for trap in self.trap_sprites.query(rect)):
+                    return None, False
+                for spike_index in range(len(self.spikes)):
+                    if self._spike_rect(spike_index, frame).colliderect(rect):
+                        return None, False
+            if rect.collidelist(self.exit_rects) != -1:
+                child = _Node(tuple(rect), state, frame, coins, self._temps, node, (held, press))
+                return child, True
+            for coin_index in rect.collidelistall(self.coin_rects):
+                if not coins & (1 << coin_index):
+                    coins |= 1 << coin_index
+                    state.recharge_double_jump()
+            if rect.top > self.kill_y: # Fell out of the level
+                return None, False
+
+        return _Node(tuple(body.rect), state, frame, coins, self._temps, node, (held, press)), False
+
+    def _start_node(self):
+        return _Node((*self.start, *PLAYER_SIZE), MovementState(self.physics), 0, 0, {})
+
+    def simulate(self, inputs):
+        """Plays per-frame (held, press) inputs from the start without searching.
+
+        Returns (nodes, outcome): the player's node (rect, movement_state, frame) after
+        each frame played, and 'exit', 'death' or None if the inputs ran out first.
+        """
+        body = _SolverBody(_ObstacleView(self))
+        node = self._start_node()
+        nodes = []
+        for held, press in inputs:
+            child, reached = self._expand(node, held, press, body, frames=1)
+            if child is None:
+                return nodes, 'death'
+            nodes.append(child)
+            if reached:
+                return nodes, 'exit'
+            node = child
+        return nodes, None
+
+    def solve(self):
+        """Runs the search and returns a SolveResult."""
+        started = time.perf_counter()
+        if not self.exit_rects:
+            return SolveResult(False, elapsed_s=time.perf_counter() - started)
+
+        body = _SolverBody(_ObstacleView(self))
+        start = self._start_node()
+        counter = itertools.count() # Tie-breaker so nodes are never compared
+        estimate = self._heuristic(pygame.Rect(start.rect))
+        if estimate == math.inf:
+            return SolveResult(False, elapsed_s=time.perf_counter() - started)
+        open_heap = [(self.heuristic_weight * estimate, estimate, next(counter), start)]
+        best_frame = {self._state_key(start): 0}
+        expanded = 0
+        budget_hit = False
+        goal = None # Exact searches: the fastest exit reached so far, returned once nothing queued can beat it
+
+        while open_heap:
+            if goal and open_heap[0][0] >= goal.frame:
+                break
+            node = heapq.heappop(open_heap)[-1]
+            if best_frame.get(self._state_key(node), math.inf) < node.frame:
+                continue # A faster route to this state was found after it was queued
+            if expanded >= self.max_expansions:
+                budget_hit = True
+                break
+            expanded += 1
+
+            presses = self._useful_presses(node.movement_state)
+            for held in HELD_INPUTS:
+                for press in presses:
+                    child, reached = self._expand(node, held, press, body)
+                    if child is None:
+                        continue
+                    if reached and not self.exact:
+                        return SolveResult(True, child.frame, self._actions(child), expanded, time.perf_counter() - started)
+                    if reached:
+                        goal = child if goal is None or child.frame < goal.frame else goal
+                        continue
+                    if child.frame > self.max_frames:
+                        budget_hit = True
+                        continue
+                    key = self._state_key(child)
+                    if best_frame.get(key, math.inf) <= child.frame or self._stranded(child):
+                        continue
+                    best_frame[key] = child.frame
+                    estimate = self._heuristic(pygame.Rect(child.rect))
+                    if estimate == math.inf:
+                        continue # Walled off from every exit
+                    # Among equal priorities, expand the node nearest the exit first
+                    heapq.heappush(open_heap, (child.frame + self.heuristic_weight * estimate, estimate, next(counter), child))
+
+        elapsed_s = time.perf_counter() - started
+        if goal:
+            return SolveResult(True, goal.frame, self._actions(goal), expanded, elapsed_s, budget_hit)
+        if self.exact and not budget_hit:
+            return SolveResult(False, expanded=expanded, elapsed_s=elapsed_s) # Every state tried
+        return SolveResult(None, expanded=expanded, elapsed_s=elapsed_s, budget_hit=budget_hit)
+
+    def _actions(self, node):
+        actions = []
+        while node.parent is not None:
+            actions.append(node.action)
+            node = node.parent
+        return actions[::-1]
+
+def solve_layout(layout, **solver_options):
+    """Convenience wrapper: solve a layout (list of row strings) and return a SolveResult."""
+    return LevelSolver(layout, **solver_options).solve()
+
+def generate_level(seed, width=80, height=14):
+    """Generates a simple random run-right layout (ground with gaps, spikes and ledges)."""
+    rng = random.Random(seed)
+    grid = [[' '] * width for _ in range(height)]
+    ground = height - 1
+    col = 0
+    while col < width:
+        run = rng.randint(4, 9)
+        for c in range(col, min(col + run, width)):
+            grid[ground][c] = 'X'
+        run_end = min(col + run, width)
+        if col > 6 and run_end - col >= 3 and rng.random() < 0.4: # A spike somewhere on this run
+            grid[ground - 1][rng.randint(col + 1, run_end - 2)] = 'S'
+        if rng.random() < 0.5: # A floating ledge above the run
+            ledge_row = ground - rng.randint(3, 5)
+            for c in range(col, min(col + rng.randint(2, 5), width)):
+                grid[ledge_row][c] = rng.choice('XXXo')
+        col += run + rng.randint(1, 4) # Gap
+    for c in range(0, 3):
+        grid[ground][c] = 'X'
+        grid[ground - 1][c] = ' '
+    for c in range(width - 4, width):
+        grid[ground][c] = 'X'
+        grid[ground - 1][c] = ' '
+    grid[ground - 1][1] = 'P'
+    grid[ground - 1][width - 2] = 'E'
+    return [''.join(row).rstrip() for row in grid]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check that levels can be completed and print a route that does it.")
+    parser.add_argument('levels', nargs='*', help="Level ids to check (default: every level in LEVELS)")
+    parser.add_argument('--generate', type=int, default=0, help="Also check this many generated levels")
+    parser.add_argument('--seed', type=int, default=0, help="Seed for the first generated level")
+    parser.add_argument('--macro-frames', type=int, default=4, help="Frames each input is held for")
+    parser.add_argument('--quantum', type=int, default=8, help="Position quantisation (px) for state hashing")
+    parser.add_argument('--weight', type=float, default=3.0, help="Heuristic weight (lower = shorter routes, higher = faster search)")
+    parser.add_argument('--exact', action='store_true',
+                        help="Exact search: find the fastest route or prove there is none (slow; ignores --weight)")
+    parser.add_argument('--max-expansions', type=int, default=50000, help="Search budget per level")
+    parser.add_argument('--inputs', action='store_true', help="Print the input sequence for each solved level")
+    args = parser.parse_args(argv)
+
+    from src.levels.level_data import LEVEL_LIBRARY, LEVELS
+    if args.levels:
+        targets = [(level_id, LEVEL_LIBRARY.get(level_id).layout) for level_id in args.levels]
+    else:
+        targets = [(level.level_id or level.name, level.layout) for level in LEVELS]
+    targets += [(f"generated_{args.seed + i}", generate_level(args.seed + i)) for i in range(args.generate)]
+
+    options = dict(macro_frames=args.macro_frames, position_quantum=args.quantum,
+                   heuristic_weight=args.weight, max_expansions=args.max_expansions, exact=args.exact)
+    total_started = time.perf_counter()
+    failures = 0
+    for name, layout in targets:
+        result = solve_layout(layout, **options)
+        if result.reachable:
+            route = "fastest route" if args.exact and not result.budget_hit else "route found"
+            status = f"reachable, {route} takes {result.frames} frames ({result.frames / FPS:.2f}s)"
+        elif result.reachable is False:
+            reason = "every state searched" if result.expanded else "no exit, or the start is walled off"
+            status = f"UNREACHABLE ({reason})"
+            failures += 1
+        elif result.budget_hit:
+            status = "no route found (search budget exhausted)"
+            failures += 1
+        else:
+            status = "no route found (not proof: the search merges similar states)"
+            failures += 1
+        print(f"{name}: {status} [{result.expanded} states, {result.elapsed_s:.2f}s]")
+        if args.inputs and result.reachable:
+            print(f"  inputs: {result.format_inputs(args.macro_frames)}")
+    print(f"Checked {len(targets)} level(s) in {time.perf_counter() - total_started:.2f}s, {failures} without a route.")
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,199 @@
+"""Memory report for levels and sprite assets.
+
+Loads the sprite assets, the level files and then every level in LEVELS, and reports
+what each costs. Python allocations are measured with tracemalloc and split by
+subsystem (the source file that allocated them); Surface pixel buffers are allocated by
+SDL, which tracemalloc can't see, so they are counted separately from the Surfaces
+reachable from each level. Finally each level is reloaded through
+LevelManager.reload_current_level a few times; memory or live sprites that keep
+growing from reload to reload are flagged as a likely leak.
+
+Usage:
+    python -m src.tools.memory_report                  # every level in LEVELS
+    python -m src.tools.memory_report level_4 --reloads 20
+
+On machines without a display, set SDL_VIDEODRIVER=dummy.
+"""
+import argparse
+import gc
+import sys
+import tracemalloc
+import pygame
+from src.settings import *
+
+# Allocations are charged to the innermost frame in one of these files (first match wins)
+SUBSYSTEM_PATHS = (
+    ('groups', ('pygame/sprite.py', 'src/core/collision.py')),
+    ('sprites', ('src/levels/tile.py', 'src/entities/', 'src/player/', 'src/animation.py')),
+    ('level data', ('src/levels/level_data.py', 'src/levels/level_file.py')),
+    ('level', ('src/levels/', 'src/core/')),
+)
+TRACE_FRAMES = 16
+
+class _ReportGame:
+    """Stands in for Game so Level and LevelManager can be built without the menu or voice."""
+    def __init__(self, screen):
+        self.screen = screen
+        self.current_state = GameState.PLAYING
+        self.level_manager = None
+
+def format_bytes(count):
+    for unit in ('B', 'KiB', 'MiB'):
+        if abs(count) < 1024 or unit == 'MiB':
+            return f"{count:.0f} {unit}" if unit == 'B' else f"{count:.1f} {unit}"
+        count /= 1024
+
+def subsystem_of(traceback):
+    """Names the subsystem of an allocation from its traceback (innermost frame first)."""
+    for frame in reversed(traceback): # tracemalloc lists frames outermost first
+        filename = frame.filename.replace('\\', '/')
+        for name, paths in SUBSYSTEM_PATHS:
+            if any(path in filename for path in paths):
+                return name
+    return 'other'
+
+def python_bytes_by_subsystem(before, after):
+    """Bytes allocated between two snapshots and still alive, per subsystem."""
+    totals = {}
+    for stat in after.compare_to(before, 'traceback'):
+        if stat.size_diff:
+            name = subsystem_of(stat.traceback)
+            totals[name] = totals.get(name, 0) + stat.size_diff
+    return totals
+
+def surface_bytes(surface):
+    """Pixel memory owned by a Surface (subsurfaces share their parent's)."""
+    if surface.get_parent() is not None:
+        return 0
+    return surface.get_pitch() * surface.get_height()
+
+def collect_surfaces(roots, exclude=()):
+    """Returns {id: Surface} for every Surface reachable from roots through containers and game objects."""
+    excluded = {id(surface) for surface in exclude}
+    seen = set()
+    surfaces = {}
+    stack = list(roots)
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        if isinstance(obj, pygame.Surface):
+            if id(obj) not in excluded:
+                surfaces[id(obj)] = obj
+        elif isinstance(obj, (dict, list, tuple, set, frozenset)) or type(obj).__module__.startswith(('src.', 'pygame.sprite')):
+            stack.extend(gc.get_referents(obj))
+    return surfaces
+
+def count_live_sprites():
+    return sum(1 for obj in gc.get_objects() if isinstance(obj, pygame.sprite.Sprite))
+
+def snapshot():
+    gc.unfreeze() # LevelManager freezes the heap after each load; thaw it so earlier levels' garbage is collected here
+    gc.collect()
+    return tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+
+def print_section(title, by_subsystem, surfaces=None):
+    print(f"{title}: python {format_bytes(sum(by_subsystem.values()))}", end='')
+    if surfaces is not None:
+        print(f", {len(surfaces)} surfaces {format_bytes(sum(map(surface_bytes, surfaces.values())))}", end='')
+    print()
+    for name, size in sorted(by_subsystem.items(), key=lambda item: -item[1]):
+        print(f"  {name:<12} {format_bytes(size):>10}")
+
+def load_assets():
+    """Loads the shared sprite assets and returns the objects holding them."""
+    from src.animation import Animator
+    from src.entities.coin import Coin
+    from src.levels.tile import Tile
+    from src.player.player import PLAYER_SPRITES_PATH
+    Tile((0, 0), [], 'exit') # Loads the shared door image
+    return [Animator(PLAYER_SPRITES_PATH), Coin.get_frames(), Tile._shared_images, Tile._trap_image(), Tile._door_image]
+
+def check_reloads(manager, reloads, leak_threshold):
+    """Reloads the current level repeatedly; returns (bytes per reload, sprites per reload, top growth stats).
+
+    Growth is measured over two windows of reloads and the smaller one is reported: a real
+    leak grows in both, while one-off effects (caches filling, CPython free lists holding
+    on to freed tuples, which tracemalloc still counts) show up in only one.
+    """
+    manager.reload_current_level() # The first reload may still fill caches
+    snapshots = [snapshot()]
+    sprite_counts = [count_live_sprites()]
+    for _ in range(2):
+        for _ in range(reloads):
+            manager.reload_current_level()
+        snapshots.append(snapshot())
+        sprite_counts.append(count_live_sprites())
+    growths = [sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+               for before, after in zip(snapshots, snapshots[1:])]
+    sprite_growth = min(after - before for before, after in zip(sprite_counts, sprite_counts[1:]))
+    growth = min(growths)
+    top = []
+    if growth > leak_threshold * reloads:
+        top = [stat for stat in snapshots[2].compare_to(snapshots[0], 'lineno')[:5] if stat.size_diff > 0]
+    return growth / reloads, sprite_growth / reloads, top
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report memory used by sprite assets, level data and each level.")
+    parser.add_argument('levels', nargs='*', help="Level ids to load (default: every level in LEVELS)")
+    parser.add_argument('--reloads', type=int, default=5, help="Reloads per level for the leak check (0 to skip)")
+    parser.add_argument('--leak-threshold', type=int, default=1024,
+                        help="Flag a level whose memory grows by more than this many bytes per reload")
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    # Tiles and sprites convert their images for the display, so keep a hidden one around
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.HIDDEN)
+    tracemalloc.start(TRACE_FRAMES)
+    # Import first so module code and class caches aren't charged to the first level
+    from src.levels.level_data import LEVEL_LIBRARY
+    from src.levels.level_manager import LevelManager
+
+    print("Memory report (python: tracemalloc; surfaces: pixel buffers, allocated by SDL outside tracemalloc)")
+    before = snapshot()
+    assets = load_assets()
+    asset_surfaces = collect_surfaces(assets)
+    print_section("sprite assets", python_bytes_by_subsystem(before, snapshot()), asset_surfaces)
+
+    before = snapshot()
+    LEVEL_LIBRARY.load_all()
+    print_section("level files", python_bytes_by_subsystem(before, snapshot()))
+
+    from src.levels.level_data import LEVELS
+    if args.levels:
+        targets = [LEVEL_LIBRARY.get(level_id) for level_id in args.levels]
+        missing = [level_id for level_id, level_data in zip(args.levels, targets) if level_data is None]
+        if missing:
+            parser.error(f"unknown level id(s): {', '.join(missing)}")
+    else:
+        targets = list(LEVELS)
+
+    game = _ReportGame(screen)
+    leaks = 0
+    for level_data in targets:
+        name = level_data.level_id or level_data.name
+        manager = game.level_manager = LevelManager(game)
+        before = snapshot()
+        manager.load_level(level_data)
+        by_subsystem = python_bytes_by_subsystem(before, snapshot())
+        surfaces = collect_surfaces([manager.level], exclude=[screen, *asset_surfaces.values()])
+        print_section(f"level {name}", by_subsystem, surfaces)
+        del surfaces
+
+        if args.reloads:
+            bytes_per_reload, sprites_per_reload, top = check_reloads(manager, args.reloads, args.leak_threshold)
+            leaking = bytes_per_reload > args.leak_threshold or sprites_per_reload > 0
+            leaks += leaking
+            print(f"  reloads x{args.reloads}: {format_bytes(bytes_per_reload)}/reload, "
+                  f"{sprites_per_reload:+.1f} live sprites/reload{'  <-- possible leak' if leaking else ''}")
+            for stat in top:
+                frame = stat.traceback[-1]
+                print(f"    {format_bytes(stat.size_diff):>10}  {frame.filename}:{frame.lineno}")
+        manager.level = None
+    tracemalloc.stop()
+    pygame.quit()
+    return 1 if leaks else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,194 @@
+"""Physics-constant sweep for tuning game feel.
+
+Builds every combination of the PhysicsParams values given with --set, and for each
+one plays scripted inputs on a flat test floor (a single jump, a double jump at the
+apex, a dash, a dash cancelled into a super jump, a run) and runs the level solver on
+the chosen levels. Variants are evaluated in parallel in a process pool; the default
+parameters are always evaluated first as the baseline.
+
+Each level gets the solver's fast search first, since any route it finds proves the
+level can be completed. When that finds none, an exact search settles it: 'ok' with
+a route, 'UNREACHABLE' once every state is tried, 'unknown' if --exact-expansions runs out.
+
+Usage:
+    python -m src.tools.physics_sweep --set gravity=0.5,0.6,0.7 --set jump_strength=-10,-11,-12
+    python -m src.tools.physics_sweep --set dash_speed=16,20,24 --levels level_4 level_5 --csv sweep.csv
+    python -m src.tools.physics_sweep --set run_speed=6,7,8 --no-levels   # movement metrics only
+    python -m src.tools.physics_sweep --set gravity=0.8 --exact-expansions 0  # fast search only
+
+Parameter names are the PhysicsParams attributes (src/player/movement_state.py). As in
+the game, the terminal fall speed follows jump_strength unless max_fall_speed is set too.
+"""
+import argparse
+import csv
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from src.settings import *
+from src.player.movement_state import PhysicsParams
+from src.tools.level_solver import LevelSolver
+
+ARENA_WIDTH = 120 # Tiles
+ARENA_HEIGHT = 40 # Rows above the floor, enough headroom for any sane jump
+ARENA_LAYOUT = [''] * ARENA_HEIGHT + [' ' * 4 + 'P', 'X' * ARENA_WIDTH]
+SCRIPT_FRAMES = FPS * 4 # Longest a scripted move may take
+METRICS = ('jump_px', 'jump_frames', 'double_jump_px', 'dash_px', 'super_jump_px', 'run_up_frames')
+
+def parse_grid(assignments):
+    """Turns ['gravity=0.5,0.6', ...] into a list of override dicts, one per combination."""
+    names, value_lists = [], []
+    for assignment in assignments:
+        name, _, values = assignment.partition('=')
+        name = name.strip()
+        if name not in PhysicsParams.NAMES:
+            raise ValueError(f"unknown parameter '{name}' (choose from {', '.join(PhysicsParams.NAMES)})")
+        default = getattr(PhysicsParams, name)
+        parsed = []
+        for text in values.split(','):
+            value = float(text)
+            parsed.append(int(value) if isinstance(default, int) and value.is_integer() else value)
+        names.append(name)
+        value_lists.append(parsed)
+    return [dict(zip(names, combination)) for combination in itertools.product(*value_lists)]
+
+def _play(arena, inputs):
+    nodes, _ = arena.simulate(inputs)
+    return nodes
+
+def _landing(nodes, takeoff=0):
+    """Index of the first frame after takeoff that ends on the ground (the last one if the player never lands)."""
+    for index in range(takeoff + 1, len(nodes)):
+        if nodes[index].movement_state.on_ground:
+            return index
+    return len(nodes) - 1
+
+def measure_movement(params):
+    """Plays the scripted moves on the test floor and returns METRICS as a dict (distances in px)."""
+    arena = LevelSolver(ARENA_LAYOUT, physics=params)
+    start_x, start_y = arena.start
+    idle = [(0, None)] * SCRIPT_FRAMES
+    metrics = {}
+
+    jump = _play(arena, [(0, 'jump')] + idle)
+    metrics['jump_px'] = start_y - min(node.rect[1] for node in jump)
+    metrics['jump_frames'] = _landing(jump) + 1
+
+    apex = next((index for index, node in enumerate(jump) if node.movement_state.velocity[1] >= 0), len(jump) - 1)
+    double_jump = _play(arena, [(0, 'jump')] + [(0, None)] * apex + [(0, 'jump')] + idle)
+    metrics['double_jump_px'] = start_y - min(node.rect[1] for node in double_jump)
+
+    dash = _play(arena, [(1, 'dash')] + [(1, None)] * (params.dash_duration + 1))
+    metrics['dash_px'] = dash[-1].rect[0] - start_x
+
+    # Jumping during the dash's prepare frames turns it into a super jump
+    super_jump = _play(arena, [(1, 'dash'), (1, 'jump')] + [(1, None)] * SCRIPT_FRAMES)
+    metrics['super_jump_px'] = super_jump[_landing(super_jump, takeoff=1)].rect[0] - start_x
+
+    run = _play(arena, [(1, None)] * SCRIPT_FRAMES)
+    metrics['run_up_frames'] = next((index + 1 for index, node in enumerate(run)
+                                     if node.movement_state.velocity[0] >= params.run_speed - 1e-9), None) # Ignore float drift
+    return metrics
+
+def level_status(layout, params, solver_options, exact_expansions):
+    """'ok', 'UNREACHABLE' or 'unknown' (no route found, but not proven impossible either)."""
+    reachable = LevelSolver(layout, physics=params, **solver_options).solve().reachable
+    if reachable is None and exact_expansions:
+        reachable = LevelSolver(layout, physics=params, exact=True, max_expansions=exact_expansions).solve().reachable
+    return {True: 'ok', False: 'UNREACHABLE', None: 'unknown'}[reachable]
+
+def evaluate(overrides, levels, solver_options, exact_expansions):
+    """Worker: movement metrics and level results for one parameter set."""
+    started = time.perf_counter()
+    params = PhysicsParams(**overrides)
+    result = {'overrides': overrides, **measure_movement(params), 'levels': {}}
+    for name, layout in levels:
+        result['levels'][name] = level_status(layout, params, solver_options, exact_expansions)
+    result['elapsed_s'] = time.perf_counter() - started
+    return result
+
+def format_overrides(overrides):
+    return ' '.join(f"{name}={value}" for name, value in overrides.items()) or 'baseline'
+
+def print_result(result, baseline):
+    """One line per variant; metrics that differ from the baseline get their change in brackets."""
+    parts = []
+    for metric in METRICS:
+        value, base = result[metric], baseline[metric]
+        changed = value is not None and base is not None and value != base
+        parts.append(f"{metric}={value}" + (f" ({value - base:+})" if changed else ''))
+    levels = result['levels']
+    completed = sum(status == 'ok' for status in levels.values())
+    level_summary = f"  levels {completed}/{len(levels)}" if levels else ''
+    for status, label in (('UNREACHABLE', 'lost'), ('unknown', 'unknown')):
+        names = [name for name, level in levels.items() if level == status and baseline['levels'].get(name) == 'ok']
+        level_summary += f" {label}: {', '.join(names)}" if names else ''
+    print(f"{format_overrides(result['overrides'])}: {', '.join(parts)}{level_summary} [{result['elapsed_s']:.1f}s]")
+
+def write_csv(path, results, level_names):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(list(PhysicsParams.NAMES) + list(METRICS) + list(level_names))
+        for result in results:
+            params = PhysicsParams(**result['overrides'])
+            writer.writerow([getattr(params, name) for name in PhysicsParams.NAMES] +
+                            [result[metric] for metric in METRICS] +
+                            [result['levels'][name] for name in level_names])
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure jumps, dashes and level completion across physics parameter sets.")
+    parser.add_argument('--set', action='append', default=[], metavar='NAME=V1,V2,...',
+                        help="Values to try for one PhysicsParams attribute (repeat to sweep a grid)")
+    parser.add_argument('--levels', nargs='*', help="Level ids to solve for each variant (default: every level in LEVELS)")
+    parser.add_argument('--no-levels', action='store_true', help="Only measure movement, don't solve levels")
+    parser.add_argument('--max-expansions', type=int, default=20000, help="Fast solver budget per level and variant")
+    parser.add_argument('--exact-expansions', type=int, default=400000,
+                        help="Exact solver budget for levels the fast search can't route (0 = skip, report them unknown)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Worker processes (1 = run in this process)")
+    parser.add_argument('--csv', help="Also write every variant's parameters and results to this CSV file")
+    args = parser.parse_args(argv)
+
+    try:
+        grid = parse_grid(args.set)
+    except ValueError as e:
+        parser.error(str(e))
+    variants = [{}] + [overrides for overrides in grid if overrides] # Baseline first
+
+    levels = []
+    if not args.no_levels:
+        from src.levels.level_data import LEVEL_LIBRARY, LEVELS
+        if args.levels:
+            missing = [level_id for level_id in args.levels if LEVEL_LIBRARY.get(level_id) is None]
+            if missing:
+                parser.error(f"unknown level id(s): {', '.join(missing)}")
+            levels = [(level_id, LEVEL_LIBRARY.get(level_id).layout) for level_id in args.levels]
+        else:
+            levels = [(level.level_id or level.name, level.layout) for level in LEVELS]
+    solver_options = {'max_expansions': args.max_expansions}
+
+    started = time.perf_counter()
+    print(f"Evaluating {len(variants)} parameter set(s) on {len(levels)} level(s) with {args.workers} worker(s)...")
+    jobs = (variants, [levels] * len(variants), [solver_options] * len(variants), [args.exact_expansions] * len(variants))
+    if args.workers == 1:
+        results = map(evaluate, *jobs)
+        executor = None
+    else:
+        executor = ProcessPoolExecutor(max_workers=args.workers)
+        results = executor.map(evaluate, *jobs)
+    collected = []
+    try:
+        for result in results: # In grid order, as workers finish
+            collected.append(result)
+            print_result(result, collected[0])
+    finally:
+        if executor:
+            executor.shutdown(cancel_futures=True)
+    print(f"Evaluated {len(collected)} parameter set(s) in {time.perf_counter() - started:.1f}s.")
+    if args.csv:
+        write_csv(args.csv, collected, [name for name, _ in levels])
+        print(f"Wrote {args.csv}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,176 @@
+import os
+import pygame
+from src.settings import *
+from src.levels.level_file import LevelFileError, load_level_file, save_level_file
+
+ERASE_CHAR = ' '
+BRUSH_NAMES = {
+    'X': "platform", 'S': "spike", 'E': "exit", 'C': "checkpoint", 'M': "moving spike",
+    TEMP_PLATFORM_CHAR: "temporary platform", PERIODIC_PLATFORM_CHAR: "periodic platform",
+    COIN_CHAR: "coin", 'P': "player start", ERASE_CHAR: "eraser",
+}
+
+class LevelEditor:
+    """Paints layout cells into the running level with the mouse (GameState.EDITOR).
+
+    F2 while playing opens the editor and F2 or Escape closes it. Keys 1-9 pick a brush
+    from EDITOR_BRUSHES, 0 or Backspace the eraser, and the mouse wheel cycles through
+    them. The left button paints and the right button erases; a drag paints a
+    continuous line. Edits go through Level.apply_cell_changes, so only the painted
+    cells are rebuilt and the level keeps running: the player can still be moved to
+    playtest, and dying or reaching the exit just respawns. Ctrl+S writes the layout
+    back to the level's file.
+    """
+    def __init__(self, game_instance):
+        self.game = game_instance
+        self.font = pygame.font.Font(None, EDITOR_FONT_SIZE)
+        self.brushes = EDITOR_BRUSHES + (ERASE_CHAR,)
+        self.brush_index = 0
+        self.hover_cell = None
+        self.last_painted_cell = None # End of the current stroke, so fast drags leave no gaps
+        self.unsaved_changes = False
+        self.status = ""
+        self._hud = None # (text, surface), re-rendered only when the text changes
+
+    @property
+    def level(self):
+        return self.game.level_manager.level
+
+    def enter(self):
+        """Switches from playing to editing the current level."""
+        if self.level:
+            self.game.current_state = GameState.EDITOR
+            self.hover_cell = self.cell_at(pygame.mouse.get_pos())
+
+    def leave(self):
+        """Goes back to playing the edited level (edits stay until the level is reloaded)."""
+        self.game.current_state = GameState.PLAYING
+        self.last_painted_cell = None
+
+    def handle_key(self, event):
+        """Handles a KEYDOWN in the editor; returns False for keys the player should get."""
+        if event.key in (pygame.K_F2, pygame.K_ESCAPE):
+            self.leave()
+        elif event.key == pygame.K_s and event.mod & pygame.KMOD_CTRL:
+            self.save()
+        elif pygame.K_1 <= event.key <= pygame.K_9 and event.key - pygame.K_1 < len(EDITOR_BRUSHES):
+            self.brush_index = event.key - pygame.K_1
+        elif event.key in (pygame.K_0, pygame.K_BACKSPACE):
+            self.brush_index = self.brushes.index(ERASE_CHAR)
+        else:
+            return False
+        return True
+
+    def handle_mouse(self, event):
+        """Paints, erases or changes brush from a mouse event."""
+        if event.type == pygame.MOUSEWHEEL:
+            self.brush_index = (self.brush_index - event.y) % len(self.brushes)
+            return
+        if event.type == pygame.MOUSEBUTTONUP:
+            self.last_painted_cell = None # Stroke finished
+            return
+        self.hover_cell = self.cell_at(event.pos)
+        if event.type == pygame.MOUSEBUTTONDOWN:
+            self.last_painted_cell = None
+            buttons = (event.button == 1, False, event.button == 3)
+        else:
+            buttons = event.buttons
+        if self.hover_cell and (buttons[0] or buttons[2]):
+            self.paint(self.hover_cell, self.brushes[self.brush_index] if buttons[0] else ERASE_CHAR)
+
+    def cell_at(self, screen_pos):
+        """Returns the level grid cell under a display position, or None outside the level."""
+        level = self.level
+        if not level:
+            return None
+        offset = level.visible_sprites.offset
+        col = int(screen_pos[0] + offset.x) // TILE_SIZE
+        row = int(screen_pos[1] + offset.y) // TILE_SIZE
+        if 0 <= col < level.level_width // TILE_SIZE and 0 <= row < len(level.layout):
+            return (col, row)
+        return None
+
+    def paint(self, cell, char):
+        """Sets cell (and the cells between it and the last one of the stroke) to char."""
+        level = self.level
+        if char == 'P':
+            changes = {cell: char} # A single start cell, not a line of them
+            start_x, start_y = level.initial_player_pos
+            old_start = (start_x // TILE_SIZE, start_y // TILE_SIZE)
+            if old_start != cell and level.layout[old_start[1]][old_start[0]:old_start[0] + 1] == 'P':
+                changes[old_start] = ERASE_CHAR # One start per level
+        else:
+            changes = dict.fromkeys(self._line(self.last_painted_cell or cell, cell), char)
+        if level.apply_cell_changes(changes):
+            self.unsaved_changes = True
+            self.status = ""
+        self.last_painted_cell = cell
+
+    @staticmethod
+    def _line(start, end):
+        """Grid cells on the straight line from start to end, both included."""
+        steps = max(abs(end[0] - start[0]), abs(end[1] - start[1]))
+        if not steps:
+            return [end]
+        return [(start[0] + round((end[0] - start[0]) * i / steps), start[1] + round((end[1] - start[1]) * i / steps))
+                for i in range(steps + 1)]
+
+    def save(self):
+        """Writes the edited layout back to the current level's file."""
+        level_manager = self.game.level_manager
+        level_data = level_manager.current_level_data
+        path = level_data.source_path if level_data else None
+        if not path:
+            self.status = "Nothing to save to: this level has no file"
+            return False
+        try:
+            metadata = load_level_file(path)[0] # Keep the header exactly as written
+        except (OSError, LevelFileError) as e:
+            print(f"Warning: Could not read level header from '{path}', rebuilding it: {e}")
+            metadata = {'name': level_data.name, 'music': level_data.background_music,
+                        'next': level_data.next_level.level_id if level_data.next_level else None,
+                        'hidden': level_data.hidden_level.level_id if level_data.hidden_level else None}
+        try:
+            save_level_file(path, metadata, self.level.layout)
+        except OSError as e:
+            print(f"Error: Could not save level file '{path}': {e}")
+            self.status = "Save failed"
+            return False
+        level_manager.apply_level_file_changes([path]) # Refresh the LevelData now rather than on the watcher's next poll
+        self.unsaved_changes = False
+        self.status = f"Saved {os.path.basename(path)}"
+        print(f"LevelEditor: Saved '{path}'.")
+        return True
+
+    def update(self, dt):
+        """Keeps the level running while editing."""
+        if self.level:
+            self.level.update(dt)
+
+    def draw(self):
+        """Draws the level with the cell cursor and the editor's help line on top."""
+        level = self.level
+        if not level:
+            self.leave()
+            return
+        level.draw()
+        surface = self.game.screen
+        if self.hover_cell:
+            offset = level.visible_sprites.offset
+            cursor = pygame.Rect(self.hover_cell[0] * TILE_SIZE - offset.x, self.hover_cell[1] * TILE_SIZE - offset.y,
+                                 TILE_SIZE, TILE_SIZE)
+            pygame.draw.rect(surface, EDITOR_CURSOR_COLOR, cursor, 2)
+        surface.blit(self._hud_surface(), (0, 0))
+
+    def _hud_surface(self):
+        brush = self.brushes[self.brush_index]
+        text = (f"EDITOR  brush: {BRUSH_NAMES.get(brush, brush)} ('{brush}')"
+                f"{'  *unsaved' if self.unsaved_changes else ''}{'  ' + self.status if self.status else ''}"
+                f"   |  1-9/0/wheel: brush  LMB: paint  RMB: erase  Ctrl+S: save  F2: play")
+        if self._hud is None or self._hud[0] != text:
+            label = self.font.render(text, True, WHITE)
+            strip = pygame.Surface((SCREEN_WIDTH, label.get_height() + 8), pygame.SRCALPHA)
+            strip.fill(EDITOR_HUD_BG_COLOR)
+            strip.blit(label, (8, 4))
+            self._hud = (text, strip)
+        return self._hud[1]
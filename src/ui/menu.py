@@ -30,6 +30,9 @@ class Menu:
         self.selected_option = 0
         self.option_rects = []
 
+        self.static_screen = None # GameState of the static screen currently on the display, if any
+        self.static_screen_texts = {} # GameState -> [(text surface, rect)], rendered on first show
+
         self._update_options_list()
         self._setup_options()
 
@@ -86,7 +89,9 @@ class Menu:
 
     def draw(self):
         """Draws the menu options on the screen with new aesthetics."""
-        self.background_animator.update(self.game.clock.get_time() / 1000.0) 
+        if not self.game.throttled: # The background holds still while the game is idle or in the background
+            # After throttling the clock's last interval can be minutes long, so cap the step
+            self.background_animator.update(min(self.game.clock.get_time() / 1000.0, 0.1))
         self.background_animator.draw(self.display_surface)
         
         self._update_options_list() 
@@ -124,20 +129,35 @@ class Menu:
         self.display_surface.blit(quit_text, quit_text.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT/2 + 40)))
 
     def draw_death_screen(self):
-        self.display_surface.fill(BLACK)
-        death_text = self.font.render('You Died!', True, RED)
-        respawn_text = self.font.render('Press [R] to Respawn', True, WHITE)
-        menu_text = self.font.render('Press [M] for Main Menu', True, WHITE)
-        self.display_surface.blit(death_text, death_text.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT/3)))
-        self.display_surface.blit(respawn_text, respawn_text.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT/2)))
-        self.display_surface.blit(menu_text, menu_text.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT/2 + 40)))
+        """Shows the death screen; returns the changed display rects (none once it's up)."""
+        return self._draw_static_screen(GameState.DEATH_SCREEN, [
+            ('You Died!', RED, SCREEN_HEIGHT/3),
+            ('Press [R] to Respawn', WHITE, SCREEN_HEIGHT/2),
+            ('Press [M] for Main Menu', WHITE, SCREEN_HEIGHT/2 + 40),
+        ])
 
     def draw_game_over_screen(self):
+        """Shows the game over screen; returns the changed display rects (none once it's up)."""
+        return self._draw_static_screen(GameState.GAME_OVER, [
+            ('All Levels Complete!', GREEN, SCREEN_HEIGHT/3),
+            ('Press [M] for Main Menu', WHITE, SCREEN_HEIGHT/2),
+        ])
+
+    def _draw_static_screen(self, state, lines):
+        """Draws a screen of centred text lines on black once, with text rendered on first use."""
+        if self.static_screen == state:
+            return [] # Already on the display, nothing to update
+        texts = self.static_screen_texts.get(state)
+        if texts is None:
+            texts = []
+            for text, color, center_y in lines:
+                text_surf = self.font.render(text, True, color)
+                texts.append((text_surf, text_surf.get_rect(center=(SCREEN_WIDTH/2, center_y))))
+            self.static_screen_texts[state] = texts
         self.display_surface.fill(BLACK)
-        over_text = self.font.render('All Levels Complete!', True, GREEN)
-        menu_text = self.font.render('Press [M] for Main Menu', True, WHITE)
-        self.display_surface.blit(over_text, over_text.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT/3)))
-        self.display_surface.blit(menu_text, menu_text.get_rect(center=(SCREEN_WIDTH/2, SCREEN_HEIGHT/2)))
+        self.display_surface.blits(texts, False)
+        self.static_screen = state
+        return [self.display_surface.get_rect()] # Replaces whatever was shown before
 
     def handle_input(self, event):
         """Handles keyboard and mouse input for the menu."""
@@ -184,12 +204,12 @@ class Menu:
 
         if selected_text == "Start Game":
             self.game.level_manager.game_entry() 
-            if self.game.voice_recognition_enabled and self.game.voice_recognizer and self.game.voice_recognizer.model:
-                self.game.try_start_voice_recognition()
+            if self.game.voice_recognition_enabled:
+                self.game.try_start_voice_recognition() # First start also loads the recognizer
         elif "Voice Recognition" in selected_text:
             self.game.voice_recognition_enabled = not self.game.voice_recognition_enabled
             if self.game.voice_recognition_enabled:
-                if self.game.voice_recognizer and self.game.voice_recognizer.model:
+                if self.game.get_voice_recognizer():
                     print("Menu: Enabling and starting voice recognition.")
                     self.game.try_start_voice_recognition()
                 else:
@@ -209,8 +229,6 @@ class Menu:
     def return_to_menu(self):
         """Return to the main menu."""
         print("Returning to menu...")
-        if self.game.level_manager.level:
-             self.game.level_manager.level.reset_checkpoints() 
-             self.game.level_manager.level = None 
+        self.game.level_manager.unload_level()
         self.game.level_manager.current_level_index = 0 
         self.game.current_state = GameState.MENU 